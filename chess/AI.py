@@ -1,158 +1,248 @@
-from copy import deepcopy
+import os
 import random
 from .BotManager import AIGame
+from . import engine
+from .search import Search
+from .options import EngineOptions
+from .transposition import TranspositionTable
+from .evalcache import EvaluationCache, MISSING
+from .smp import LazySMP
+from .parallel import ParallelEvaluations
+from .batch import BatchScores, NumpyInstalled
+
+SEARCH_DEPTH = 6 # The deepest the search difficulty looks ahead
+SEARCH_TIME = 5 # The most seconds the search difficulty spends on a move
+TABLE_SIZE = 16 # The size of the search difficulty's transposition table in MB
+EVALUATION_CACHE_SIZE = 50000 # The most positions the medium and hard difficulties remember the evaluations of
+SEARCH_THREADS = max(1, min(4, (os.cpu_count() or 1) // 2)) # The number of processes the search difficulty searches with
+# The number of processes the medium and hard difficulties evaluate their moves with. With NumPy installed they score
+# their moves all at once in this process instead, which is faster than sending the moves to other processes
+EVALUATION_WORKERS = 1 if NumpyInstalled() else SEARCH_THREADS
+SEARCH_MIN_TIME = 0.25 # The least time the search difficulty needs to finish its first few iterations
+HARD_MODE_TIME = 0.15 # Roughly the most seconds the hard difficulty takes to pick a move
+MEDIUM_MODE_TIME = 0.05 # Roughly the most seconds the medium difficulty takes to pick a move
 
 aiGame = AIGame() # Holds an instance of the AIGame class
+transpositionTable = TranspositionTable(TABLE_SIZE) # Kept between moves so positions searched on the previous move are remembered
+evaluationCache = EvaluationCache(EVALUATION_CACHE_SIZE) # Kept between moves so positions scored on an earlier move aren't scored again
+# The settings of the search difficulty, and how many processes the medium and hard difficulties use
+engineOptions = EngineOptions(SEARCH_DEPTH, SEARCH_TIME, threads=SEARCH_THREADS, evaluationWorkers=EVALUATION_WORKERS)
+smpSearch = None # The parallel search, started the first time the search difficulty searches with more than one thread
+expectedReply = None # The reply the last search expects white to play (the second move of its best line), used for pondering
+lastStats = None # The stats of the last move chosen by the medium, hard or search difficulty, sent back with the move
 def EasyMode(position, game):
-    moves = AllMoves(position, 'Black', game) # Holds all the possible board states and the move associated with that board state
+    moves = AllMoves(position, 'Black') # Holds all the possible moves and the record associated with each move
 
     # Checks if the moves list is not empty
     if moves != []:
-        boardChoice = random.choice(moves) # Picks a random one from the moves list
-        
-        # Checks the key and value of the board choice
-        for board, move in boardChoice.items():
-            chosenBoard = board # Holds the board object
-            playedMove = move # Holds the move played
-
-        return chosenBoard, playedMove # Returns a tuple of the board object and the associated move played
-
-def MediumMode(position, game):
-    moves = AllMoves(position, 'Black', game) # Holds all the possible board states and the move associated with that board state
-    bestChoice = None 
+        move, playedMove = random.choice(moves) # Picks a random one from the moves list
+        PlayMove(position, move) # Plays the chosen move on the board
+
+        return position, playedMove # Returns a tuple of the board object and the associated move played
+
+def MediumMode(position, game, options=engineOptions):
+    moves = AllMoves(position, 'Black') # Holds all the possible moves and the record associated with each move
+    evaluations = EvaluateMoves(position, moves, 'Medium', MediumScore, options) # The medium evaluation after each move
+
+    return PlayChosenMove(position, moves, evaluations)
+
+def HardMode(position, game, options=engineOptions):
+    moves = AllMoves(position, 'Black') # Holds all the possible moves and the record associated with each move
+    evaluations = EvaluateMoves(position, moves, 'Hard', HardScore, options) # The hard evaluation after each move
+
+    return PlayChosenMove(position, moves, evaluations)
+
+def EvaluateMoves(position, moves, difficulty, score, options):
+    # Returns the evaluation of the board after each move, in the order of the moves so ties are broken the same way
+    global lastStats
+
+    # Checks if the evaluations should be shared out between processes, which each keep their own evaluation cache
+    if options.evaluationWorkers > 1:
+        lastStats = {'evaluationWorkers': options.evaluationWorkers}
+        return ParallelEvaluations(position.Fen(), [move for move, record in moves], difficulty, options.evaluationWorkers)
+
+    # Checks if the boards can be scored together with NumPy instead of one at a time
+    if options.batchEvaluation and NumpyInstalled():
+        evaluations = BatchScores(position, [move for move, record in moves], difficulty)
+        lastStats = {'batchEvaluation': True, 'cacheHitRate': evaluationCache.HitRate(difficulty)}
+        return evaluations
+
+    evaluations = [score(position, move) for move, record in moves]
+    lastStats = {'cacheHitRate': evaluationCache.HitRate(difficulty)} # How often a position had already been scored this game
+
+    return evaluations
+
+def MediumScore(position, move):
+    undo = PlayMove(position, move) # Plays the move on the board so the board state can be evaluated
+    evaluation = evaluationCache.Probe('Medium', position.hash)
+
+    # Checks if the board state hasn't been evaluated before
+    if evaluation is MISSING:
+        evaluation = aiGame.MediumEvaluation(position) # Holds the medium evalutation of the current board state
+        evaluationCache.Store('Medium', position.hash, evaluation)
+
+    position.UnmakeMove(undo) # Takes the move back so the next move is played from the same board state
+
+    return evaluation
+
+def HardScore(position, move):
+    # Returns the hard evaluation of the board after the move, or None if white can checkmate straight after it
+    undo = PlayMove(position, move) # Plays the move on the board so the board state can be checked
+    evaluation = evaluationCache.Probe('Hard', position.hash) # The cached score includes whether white can checkmate
+
+    # Checks if the board state has been checked and evaluated before so the check moves aren't generated again
+    if evaluation is not MISSING:
+        position.UnmakeMove(undo)
+        return evaluation
+
+    evaluation = None
+    # Checks if white can't checkmate straight after the move so the board is worth evaluating
+    if not WhiteCanMate(position):
+        evaluation = aiGame.HardEvaluation(position) # Stores the hard evaluation of the current board state
+
+    evaluationCache.Store('Hard', position.hash, evaluation)
+    position.UnmakeMove(undo) # Takes the move back so the next move is played from the same board state
+
+    return evaluation
+
+def WhiteCanMate(position):
+    whiteMoves = CheckMoves(position, 'White') # Stores all moves that white plays to result in a check to the black king
+
+    # Loops through all check moves white can play
+    for whiteMove in whiteMoves:
+        whiteUndo = PlayMove(position, whiteMove)
+        checkmated = engine.Checkmate(position, 'Black') # Checks if that move will result in the black king getting checkmated
+        position.UnmakeMove(whiteUndo)
+
+        if checkmated:
+            return True # It stops checking because it has already found the losing move
+
+    return False
+
+def ChooseMove(evaluations):
+    # Returns the index of the first move with the highest evaluation. Moves that lose straight away (None) are only
+    # chosen if every move does, in which case the first move is played
+    bestIndex = None
     bestEvaluation = float('-inf') # I set it to -infinity not +infinity because I want to keep track of the highest evaluation
 
-    # Loops through all the board states in the moves list
-    for boards in moves:
-        # Checks the board object and associated move played of each board state
-        for board, move in boards.items():
-            evaluation = aiGame.MediumEvaluation(board) # Sets evaluation to hold the medium evalutation of the current board state
-
-            # Checks if the current evaluation is better than the best evaluation
-            if evaluation > bestEvaluation:
-                bestEvaluation = evaluation # Reassigns the best evaluation so it now holds the current evaluation
-                bestChoice = board # Sets the bestChoice to the board state
-                playedMove = move # Sets played move to store the move associated with the best board state
-
-    return bestChoice, playedMove # Returns a tuple holding the best board state and the associated move to reach that board state
-
-def HardMode(position, game):
-    moves = AllMoves(position, 'Black', game) # Holds all the possible board states and the move associated with that board state
-    bestChoice = None
-    bestEvaluation = float('-inf') # I set it to -infinity and not +infinity becuase I want to keep track of the highest evaluation
-
-    # Loops through all the board states in the moves list
-    for boards in moves:
-        # Checks the board object and associated move played of each board state
-        for board, move in boards.items():
-            lost = False  # Resets the lost variable for each board state
-            whiteMoves = CheckMoves(board, 'White') # Stores all board states that white plays to result in a check to the black king
-            
-            # Loops through all check board states white can play
-            for whiteMove in whiteMoves:
-                # Checks if that move will result in the black king getting checkmated
-                if aiGame.Checkmate(whiteMove, 'Black'):
-                    lost = True # Sets lost to true if so
-                    worstChoice = board # Sets worstMove to current board state if so
-                    worstMove = move
-                    break  # It stops checking because it has already found the losing move
-
-            # Checks if the position after white makes a move would not result in a checkmate
-            if not lost:
-                evaluation = aiGame.HardEvaluation(board) # Stores the hard evaluation of the current board state
-                
-                # Checks if the current evaluation is better than the best evaluation
-                if evaluation > bestEvaluation:
-                    bestEvaluation = evaluation # Reassigns best evaluation so it now stores the current one
-                    bestChoice = board # Holds the board state with the highest evaluation
-                    playedMove = move # Holds the move associated with the best board state
-
-            # Checks if no moves have been registered because all of them lead to checkmate anyways
-            if bestChoice == None:
-                bestChoice = worstChoice # Allows it to play any move
-                playedMove = worstMove
-
-    return bestChoice, playedMove # Returns a tuple holding the best board state and the associated move to reach that board state
-        
-def PlayMove(square, move, board, game):
-    # Checks if the piece to move is a King and kingside castling is attempted
-    if square.piece != None and square.piece.name == 'King' and move == (0, 7) and board.CanCastleKingside('Black'):
-        board.CastleKingside('Black') # Performs the kingside castling movement
-
-    # Checks if the piece to move is a King and queenside castling is attempted
-    elif square.piece != None and square.piece.name == 'King' and move == (0, 3) and board.CanCastleQueenside('Black'):
-        board.CastleQueenside('Black') # Performs the queenside castling movement
-
-    # Checks if the piece to move is a pawn and the promotion square was moved to
-    elif square.piece != None and square.piece.name == 'Pawn' and move[0] == 7:
-        board.Promote(move[0], move[1], 'Black') # Promotes the pawn to a queen using the promote method in the board class
-        square.piece = None # Removes the pawn that just queened
-
-    # Checks if the piece to move is a pawn the enPassant move was attempted
-    elif square.piece != None and square.piece.name == 'Pawn' and game.EnPassantPossible and move in game.EnPassantMove:
-        board.EnPassant(square, move[0], move[1], 'Black') # Uses the board method EnPassant to perform the enPassant movement
-
-    # Handles regular piece movement
+    for index, evaluation in enumerate(evaluations):
+        # Checks if the current evaluation is better than the best evaluation
+        if evaluation != None and evaluation > bestEvaluation:
+            bestEvaluation = evaluation
+            bestIndex = index
+
+    # Checks if no moves have been registered because all of them lead to checkmate anyways
+    if bestIndex == None:
+        bestIndex = 0
+
+    return bestIndex
+
+def PlayChosenMove(position, moves, evaluations):
+    bestChoice, playedMove = moves[ChooseMove(evaluations)]
+    PlayMove(position, bestChoice) # Plays the best move on the board
+
+    return position, playedMove # Returns a tuple holding the best board state and the associated move to reach that board state
+
+def SearchMode(position, game, options=engineOptions, timeManager=None, stopSignal=None):
+    # Looks several moves ahead with an alpha-beta search instead of only one move ahead. It uses the tapered evaluation,
+    # which the board keeps up to date as moves are made, so it can evaluate far more positions than the hard evaluation
+    global expectedReply, lastStats
+    # Checks if the search should use more than one process, in which case helper processes search alongside it
+    if options.threads > 1:
+        search = ParallelSearch(options)
+        move = search.Start(position, 'Black', timeManager, stopSignal)
+        search = search.search # The main search, which holds the stats and the best line
     else:
-        board.MovePiece(square, move[0], move[1])
-
-    return board # Returns the board object
-
-def AllMoves(board, colour, game):
-    boardStates = []
-
-    # This ensures all the valid moves of every piece is checked
-    for piece in ['King', 'Queen', 'Rook', 'Bishop', 'Knight', 'Pawn']:
-        # Gets the dictionary which stores the valid moves of all pieces using the new method from the game class
-        validMoves = game.PieceMoves(piece, colour)
-        enemyPiecePositions = game.AllPiecePositions('White') # Stores the positions of all enemy pieces
-
-        # Loops through each key and value (list) in the valid moves dict.
-        for num, moves in validMoves.items():
-            # Loops through all moves inside the value(list)
-            for move in moves:
-                position = game.PiecePositions(piece, colour).get(num) # Uses the key to get the current position of the piece
-                # Checks if the piece exists to prevent the game from crashing
-                if position != None:
-                    row, column = position
-                    tempBoard = deepcopy(board) # Creates a copy of the current board
-                    tempSquare = tempBoard.GetPieceSquare(row, column) # Gets the square the current piece is on
-                    newBoard = PlayMove(tempSquare, move, tempBoard, game) # Uses the Play Move function to simulate the piece moving on the copied board
-                    
-                    # This checks if the move to be made would be a capture
-                    if move in enemyPiecePositions:
-                        # Adds a dictionary holding the newBoard object as the key and the move it played to achieve that position as the value
-                        # The value type for the move is a list to indicate a capture
-                        boardStates.append({newBoard: {piece.lower(): [move[0], move[1]]}})
-                    else:
-                        # The value type for the move is a tuple to indicate a normal non-capture move
-                        boardStates.append({newBoard: {piece.lower(): (move[0], move[1])}})
-
-    return boardStates
+        search = Search(aiGame.TaperedEvaluation, options, transpositionTable, stopSignal=stopSignal)
+        move = search.Start(position, 'Black', timeManager)
+    lastStats = search.Stats() # Sent back with the move so the aspiration window can be tuned from the games played
+
+    # Checks if the best line goes on past the move so the reply white is expected to play is known
+    if len(search.pv) > 1:
+        expectedReply = search.pv[1]
+    else:
+        expectedReply = None
+
+    # Checks if the search found a move to play
+    if move != None:
+        playedMove = MoveRecord(position, move) # Gets the record before the move is played so it can tell if it is a capture
+        PlayMove(position, move)
+
+        return position, playedMove # Returns a tuple holding the new board state and the associated move, just like HardMode
+
+def ParallelSearch(options):
+    # Starts the helper processes the first time they are needed and keeps them for the rest of the game. They are started
+    # again if the number of threads changes
+    global smpSearch
+    if smpSearch != None and smpSearch.options.threads != options.threads:
+        CloseParallelSearch()
+    if smpSearch == None:
+        smpSearch = LazySMP(aiGame.TaperedEvaluation, options)
+
+    smpSearch.options = options
+    return smpSearch
+
+def CloseParallelSearch():
+    global smpSearch
+    if smpSearch != None:
+        smpSearch.Close()
+        smpSearch = None
+
+def ClockMode(position, game, difficulty, timeManager, stopSignal=None):
+    # Plays the strongest difficulty up to the one chosen whose move fits in the time the clock allows, so the AI only gets
+    # weaker when it really is about to run out of time instead of as soon as it has less than 10 seconds
+    global expectedReply
+    expectedReply = None # Only the search difficulty predicts white's reply
+    timeManager.Start()
+
+    if difficulty == 'Expert' and timeManager.hardLimit >= SEARCH_MIN_TIME:
+        return SearchMode(position, game, timeManager=timeManager, stopSignal=stopSignal)
+    elif difficulty in ('Expert', 'Hard') and timeManager.softLimit >= HARD_MODE_TIME:
+        return HardMode(position, game)
+    elif timeManager.softLimit >= MEDIUM_MODE_TIME:
+        return MediumMode(position, game)
+
+    return EasyMode(position, game)
+
+def PlayMove(board, move):
+    # The board works out whether the move is castling, a promotion, an enPassant capture or a normal move by itself
+    # and returns an undo record so the move can be taken back without copying the board
+    return board.MakeMove(move)
+
+def MoveRecord(board, move):
+    row, column, newRow, newColumn = move
+    piece = board.PieceAtSquare(row, column).name
+
+    # This checks if the move to be made would be a capture
+    if board.position.PieceAt(newRow, newColumn) != None:
+        # The value type for the record is a list to indicate a capture
+        return {piece.lower(): [newRow, newColumn]}
+
+    # The value type for the record is a tuple to indicate a normal non-capture move
+    return {piece.lower(): (newRow, newColumn)}
+
+def AllMoves(board, colour):
+    moves = []
+
+    # Goes through every legal move of the player from a single pass of the move generator
+    for move in engine.LegalMoves(board, colour):
+        # Adds a tuple holding the move and the record of the move that goes into the move history
+        moves.append((move, MoveRecord(board, move)))
+
+    return moves
 
 # This method stores all moves that could result in the black king being in check
 def CheckMoves(board, colour):
-    boardMoves = []
-
-    for piece in ['King', 'Queen', 'Rook', 'Bishop', 'Knight', 'Pawn']:
-        validMoves = aiGame.PieceMoves(board, piece, colour) # Stores the dictionary which holds the valid moves of all the pieces
-
-        # Loops through each key and value in valid moves dictionary
-        for num, moves in validMoves.items():
-            # Loops through the moves inside each list 
-            for move in moves:
-                position = aiGame.PiecePositions(board, piece, colour).get(num) # Uses the key to get the current position of the piece
-                # Checks if the piece exists
-                if position != None:
-                    row, column = position
-                    tempBoard = deepcopy(board) # Creates a copy of the board object it is passed
-                    tempSquare = tempBoard.GetPieceSquare(row, column) # Gets the square the current piece is on
-                    newBoard = PlayMove(tempSquare, move, tempBoard, aiGame)  # Uses the Play Move function to simulate the piece moving on the copied board
+    checkMoves = []
 
-                    # Checks if in the new board state, the black king is in check
-                    if aiGame.InCheck(newBoard, 'Black') != None:
-                        boardMoves.append(newBoard) # Adds the board state
+    # Loops through every legal move of the given player
+    for move in engine.LegalMoves(board, colour):
+        undo = PlayMove(board, move) # Simulates the piece moving on the board
 
-    return boardMoves
+        # Checks if in the new board state, the black king is in check
+        if engine.InCheck(board, 'Black') != None:
+            checkMoves.append(move) # Adds the move
 
+        board.UnmakeMove(undo) # Takes the move back so the board is left as it was
 
+    return checkMoves
@@ -0,0 +1,71 @@
+from collections import Counter
+from .movegen import GenerateLegalMoves, LegacyMovesBySquare
+
+# Holds which squares each player attacks and defends in one position so every evaluation term can share them instead of
+# generating the same moves again. Each part is only worked out the first time a term asks for it and is then kept, so the
+# search evaluation (which only needs the legal moves) doesn't pay for the attack and defence counts it never uses
+
+class AttackMap:
+    def __init__(self, aiGame, board):
+        self.aiGame = aiGame # Holds the piece objects whose GetValidMoves methods give the control, skewer and normal moves
+        self.board = board
+        self.movesBySquare = {} # The legal moves of each player grouped by the (row, column) of the piece that makes them
+        self.moves = {} # The squares every piece of each player can legally move to, in the same order as AllPieceMoves
+        self.attackCounts = {} # How many times each player's legal and skewer moves reach each square
+        self.defenceCounts = {} # How many of each player's pieces control each square
+        self.pieceMoves = {} # The squares the piece on each (row, column) can move to, ignoring checks and pins
+        self.attackers = {} # The values of each player's pieces (not counting the king) that can move to each square
+
+    def MovesBySquare(self, colour):
+        # Generates every legal move of the player in one pass
+        if colour not in self.movesBySquare:
+            self.movesBySquare[colour] = LegacyMovesBySquare(GenerateLegalMoves(self.board.position, colour))
+
+        return self.movesBySquare[colour]
+
+    def Moves(self, colour):
+        if colour not in self.moves:
+            moves = []
+            for pieceMoves in self.MovesBySquare(colour).values():
+                moves.extend(pieceMoves)
+            self.moves[colour] = moves
+
+        return self.moves[colour]
+
+    def PieceMoveCount(self, piece, colour):
+        # The number of legal moves the pieces of the given type have between them
+        movesBySquare = self.MovesBySquare(colour)
+
+        return sum(len(movesBySquare.get(position, [])) for position in self.board.position.PieceSquares(piece, colour))
+
+    def AttackCount(self, colour, position):
+        # Counts the skewer moves too so a piece standing in front of a more valuable one still counts as attacked
+        if colour not in self.attackCounts:
+            self.attackCounts[colour] = Counter(self.Moves(colour) + self.aiGame.SkewerMoves(self.board, colour))
+
+        return self.attackCounts[colour][position]
+
+    def DefenceCount(self, colour, position):
+        if colour not in self.defenceCounts:
+            self.defenceCounts[colour] = Counter(self.aiGame.PieceDefenseMoves(self.board, colour))
+
+        return self.defenceCounts[colour][position]
+
+    def PieceMoves(self, position):
+        if position not in self.pieceMoves:
+            self.pieceMoves[position] = set(self.aiGame.PieceMovesData(self.board, position))
+
+        return self.pieceMoves[position]
+
+    def Attackers(self, colour, position):
+        # Returns the values of the attacking pieces in board order so adding them up gives the same result every time
+        if colour not in self.attackers:
+            attackers = {}
+            for attackerPosition in self.board.position.AllPiecePositions(colour):
+                value = self.board.PieceAtSquare(attackerPosition[0], attackerPosition[1]).value
+                for square in self.PieceMoves(attackerPosition):
+                    attackers.setdefault(square, []).append(value)
+            self.attackers[colour] = attackers
+
+        return self.attackers[colour].get(position, [])
+
@@ -0,0 +1,470 @@
+import argparse
+import math
+import random
+import time
+from . import AI
+from .Board import Board
+from .bitboard import PIECE_VALUES, INDEX_PIECE, POSITIONS, START_FEN, SquareIndex
+from .movegen import DIRECTIONS, ROOK_DIRECTIONS, RAY_SQUARES, KNIGHT_TARGETS, KING_TARGETS, OnBoard
+from .evalcache import MISSING
+
+# NumPy is optional. The game never needs it, it only lets the medium and hard difficulties score their moves together
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Scores the board after every move of the medium and hard difficulties at once with NumPy array operations instead of
+# one board at a time. Each board is packed into a row of 64 numbers (the bitboard index of the piece on each square, or
+# EMPTY) straight from the current board and the squares each move changes, without playing the moves. The rays, jumps
+# and steps of every piece are looked up in the packed rows to build which squares each piece moves to, controls and
+# skewers, and every term of the medium and hard evaluations (mobility, attack and defence counts, pins, castling, central
+# pawns and promotion) is counted from them, so the scores are exactly the ones the evaluations give one board at a time.
+# Boards where white is in check are still scored one at a time, as the check and checkmate bonuses need white's replies.
+# MediumMode and HardMode use it when EngineOptions.batchEvaluation is on, evaluationWorkers is 1 and NumPy is installed.
+# Usage: python -m chess.batch --difficulty Hard --games 20 (checks the batch scores against the evaluations and times both)
+
+BENCHMARK_FEN = 'r2q1rk1/ppp2ppp/2np1n2/2b1p1B1/2B1P1b1/2NP1N2/PPP2PPP/R2Q1RK1 b - - 0 8'
+EMPTY = 12 # The number an empty square is packed as (the bitboard indexes are 0-11)
+OFF = 13 # The number of the extra square every board is given so the rays, jumps and steps that leave the board fit in one array
+OFF_SQUARE = 64 # The index of the extra square
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6) # The piece types in the same order as the bitboards
+BLACK = 6 # Added to a white piece's bitboard index to get the black piece's
+MOST_MOVES = 256 # More than the most legal moves any position has
+MOST_PAIRS = 16 * 16 # The most black pieces that can attack an undefended white piece, counted in pairs
+
+DIRECTION_NAMES = list(DIRECTIONS)
+
+def NumpyInstalled():
+    return np != None
+
+def RequireNumpy():
+    if np == None:
+        raise ImportError('Batch evaluation needs NumPy, which can be installed with pip install numpy')
+
+def Padded(squares, length):
+    return squares + [OFF_SQUARE] * (length - len(squares))
+
+def Slides(kind, rookLine):
+    # Checks if a piece of the type moves along a line (rook lines are rows and columns, the others are diagonals)
+    return kind == QUEEN or (kind == ROOK and rookLine) or (kind == BISHOP and not rookLine)
+
+def PawnTargets(square, rowStep, startRow):
+    # The square a pawn pushes to, the square it double pushes to and the two squares it captures on (OFF_SQUARE if not on the board)
+    row, column = POSITIONS[square]
+    push = SquareIndex(row + rowStep, column) if OnBoard(row + rowStep, column) else OFF_SQUARE
+    double = SquareIndex(row + 2 * rowStep, column) if row == startRow else OFF_SQUARE
+    captures = [SquareIndex(row + rowStep, column + side) if OnBoard(row + rowStep, column + side) else OFF_SQUARE for side in [-1, 1]]
+
+    return [push, double] + captures
+
+def RepeatedSums(step, count):
+    # Adds the step up one at a time like a running score does so the totals are rounded the same way
+    sums = [0]
+    for number in range(count):
+        sums.append(sums[-1] + step)
+
+    return sums
+
+if np != None:
+    CODES = np.arange(14)
+    KIND_TABLE = np.array([code % 6 for code in range(12)] + [6, 6]) # Empty and off the board squares get a type of their own
+    WHITE_TABLE = CODES < BLACK
+    BLACK_TABLE = (CODES >= BLACK) & (CODES < EMPTY)
+    VALUE_TABLE = np.array([PIECE_VALUES[INDEX_PIECE[code][0]] for code in range(12)] + [0, 0])
+    # The material of each piece from black's point of view. The kings are left out as both players always have one
+    MATERIAL_TABLE = np.where(KIND_TABLE == KING, 0, np.where(WHITE_TABLE, -VALUE_TABLE, VALUE_TABLE))
+    ROOK_LINES = np.array([direction in ROOK_DIRECTIONS for direction in DIRECTION_NAMES])
+    SLIDES_TABLE = np.array([[Slides(KIND_TABLE[code], rookLine) for rookLine in ROOK_LINES] for code in range(14)])
+    ROOK_SLIDES_TABLE = SLIDES_TABLE[:, ROOK_LINES].any(axis=1)
+    BISHOP_SLIDES_TABLE = SLIDES_TABLE[:, ~ROOK_LINES].any(axis=1)
+    LINES = np.arange(len(DIRECTION_NAMES))
+
+    # The squares along each direction from each square, nearest first, and the squares up to and including each one
+    RAY_TABLE = np.array([[Padded(RAY_SQUARES[direction][square], 7) for direction in DIRECTION_NAMES] for square in range(64)])
+    RAY_PREFIXES = np.zeros((64, 8, 7, 65), dtype=bool)
+    for square in range(64):
+        for line in range(8):
+            for distance in range(7):
+                RAY_PREFIXES[square, line, distance, RAY_TABLE[square, line, :distance + 1]] = True
+    KNIGHT_TABLE = np.array([Padded(targets, 8) for targets in KNIGHT_TARGETS])
+    KING_TABLE = np.array([Padded(targets, 8) for targets in KING_TARGETS])
+    PAWN_TABLES = [np.array([PawnTargets(square, -1, 6) for square in range(64)]), # White pawns move up the board
+                   np.array([PawnTargets(square, 1, 1) for square in range(64)])]
+
+    # The square each entry of the tables above is moved from, for writing them into (N, 64, 65) arrays in one go
+    STEP_FROM = np.repeat(np.arange(64), 8)
+    PAWN_FROM = np.repeat(np.arange(64), 4)
+    CAPTURE_FROM = np.repeat(np.arange(64), 2)
+
+    # White's pieces apart from the king, and how much more each black piece is worth than each of them (0 if it isn't)
+    ATTACKER_TYPES = np.arange(KING).reshape(KING, 1)
+    VALUE_GAP_TABLE = np.array([[max(VALUE_TABLE[code] - VALUE_TABLE[attacker], 0) if BLACK_TABLE[code] and KIND_TABLE[code] != KING
+                                 else 0 for code in range(14)] for attacker in range(KING)])
+
+    ROWS = np.arange(8).reshape(1, 8, 1)
+    LOG_TABLE = np.array([0] + [math.log(count) for count in range(1, MOST_MOVES + 1)])
+    ATTACK_UNDEFENDED_TABLE = np.array(RepeatedSums(1.8, MOST_PAIRS))
+
+def PackedSquare(index):
+    return EMPTY if index == None else index
+
+def PackBoards(boards):
+    # Packs each board into a row of an (N, 64) int8 array
+    RequireNumpy()
+
+    return np.array([[PackedSquare(index) for index in board.position.mailbox] for board in boards], dtype=np.int8)
+
+def MoveWrites(mailbox, move):
+    # Returns the (square, packed piece) pairs the move writes, telling castling, promotions and enPassant captures apart
+    # the same way Board.MakeMove does
+    row, column, newRow, newColumn = move
+    fromSquare = SquareIndex(row, column)
+    toSquare = SquareIndex(newRow, newColumn)
+    piece = mailbox[fromSquare]
+    kind = piece % 6
+    castlingRow = 7 if piece < BLACK else 0
+    rowStart = castlingRow * 8
+    rook = piece - KING + ROOK
+
+    # Checks if the king is castling, which needs the rook on its square and nothing between them like Board.CanCastleKingside
+    if kind == KING and row == castlingRow == newRow and column == 5 and newColumn == 7 and mailbox[rowStart + 7] == rook\
+    and mailbox[rowStart + 5] == None and mailbox[rowStart + 6] == None:
+        return [(fromSquare, EMPTY), (toSquare, piece), (rowStart + 7, EMPTY), (rowStart + 5, rook)]
+
+    if kind == KING and row == castlingRow == newRow and column == 5 and newColumn == 3 and mailbox[rowStart] == rook\
+    and mailbox[rowStart + 1] == None and mailbox[rowStart + 2] == None and mailbox[rowStart + 3] == None:
+        return [(fromSquare, EMPTY), (toSquare, piece), (rowStart, EMPTY), (rowStart + 3, rook)]
+
+    # Checks if a pawn is moving to the end of the board so it promotes to a queen
+    if kind == PAWN and (newRow == 0 or newRow == 7):
+        return [(fromSquare, EMPTY), (toSquare, piece + QUEEN)]
+
+    # A pawn moving diagonally to an empty square can only be an enPassant capture
+    if kind == PAWN and column != newColumn and mailbox[toSquare] == None:
+        return [(fromSquare, EMPTY), (toSquare, piece), (SquareIndex(row, newColumn), EMPTY)]
+
+    return [(fromSquare, EMPTY), (toSquare, piece)]
+
+def PackMoves(position, moves):
+    # Packs the board after each move. Every row starts as a copy of the current board and only the squares the move
+    # changes are written, so no move has to be played on the board
+    RequireNumpy()
+    packed = np.repeat(PackBoards([position]), len(moves), axis=0)
+    mailbox = position.position.mailbox
+    rows, squares, pieces = [], [], []
+
+    for row, move in enumerate(moves):
+        for square, piece in MoveWrites(mailbox, move):
+            rows.append(row)
+            squares.append(square)
+            pieces.append(piece)
+
+    packed[rows, squares] = pieces
+
+    return packed
+
+def Reached(clear):
+    # Marks the squares along each ray (indexed by distance first, nearest square first) that have nothing but clear
+    # squares before them
+    reached = np.ones_like(clear)
+    for distance in range(1, len(clear)):
+        reached[distance] = reached[distance - 1] & clear[distance - 1]
+
+    return reached
+
+def Relations(board):
+    # Returns (N, 64, 64) arrays of the squares the piece on each square moves to (like GetValidMoves), controls (the
+    # 'Control' moves) and skewers through (the 'Skewer' moves), ignoring checks and pins
+    count = len(board)
+    boards = np.arange(count)
+    squares = board[:, :64]
+    kinds = KIND_TABLE[squares]
+    empty = board == EMPTY
+    occupied = (board != EMPTY) & (board != OFF)
+    white = board < BLACK
+    normal = np.zeros((count, 64, 65), dtype=bool)
+    control = np.zeros((count, 64, 65), dtype=bool)
+    skewer = np.zeros((count, 64, 65), dtype=bool)
+
+    # Walks every ray of every queen, rook and bishop at once. Each board's sliders are put first (followed by squares
+    # that slide along no lines) so only as many squares are walked as the board with the most sliders has, and the
+    # friendly and enemy pieces along each ray are from the point of view of the slider the ray starts from
+    slides = SLIDES_TABLE[squares]
+    slider = slides.any(axis=2)
+    sliders = np.argsort(~slider, axis=1, kind='stable')[:, :np.count_nonzero(slider, axis=1).max()]
+    rayBoards = boards[:, np.newaxis, np.newaxis]
+    targets = RAY_TABLE[sliders].transpose(3, 0, 1, 2) # Indexed by distance, board, slider and line
+    slides = np.take_along_axis(slides, sliders[:, :, np.newaxis], axis=1)
+    moverWhite = np.take_along_axis(white[:, :64], sliders, axis=1)[:, :, np.newaxis]
+    emptyRays = empty[rayBoards, targets]
+    occupiedRays = occupied[rayBoards, targets]
+    sameColour = white[rayBoards, targets] == moverWhite
+    friendly = occupiedRays & sameColour
+    enemy = occupiedRays & ~sameColour
+    enemyKing = enemy & (KIND_TABLE[board] == KING)[rayBoards, targets]
+    # A friendly piece is looked through for skewers if it moves along the same line
+    skewerSkips = friendly & ((ROOK_SLIDES_TABLE[board][rayBoards, targets] & ROOK_LINES)
+                              | (BISHOP_SLIDES_TABLE[board][rayBoards, targets] & ~ROOK_LINES))
+
+    sliders = sliders[:, :, np.newaxis]
+    normal[rayBoards, sliders, targets] = slides & Reached(emptyRays) & (emptyRays | enemy)
+    # Control rays carry on through the enemy king so the squares behind it still count as controlled
+    control[rayBoards, sliders, targets] = slides & Reached(emptyRays | enemyKing) & (emptyRays | friendly)
+    skewer[rayBoards, sliders, targets] = slides & Reached(emptyRays | skewerSkips) & (emptyRays | enemy)
+
+    # Knights and kings move to the squares of their jumps and steps that are empty or hold an enemy piece, and control
+    # the ones that are empty or hold a friendly piece
+    moverWhite = white[:, :64, np.newaxis]
+    for kind, table in ((KNIGHT, KNIGHT_TABLE), (KING, KING_TABLE)):
+        mover = (kinds == kind)[:, :, np.newaxis]
+        sameColour = white[:, table] == moverWhite
+        targetEmpty = empty[:, table]
+        targetOccupied = occupied[:, table]
+
+        normal[:, STEP_FROM, table.reshape(-1)] |= (mover & (targetEmpty | (targetOccupied & ~sameColour))).reshape(count, -1)
+        control[:, STEP_FROM, table.reshape(-1)] |= (mover & (targetEmpty | (targetOccupied & sameColour))).reshape(count, -1)
+
+    # Pawns push to empty squares (two squares from their starting row if both are empty), capture enemy pieces
+    # diagonally and control the diagonal squares that are empty or hold a friendly piece
+    for colour, table in enumerate(PAWN_TABLES):
+        mover = (squares == colour * BLACK + PAWN)[:, :, np.newaxis]
+        targetEmpty = empty[:, table]
+        targetOccupied = occupied[:, table]
+        sameColour = white[:, table] == (colour == 0)
+
+        moves = np.concatenate([targetEmpty[..., :1], targetEmpty[..., :1] & targetEmpty[..., 1:2],
+                                targetOccupied[..., 2:] & ~sameColour[..., 2:]], axis=-1)
+        normal[:, PAWN_FROM, table.reshape(-1)] |= (mover & moves).reshape(count, -1)
+        controls = targetEmpty[..., 2:] | (targetOccupied[..., 2:] & sameColour[..., 2:])
+        control[:, CAPTURE_FROM, table[:, 2:].reshape(-1)] |= (mover & controls).reshape(count, -1)
+
+    return normal[:, :, :64], control[:, :, :64], skewer[:, :, :64]
+
+def PinMasks(board, king):
+    # Returns an (N, 64, 64) array of the squares each piece of the king's colour can move to without leaving the king
+    # attacked through a pin, the same as the pin rays of movegen.CheckAndPins
+    count = len(board)
+    boards = np.arange(count)
+    own, other = (WHITE_TABLE, BLACK_TABLE) if king == KING else (BLACK_TABLE, WHITE_TABLE)
+    kingSquares = np.argmax(board[:, :64] == king, axis=1)
+
+    # Finds the first two pieces along every line from the king
+    lines = board[boards[:, np.newaxis, np.newaxis], RAY_TABLE[kingSquares]]
+    occupied = lines != EMPTY
+    first = np.argmax(occupied, axis=2)
+    behind = occupied & (np.arange(7) > first[..., np.newaxis])
+    second = np.argmax(behind, axis=2)
+    firstPiece = np.take_along_axis(lines, first[..., np.newaxis], axis=2)[..., 0]
+    secondPiece = np.take_along_axis(lines, second[..., np.newaxis], axis=2)[..., 0]
+
+    # The first piece is pinned if it is friendly and the next piece along is an enemy slider that moves along the line
+    pinned = own[firstPiece] & behind.any(axis=2) & other[secondPiece] & SLIDES_TABLE[secondPiece, LINES]
+
+    # A pinned piece can only move along the line between the king and the pinning piece, or capture the pinning piece
+    masks = np.ones((count, 64, 65), dtype=bool)
+    pinnedBoards, pinnedLines = np.nonzero(pinned)
+    pinnedKings = kingSquares[pinnedBoards]
+    pinnedSquares = RAY_TABLE[pinnedKings, pinnedLines, first[pinnedBoards, pinnedLines]]
+    masks[pinnedBoards, pinnedSquares] = RAY_PREFIXES[pinnedKings, pinnedLines, second[pinnedBoards, pinnedLines]]
+
+    return masks[:, :, :64]
+
+def BatchEvaluate(packed, difficulty):
+    # Returns an (N,) array of the medium or hard evaluation of every packed board and an (N,) array marking the boards
+    # that have to be scored one at a time instead because white is in check (their scores in the first array are wrong)
+    RequireNumpy()
+    count = len(packed)
+    boards = np.arange(count)
+    board = np.concatenate([packed.astype(np.intp), np.full((count, 1), OFF, dtype=np.intp)], axis=1)
+    squares = board[:, :64]
+    kinds = KIND_TABLE[squares]
+    white = WHITE_TABLE[squares]
+    black = BLACK_TABLE[squares]
+    whitePieces = white & (kinds != KING)
+    blackPieces = black & (kinds != KING)
+
+    normal, control, skewer = Relations(board)
+    whiteKings = np.argmax(squares == KING, axis=1)
+    checked = (normal[boards, :, whiteKings] & blackPieces).any(axis=1)
+
+    # The attack counts are white's legal moves (the king only captures undefended pieces) and skewer moves onto each
+    # square, and the defence counts are the pieces of each player that control each square
+    whiteLegal = normal & PinMasks(board, KING)
+    blackLegal = normal & PinMasks(board, KING + BLACK)
+    blackDefence = np.count_nonzero(control & black[:, :, np.newaxis], axis=1)
+    whiteDefence = np.count_nonzero(control & white[:, :, np.newaxis], axis=1)
+    kingCaptures = normal[boards, whiteKings] & (blackDefence == 0)
+    attacks = np.count_nonzero(whiteLegal & whitePieces[:, :, np.newaxis], axis=1) + kingCaptures\
+    + np.count_nonzero(skewer & white[:, :, np.newaxis], axis=1)
+
+    # The game phase from the number of pieces that aren't kings
+    pieceCount = np.count_nonzero(kinds < KING, axis=1)
+    opening = pieceCount >= 25
+    endgame = pieceCount < 15
+
+    # Positional evaluation: black's legal moves (not counting the queen in the opening), material, castling and central pawns
+    counted = blackPieces & ((kinds != QUEEN) | ~opening[:, np.newaxis])
+    mobility = LOG_TABLE[np.count_nonzero(blackLegal & counted[:, :, np.newaxis], axis=(1, 2))]
+    material = MATERIAL_TABLE[squares].sum(axis=1)
+    castled = ((squares[:, 6] == KING + BLACK) & (squares[:, 7] == EMPTY) & (squares[:, 5] == ROOK + BLACK))\
+    | ((squares[:, 2] == KING + BLACK) & (squares[:, 0] == EMPTY) & (squares[:, 1] == EMPTY) & (squares[:, 3] == ROOK + BLACK))
+    canCastle = (squares[:, 4] == KING + BLACK) & (((squares[:, 7] == ROOK + BLACK) & (squares[:, 5:7] == EMPTY).all(axis=1))
+                                                   | ((squares[:, 0] == ROOK + BLACK) & (squares[:, 1:4] == EMPTY).all(axis=1)))
+    central = (squares[:, 27] == PAWN + BLACK).astype(int) + (squares[:, 28] == PAWN + BLACK)
+    positional = np.where(material < 0, 4 * material, 0) + 5 * castled + 2.5 * canCastle
+    positiveAdvantage = np.where(material > 0, 1.5 * material, 0)
+    positionalEvaluation = mobility * 0.6 + positional + central * 0.8 + positiveAdvantage
+
+    # High value attacked: 6 times the value deficit of every black piece a less valuable white piece can move to,
+    # counting how many white pieces of each type can move to each square
+    attackerTypes = (squares[:, np.newaxis, :] == ATTACKER_TYPES).astype(np.float32)
+    attackers = np.matmul(attackerTypes, normal.astype(np.float32))
+    highValueAttacked = -6 * (attackers * VALUE_GAP_TABLE[:, squares].transpose(1, 0, 2)).sum(axis=(1, 2))
+
+    if difficulty == 'Medium':
+        # Defense: 7 for every black piece that is attacked and not defended
+        exposed = blackPieces & (attacks > 0) & (blackDefence == 0)
+        return positionalEvaluation - 7 * np.count_nonzero(exposed, axis=1) + highValueAttacked, checked
+
+    # Better defense: the worst black piece attacked more times than it is defended, weighted by its value
+    balance = blackDefence - attacks
+    values = VALUE_TABLE[squares]
+    losses = np.where(blackPieces & (balance < 0), np.where(kinds == PAWN, -3, balance * values * 1.35), np.inf)
+    betterDefense = losses.min(axis=1)
+    betterDefense[np.isinf(betterDefense)] = 0
+
+    # Attack undefended: 1.8 for every undefended white piece a black piece can move to that can't move back to it
+    undefended = whitePieces & (whiteDefence == 0)
+    pairs = normal & ~normal.transpose(0, 2, 1) & black[:, :, np.newaxis] & undefended[:, np.newaxis, :]
+    attackUndefended = ATTACK_UNDEFENDED_TABLE[np.count_nonzero(pairs, axis=(1, 2))]
+
+    # Queen out early: black's first queen in white's half of the board in the opening without more material than white
+    blackQueens = squares == QUEEN + BLACK
+    queenOut = opening & (material <= 0) & blackQueens.any(axis=1) & (np.argmax(blackQueens, axis=1) >= 32)
+    score = np.where(queenOut, -4, 0) + np.where(endgame & castled, -6, 0)
+
+    # Promotion bonus: the black pawns with nothing in front of them, the furthest forward ones getting the most
+    grid = squares.reshape(count, 8, 8)
+    clear = np.ones_like(grid, dtype=bool)
+    clear[:, :-1] = np.flip(np.logical_and.accumulate(np.flip(grid[:, 1:] == EMPTY, axis=1), axis=1), axis=1)
+    pawns = grid == PAWN + BLACK
+    furthest = np.where(pawns, ROWS, -1).max(axis=(1, 2))[:, np.newaxis, np.newaxis]
+    promotionBonus = ((pawns & clear) * np.where(ROWS == furthest, 7 + ROWS, 5 + ROWS)).sum(axis=(1, 2))
+
+    searchEvaluation = positionalEvaluation + np.where(endgame, promotionBonus, 0) + score
+    return searchEvaluation + highValueAttacked + betterDefense + attackUndefended, checked
+
+def BatchScores(position, moves, difficulty):
+    # Returns the medium or hard evaluation of the board after each move like MediumScore and HardScore do. Each board is
+    # looked for in the evaluation cache first and only the boards that aren't cached are scored in the batch (the hard
+    # difficulty also checks them for a checkmate by white first), so a position is never scored twice. Boards where
+    # white is in check are scored one at a time, and every new score is stored in the cache
+    evaluate = AI.aiGame.MediumEvaluation if difficulty == 'Medium' else AI.aiGame.HardEvaluation
+    evaluations = [None] * len(moves)
+    unscored = [] # The moves whose boards aren't cached (and can't be checkmated after), so are scored in the batch
+    hashes = {}
+
+    for index, move in enumerate(moves):
+        undo = AI.PlayMove(position, move)
+        evaluation = AI.evaluationCache.Probe(difficulty, position.hash)
+
+        # Checks if the board has been scored before, and only checks for a checkmate by white if not
+        if evaluation is not MISSING:
+            evaluations[index] = evaluation
+        elif difficulty == 'Hard' and AI.WhiteCanMate(position):
+            AI.evaluationCache.Store(difficulty, position.hash, None)
+        else:
+            unscored.append(index)
+            hashes[index] = position.hash
+
+        position.UnmakeMove(undo)
+
+    if unscored:
+        scores, checked = BatchEvaluate(PackMoves(position, [moves[index] for index in unscored]), difficulty)
+
+        for index, score, inCheck in zip(unscored, scores.tolist(), checked.tolist()):
+            if inCheck:
+                undo = AI.PlayMove(position, moves[index])
+                score = evaluate(position)
+                position.UnmakeMove(undo)
+
+            evaluations[index] = score
+            AI.evaluationCache.Store(difficulty, hashes[index], score)
+
+    return evaluations
+
+def ScalarScores(position, moves, difficulty):
+    # Scores the board after each move one at a time with the evaluation, which the batch scores should match
+    score = AI.MediumScore if difficulty == 'Medium' else AI.HardScore
+
+    return [score(position, move) for move in moves]
+
+def RandomPositions(games, plies, seed):
+    # Plays random games from the starting position and returns the FEN of every position with black to move
+    generator = random.Random(seed)
+    fens = []
+
+    for game in range(games):
+        board = Board()
+        board.LoadFen(START_FEN)
+        for ply in range(plies):
+            colour = board.position.sideToMove
+            moves = [move for move, record in AI.AllMoves(board, colour)]
+            if moves == []:
+                break
+            if colour == 'Black':
+                fens.append(board.Fen())
+            AI.PlayMove(board, generator.choice(moves))
+
+    return fens
+
+def Benchmark(fen, difficulty, repeats, games, seed):
+    # Checks the batch scores are the same as the evaluation's on the benchmark position and every black move of the
+    # random games, then times scoring the benchmark position's moves one at a time and in one batch
+    board = Board()
+    mismatches = 0
+    fens = [fen] + RandomPositions(games, 120, seed)
+
+    for position in fens:
+        board.LoadFen(position)
+        moves = [move for move, record in AI.AllMoves(board, 'Black')]
+        AI.evaluationCache.Clear()
+        scalarScores = ScalarScores(board, moves, difficulty)
+        AI.evaluationCache.Clear()
+        batchScores = BatchScores(board, moves, difficulty)
+
+        # The scores are worked out with the same operations in the same order so they should be exactly the same
+        if scalarScores != batchScores:
+            mismatches += 1
+            print(f'different scores in {position}')
+
+    board.LoadFen(fen)
+    moves = [move for move, record in AI.AllMoves(board, 'Black')]
+    timings = {}
+    for name, scores in (('one at a time', ScalarScores), ('batch', BatchScores)):
+        start = time.perf_counter()
+        for repeat in range(repeats):
+            AI.evaluationCache.Clear() # Every repeat scores the boards again instead of finding them in the cache
+            scores(board, moves, difficulty)
+        timings[name] = (time.perf_counter() - start) / repeats
+
+    print(f'{difficulty}: {len(fens)} positions checked, {mismatches} different  {len(moves)} moves  '
+          + '  '.join(f'{name} {seconds * 1000:.2f}ms' for name, seconds in timings.items()))
+
+    return mismatches == 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Checks the batch evaluation against the medium or hard evaluation and times both')
+    parser.add_argument('--fen', default=BENCHMARK_FEN, help='the position to time scoring the moves of (defaults to a middlegame)')
+    parser.add_argument('--difficulty', choices=['Medium', 'Hard'], default='Medium')
+    parser.add_argument('--repeats', type=int, default=20, help='the number of times the moves are scored')
+    parser.add_argument('--games', type=int, default=20, help='the number of random games whose positions are checked')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the random games')
+    arguments = parser.parse_args()
+
+    RequireNumpy()
+    return 0 if Benchmark(arguments.fen, arguments.difficulty, arguments.repeats, arguments.games, arguments.seed) else 1
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,294 @@
+from bisect import insort
+from .zobrist import PIECE_KEYS, StateKey
+from .pst import MIDDLEGAME_SCORES, ENDGAME_SCORES, PHASE_WEIGHTS, TaperedScore
+
+COLOURS = ['White', 'Black']
+PIECES = ['Pawn', 'Knight', 'Bishop', 'Rook', 'Queen', 'King']
+
+# The same relative values the piece classes use
+PIECE_VALUES = {'Pawn': 1, 'Knight': 3, 'Bishop': 3.5, 'Rook': 5, 'Queen': 9, 'King': 100000}
+
+# Maps a piece name and colour to the index of its bitboard (white pieces are 0-5, black pieces are 6-11)
+PIECE_INDEX = {(name, colour): COLOURS.index(colour) * 6 + PIECES.index(name) for colour in COLOURS for name in PIECES}
+# Maps the index of a bitboard back to the piece name and colour it holds
+INDEX_PIECE = [(name, colour) for colour in COLOURS for name in PIECES]
+
+# Each castling right is one bit of the castlingRights number
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+ALL_CASTLING = 15
+
+# Square 0 is row 0, column 1 (the top left of the board) and square 63 is row 7, column 8 (the bottom right)
+# so going through the squares in order visits them in the same order as the row/column double loops
+POSITIONS = [(square // 8, square % 8 + 1) for square in range(64)]
+
+# The FEN letter of each piece type (uppercase for white and lowercase for black)
+FEN_PIECES = {'p': 'Pawn', 'n': 'Knight', 'b': 'Bishop', 'r': 'Rook', 'q': 'Queen', 'k': 'King'}
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+def SquareIndex(row, column):
+    return row * 8 + column - 1 # Converts a board row and column (columns 1-8) to a square index
+
+def SquarePosition(square):
+    return POSITIONS[square] # Converts a square index back to a board row and column
+
+def SquareName(square):
+    # Converts a square index to its name in algebraic notation (row 0 is the 8th rank)
+    return 'abcdefgh'[square % 8] + str(8 - square // 8)
+
+def SquareFromName(name):
+    return (8 - int(name[1])) * 8 + 'abcdefgh'.index(name[0]) # Converts an algebraic square name such as 'e4' to a square index
+
+# The castling rights that survive a piece moving from or to each square.
+# Moving the king loses both rights of that colour and moving (or capturing) a rook on its starting corner loses that side's right
+CASTLING_MASKS = [ALL_CASTLING] * 64
+CASTLING_MASKS[4] = ALL_CASTLING ^ (BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_MASKS[0] = ALL_CASTLING ^ BLACK_QUEENSIDE
+CASTLING_MASKS[7] = ALL_CASTLING ^ BLACK_KINGSIDE
+CASTLING_MASKS[60] = ALL_CASTLING ^ (WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASKS[56] = ALL_CASTLING ^ WHITE_QUEENSIDE
+CASTLING_MASKS[63] = ALL_CASTLING ^ WHITE_KINGSIDE
+
+def PopCount(bitboard):
+    return bitboard.bit_count() # The number of squares set in the bitboard
+
+def BitScan(bitboard):
+    return (bitboard & -bitboard).bit_length() - 1 # The index of the lowest square set in the bitboard
+
+def BitScanReverse(bitboard):
+    return bitboard.bit_length() - 1 # The index of the highest square set in the bitboard
+
+def Squares(bitboard):
+    squares = []
+
+    # Keeps taking the lowest set square off the bitboard until it is empty
+    while bitboard:
+        lowestBit = bitboard & -bitboard
+        squares.append(lowestBit.bit_length() - 1)
+        bitboard ^= lowestBit
+
+    return squares
+
+class BitboardPosition:
+    def __init__(self):
+        self.pieces = [0] * 12 # One 64-bit integer for each piece type and colour
+        self.occupancy = [0, 0] # The squares occupied by white pieces and by black pieces
+        self.allOccupancy = 0 # The squares occupied by any piece
+        self.mailbox = [None] * 64 # Holds the bitboard index of the piece on each square so a single square can be looked up directly
+        # Running totals kept up to date as pieces are put on and taken off so the evaluation doesn't have to count them
+        self.counts = [0] * 12 # The number of pieces of each type and colour, in the same order as the bitboards
+        self.material = [0, 0] # The total value of the white pieces and of the black pieces (including the kings)
+        self.pieceCount = 0 # The number of pieces on the board that are not kings
+        self.pieceLists = [[] for _ in range(12)] # The squares of the pieces of each type and colour, kept in board order
+        self.middlegame = [0, 0] # The middlegame piece-square scores of the white pieces and of the black pieces (centipawns)
+        self.endgame = [0, 0] # The endgame piece-square scores of the white pieces and of the black pieces (centipawns)
+        self.phase = 0 # How much material is left, from 0 (the endgame) up to 24 (every piece on the board)
+        self.sideToMove = 'White' # Initialised to white because white makes the first move
+        self.castlingRights = ALL_CASTLING # Holds which of the four castling moves each player still has the right to play
+        self.enPassantSquare = None # Holds the square a pawn skipped over with its two square move so it can be captured enPassant
+        self.hash = StateKey(self.sideToMove, self.castlingRights, self.enPassantSquare) # The Zobrist key of the position
+        self.pawnHash = 0 # A Zobrist key made from the pawns alone so positions with the same pawns share pawn structure scores
+
+    def PutPiece(self, name, colour, square):
+        index = PIECE_INDEX[(name, colour)]
+        bit = 1 << square
+
+        self.pieces[index] |= bit
+        self.occupancy[index // 6] |= bit
+        self.allOccupancy |= bit
+        self.mailbox[square] = index
+        self.hash ^= PIECE_KEYS[index][square]
+        if index % 6 == 0:
+            self.pawnHash ^= PIECE_KEYS[index][square]
+        self.counts[index] += 1
+        insort(self.pieceLists[index], square)
+        self.middlegame[index // 6] += MIDDLEGAME_SCORES[index][square]
+        self.endgame[index // 6] += ENDGAME_SCORES[index][square]
+        self.phase += PHASE_WEIGHTS[index % 6]
+        self.material[index // 6] += PIECE_VALUES[name]
+        if name != 'King':
+            self.pieceCount += 1
+
+    def TakePiece(self, square):
+        index = self.mailbox[square]
+
+        # Checks if there is a piece on the square to remove
+        if index != None:
+            bit = 1 << square
+            self.pieces[index] ^= bit
+            self.occupancy[index // 6] ^= bit
+            self.allOccupancy ^= bit
+            self.mailbox[square] = None
+            self.hash ^= PIECE_KEYS[index][square]
+            if index % 6 == 0:
+                self.pawnHash ^= PIECE_KEYS[index][square]
+            self.counts[index] -= 1
+            self.pieceLists[index].remove(square)
+            self.middlegame[index // 6] -= MIDDLEGAME_SCORES[index][square]
+            self.endgame[index // 6] -= ENDGAME_SCORES[index][square]
+            self.phase -= PHASE_WEIGHTS[index % 6]
+            self.material[index // 6] -= PIECE_VALUES[PIECES[index % 6]]
+            if index % 6 != 5:
+                self.pieceCount -= 1
+
+        return index # Returns the index of the removed piece (None if the square was empty)
+
+    def UpdateState(self, fromSquare, toSquare, enPassantSquare):
+        # Switches the side to move
+        if self.sideToMove == 'White':
+            sideToMove = 'Black'
+        else:
+            sideToMove = 'White'
+
+        # Removes the castling rights lost by a piece leaving or arriving at a king or rook starting square
+        self.SetState((sideToMove, self.castlingRights & CASTLING_MASKS[fromSquare] & CASTLING_MASKS[toSquare], enPassantSquare))
+
+    def GetState(self):
+        return (self.sideToMove, self.castlingRights, self.enPassantSquare)
+
+    def SetState(self, state):
+        # Swaps the key of the old state for the key of the new one
+        self.hash ^= StateKey(self.sideToMove, self.castlingRights, self.enPassantSquare) ^ StateKey(*state)
+        self.sideToMove, self.castlingRights, self.enPassantSquare = state
+
+    def PieceAt(self, row, column):
+        index = self.mailbox[SquareIndex(row, column)]
+
+        # Checks if a piece is on the square and returns its name and colour if so
+        if index != None:
+            return INDEX_PIECE[index]
+
+        return None
+
+    def PieceBitboard(self, name, colour):
+        return self.pieces[PIECE_INDEX[(name, colour)]]
+
+    def ColourBitboard(self, colour):
+        return self.occupancy[COLOURS.index(colour)]
+
+    def PieceCount(self, name, colour):
+        return self.counts[PIECE_INDEX[(name, colour)]]
+
+    def PieceSquares(self, name, colour):
+        # Returns the row and column of every piece of the given type and colour in board order
+        return [POSITIONS[square] for square in self.pieceLists[PIECE_INDEX[(name, colour)]]]
+
+    def KingSquare(self, colour):
+        kings = self.pieceLists[PIECE_INDEX[('King', colour)]]
+
+        # Checks if the player has a king so a position without one gives -1 like scanning an empty bitboard does
+        if kings:
+            return kings[0]
+
+        return -1
+
+    def ColourSquares(self, colour):
+        # Returns the row and column of every piece of the given colour in board order
+        return [POSITIONS[square] for square in Squares(self.occupancy[COLOURS.index(colour)])]
+
+    def PiecePositions(self, name, colour):
+        # Dictionary which stores the row and column of the piece as the value and the piece number as the key
+        pieces = {1: None, 2: None, 3: None, 4: None, 5: None, 6: None, 7: None, 8: None, 9: None}
+
+        # Adds the positions IN TURN to be the value of the keys in the dictionary
+        for key, square in enumerate(self.pieceLists[PIECE_INDEX[(name, colour)]], 1):
+            pieces[key] = POSITIONS[square]
+
+        return pieces
+
+    def AllPiecePositions(self, colour):
+        # All the pieces of the given colour apart from the king
+        bitboard = self.occupancy[COLOURS.index(colour)] & ~self.pieces[PIECE_INDEX[('King', colour)]]
+
+        return [POSITIONS[square] for square in Squares(bitboard)]
+
+    def Material(self, colour):
+        return self.material[COLOURS.index(colour)] # The relative value of each piece type multiplied by how many of them are on the board
+
+    def PlayerPieces(self, colour):
+        pieceValues = []
+        start = COLOURS.index(colour) * 6
+
+        # Adds the value of every piece of the given colour apart from the king to the piece values list
+        for name, count in zip(PIECES[:5], self.counts[start:start + 5]):
+            pieceValues.extend([PIECE_VALUES[name]] * count)
+
+        return pieceValues
+
+    def PieceSquareScore(self, colour):
+        # The piece-square score of the player's pieces in pawns, blended between the middlegame and endgame by the phase
+        colourIndex = COLOURS.index(colour)
+
+        return TaperedScore(self.middlegame[colourIndex], self.endgame[colourIndex], self.phase)
+
+    def PlayerPieceCount(self, colour):
+        start = COLOURS.index(colour) * 6
+        return sum(self.counts[start:start + 5]) # The number of pieces of the given colour apart from the king
+
+    def AllPieces(self):
+        return self.PlayerPieces('White') + self.PlayerPieces('Black') # The values of every piece apart from the kings
+
+def PositionFromFen(fen):
+    # Builds a position from a FEN string. The halfmove clock and move number are not tracked so they are ignored
+    fields = fen.split()
+    position = BitboardPosition()
+
+    # The first field lists the pieces one row at a time starting from row 0, with digits counting empty squares
+    for row, rowText in enumerate(fields[0].split('/')):
+        column = 1
+        for letter in rowText:
+            if letter.isdigit():
+                column += int(letter)
+            else:
+                colour = 'White' if letter.isupper() else 'Black'
+                position.PutPiece(FEN_PIECES[letter.lower()], colour, SquareIndex(row, column))
+                column += 1
+
+    sideToMove = 'White' if fields[1] == 'w' else 'Black'
+    castlingRights = 0
+    enPassantSquare = None
+
+    # Adds each castling right listed in the third field
+    for letter, right in zip('KQkq', [WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE]):
+        if letter in fields[2]:
+            castlingRights |= right
+
+    # Checks if an enPassant square is given
+    if fields[3] != '-':
+        enPassantSquare = SquareFromName(fields[3])
+
+    position.SetState((sideToMove, castlingRights, enPassantSquare)) # Sets the state this way so the key stays correct
+    return position
+
+def FenFromPosition(position):
+    # Writes a position as a FEN string, the opposite of PositionFromFen, which is a compact way to send a position elsewhere
+    rows = []
+
+    for row in range(8):
+        rowText = ''
+        empty = 0
+        for column in range(1, 9):
+            piece = position.PieceAt(row, column)
+            # Counts the empty squares in a row of them so they can be written as one digit
+            if piece == None:
+                empty += 1
+                continue
+
+            if empty > 0:
+                rowText += str(empty)
+                empty = 0
+            name, colour = piece
+            letter = 'n' if name == 'Knight' else name[0].lower()
+            rowText += letter.upper() if colour == 'White' else letter
+        if empty > 0:
+            rowText += str(empty)
+        rows.append(rowText)
+
+    # Adds each castling right the position still has ('-' if there are none)
+    castling = ''.join(letter for letter, right in zip('KQkq', [WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE])
+                       if position.castlingRights & right) or '-'
+    enPassant = SquareName(position.enPassantSquare) if position.enPassantSquare != None else '-'
+
+    return ' '.join(['/'.join(rows), 'w' if position.sideToMove == 'White' else 'b', castling, enPassant, '0', '1'])
@@ -1,6 +1,9 @@
 import pygame
 from .Constants import WHITE, SQUARE_WIDTH, SQUARE_HEIGHT, DGREY
 from .Pieces import *
+from .bitboard import BitboardPosition, SquareIndex, PositionFromFen, FenFromPosition, POSITIONS
+
+PIECE_CLASSES = {'Pawn': Pawn, 'Knight': Knight, 'Bishop': Bishop, 'Rook': Rook, 'Queen': Queen, 'King': King}
 
 class BoardSquares:
     def __init__(self, row, column, piece=None):
@@ -15,11 +18,20 @@ class BoardSquares:
         
         return False
 
+class UndoRecord:
+    def __init__(self, move, squares, state, captured=None):
+        self.move = move # The (row, column, newRow, newColumn) tuple that was played
+        self.squares = squares # The (row, column, piece) of every square the move touched, as they were before the move
+        self.state = state # The side to move, castling rights and enPassant square before the move
+        self.captured = captured # The piece that was captured by the move (None if it wasn't a capture)
+
 class Board:
     def __init__(self):
         #Initialises the board as an 8x9 2D array to allow the pieces to shift one column
         #to the right to stay away from the left-side grey panel and avoid indexing errors later on.
         self.board = [[None for _ in range(9)] for _ in range(8)]
+        self.position = BitboardPosition() # Holds the same pieces as bitboards so set-wise queries don't have to scan every square
+        self.history = [] # Stores the undo record of every move made with MakeMove so they can be taken back in order
 
         self.CreateBoard() # Calls the method responsible for assigning a piece object to each square on the board
         # This method places all the white pieces on their starting squares internally
@@ -46,7 +58,7 @@ class Board:
             # Required to start from column 1 otherwise some of the pieces would be on the grey panels on the left-side.
             for column in range(1, 9):
                 # Assigns a piece object on each square of the board
-                self.board[row][column] = BoardSquares(row, column - 1)
+                self.board[row][column] = BoardSquares(row, column)
 
     def PlacePieces(self, colour):
         if colour == 'White':
@@ -60,25 +72,43 @@ class Board:
 
         # Places the pawns at their required rows.
         for column in range(1, 9):
-            self.board[pawnRow][column] = BoardSquares(pawnRow, column - 1, Pawn(colour))
+            self.SetPiece(pawnRow, column, Pawn(colour))
 
         # Places the bishops at their designated starting squares
-        self.board[pieceRow][3] = BoardSquares(pieceRow, 3, Bishop(colour))
-        self.board[pieceRow][6] = BoardSquares(pieceRow, 6, Bishop(colour))
+        self.SetPiece(pieceRow, 3, Bishop(colour))
+        self.SetPiece(pieceRow, 6, Bishop(colour))
 
         # Places the knights at their starting squares
-        self.board[pieceRow][2] = BoardSquares(pieceRow, 2, Knight(colour))
-        self.board[pieceRow][7] = BoardSquares(pieceRow, 7, Knight(colour))
+        self.SetPiece(pieceRow, 2, Knight(colour))
+        self.SetPiece(pieceRow, 7, Knight(colour))
 
         # Places the Rooks at their starting positions
-        self.board[pieceRow][1] = BoardSquares(pieceRow, 1, Rook(colour))
-        self.board[pieceRow][8] = BoardSquares(pieceRow, 8, Rook(colour))
+        self.SetPiece(pieceRow, 1, Rook(colour))
+        self.SetPiece(pieceRow, 8, Rook(colour))
 
         # Places the Queen at its starting square
-        self.board[pieceRow][4] = BoardSquares(pieceRow, 4, Queen(colour))
+        self.SetPiece(pieceRow, 4, Queen(colour))
 
         # Places the King at its starting square
-        self.board[pieceRow][5] = BoardSquares(pieceRow, 5, King(colour))
+        self.SetPiece(pieceRow, 5, King(colour))
+
+    @property
+    def hash(self):
+        return self.position.hash # The Zobrist key of the position, kept up to date by every change made to the board
+
+    # Every change to the pieces on the board goes through this method so the bitboards always match the squares
+    def SetPiece(self, row, column, piece):
+        square = self.board[row][column]
+
+        # Removes the piece that was on the square from the bitboards
+        if square.piece != None:
+            self.position.TakePiece(SquareIndex(row, column))
+
+        square.piece = piece
+
+        # Adds the new piece to the bitboards
+        if piece != None:
+            self.position.PutPiece(piece.name, piece.colour, SquareIndex(row, column))
 
     def DisplayPieces(self, screen):
         for row in range(8):
@@ -100,9 +130,9 @@ class Board:
     def MovePiece(self, pieceSquare, newRow, newColumn):
         piece = pieceSquare.piece
         # Changes the internal state of the previous square to None so no piece appears on it
-        pieceSquare.piece = None
+        self.SetPiece(pieceSquare.row, pieceSquare.column, None)
         # Assigns the piece to the new square that it just moved to
-        self.board[newRow][newColumn].piece = piece
+        self.SetPiece(newRow, newColumn, piece)
 
     def PieceAtSquare(self, row, column):
         if 0 <= row <= 7 and 1 <= column <= 8:
@@ -179,7 +209,7 @@ class Board:
     def Promote(self, row, column, colour):
         # Checks if a player has reached the end of the board (the starting row of their opponent)
         if (colour == 'White' and row == 0) or (colour == 'Black' and row == 7):
-            self.board[row][column] = BoardSquares(row, column, Queen(colour)) # Places a queen on the square
+            self.SetPiece(row, column, Queen(colour)) # Places a queen on the square
 
     def EnPassant(self, square, row, column, colour):
         # Uses the piece colour to determine what row the removed pawn should be on
@@ -193,5 +223,117 @@ class Board:
 
     # This method removes the piece on the row and column passed to it
     def Remove(self, row, column):
-        square = self.board[row][column]
-        square.piece = None # By setting the piece attribute to None, the piece is removed
\ No newline at end of file
+        self.SetPiece(row, column, None) # By setting the piece attribute to None, the piece is removed
+
+    def MakeMove(self, move):
+        row, column, newRow, newColumn = move
+        piece = self.board[row][column].piece
+        colour = piece.colour
+
+        # Checks the colour to determine the castling row correctly
+        if colour == 'White':
+            castlingRow = 7
+        else:
+            castlingRow = 0
+
+        # Checks if the king is moving two squares to the right from its starting square so kingside castling is performed
+        if piece.name == 'King' and row == castlingRow == newRow and column == 5 and newColumn == 7 and self.CanCastleKingside(colour):
+            squares = [(row, 5), (row, 6), (row, 7), (row, 8)]
+            moveType = 'kingside'
+
+        # Checks if the king is moving two squares to the left from its starting square so queenside castling is performed
+        elif piece.name == 'King' and row == castlingRow == newRow and column == 5 and newColumn == 3 and self.CanCastleQueenside(colour):
+            squares = [(row, 1), (row, 2), (row, 3), (row, 4), (row, 5)]
+            moveType = 'queenside'
+
+        # Checks if a pawn is moving to the end of the board so it promotes
+        elif piece.name == 'Pawn' and (newRow == 0 or newRow == 7):
+            squares = [(row, column), (newRow, newColumn)]
+            moveType = 'promotion'
+
+        # A pawn moving diagonally to an empty square can only be an enPassant capture
+        elif piece.name == 'Pawn' and column != newColumn and self.board[newRow][newColumn].piece == None:
+            squares = [(row, column), (newRow, newColumn), (row, newColumn)]
+            moveType = 'enPassant'
+
+        else:
+            squares = [(row, column), (newRow, newColumn)]
+            moveType = 'normal'
+
+        # Stores the pieces on every square the move touches so the move can be reversed exactly
+        undo = UndoRecord(move, [(r, c, self.board[r][c].piece) for r, c in squares], self.position.GetState())
+
+        if moveType == 'kingside':
+            self.CastleKingside(colour)
+        elif moveType == 'queenside':
+            self.CastleQueenside(colour)
+        elif moveType == 'promotion':
+            undo.captured = self.board[newRow][newColumn].piece
+            self.Promote(newRow, newColumn, colour) # Places a queen on the promotion square
+            self.Remove(row, column) # Removes the pawn that just queened
+        elif moveType == 'enPassant':
+            undo.captured = self.board[row][newColumn].piece
+            self.EnPassant(self.board[row][column], newRow, newColumn, colour)
+        else:
+            undo.captured = self.board[newRow][newColumn].piece
+            self.MovePiece(self.board[row][column], newRow, newColumn)
+
+        # Checks if a pawn moved two squares so the square it skipped over can be captured enPassant on the next move
+        if piece.name == 'Pawn' and abs(newRow - row) == 2:
+            enPassantSquare = SquareIndex((row + newRow) // 2, column)
+        else:
+            enPassantSquare = None
+
+        # Updates the castling rights, enPassant square and side to move
+        self.position.UpdateState(SquareIndex(row, column), SquareIndex(newRow, newColumn), enPassantSquare)
+
+        self.history.append(undo)
+        return undo
+
+    # This method reverses a move made with MakeMove using the undo record it returned
+    def UnmakeMove(self, undo):
+        # Puts back the piece (or lack of one) that was on every square the move touched
+        for row, column, piece in undo.squares:
+            self.SetPiece(row, column, piece)
+
+        self.position.SetState(undo.state) # Puts back the side to move, castling rights and enPassant square
+
+        # Removes the record from the history as long as moves are being undone in the order they were made
+        if self.history and self.history[-1] is undo:
+            self.history.pop()
+
+    # This method sets up the board from a FEN string so positions can be sent between processes as short strings
+    def LoadFen(self, fen):
+        position = PositionFromFen(fen)
+
+        for square, (row, column) in enumerate(POSITIONS):
+            piece = position.PieceAt(row, column)
+            # Checks if the square should be empty or have a new piece and changes it only if it doesn't already match
+            if piece == None:
+                if self.board[row][column].piece != None:
+                    self.SetPiece(row, column, None)
+            else:
+                self.SetPiece(row, column, PIECE_CLASSES[piece[0]](piece[1]))
+
+        self.position.SetState(position.GetState())
+        self.history = []
+
+    def Fen(self):
+        return FenFromPosition(self.position)
+
+    # This method passes the turn to the other player without moving a piece and returns the state to put back afterwards
+    def MakeNullMove(self):
+        state = self.position.GetState()
+
+        if state[0] == 'White':
+            sideToMove = 'Black'
+        else:
+            sideToMove = 'White'
+
+        # The enPassant square is cleared because the capture is only allowed straight after the pawn moves
+        self.position.SetState((sideToMove, state[1], None))
+
+        return state
+
+    def UnmakeNullMove(self, state):
+        self.position.SetState(state)
@@ -0,0 +1,266 @@
+from .bitboard import INDEX_PIECE, PIECE_VALUES, POSITIONS, PopCount, BitScan, SquareIndex, Squares
+from .movegen import AttackersTo, KingSquare, GenerateLegalMoves, CheckAndPins, LegacyMovesBySquare, BETWEEN, EN_PASSANT,\
+MoveFrom, MoveTo, MoveFlag, PromotionPiece, IsCapture
+
+# The rules of the game shared by the GUI game and the AI. Every function takes the board it works on instead of storing one
+# so the same code runs on the board on screen and on the boards the AI searches, and nothing here needs pygame
+
+# The order the AI has always looked at the pieces in when going through their moves
+MOVE_ORDER = ['King', 'Queen', 'Rook', 'Bishop', 'Knight', 'Pawn']
+
+def OppositeColour(colour):
+    if colour == 'White':
+        return 'Black'
+
+    return 'White'
+
+def PiecePositions(board, piece, colour):
+    # Dictionary which stores the row and column of the piece as the value and the piece number as the key
+    # The bitboards only visit the squares the pieces are on instead of checking all squares on the board
+    return board.position.PiecePositions(piece, colour)
+
+def AllPiecePositions(board, colour):
+    # Gets the positions of all the pieces of the chosen player that are not a king
+    return board.position.AllPiecePositions(colour)
+
+def KeyFromPosition(dict, position):
+    # Loops through all key value pairs in the dictionary passed
+    for key, value in dict.items():
+        if value == position:
+            return key # Returns the key from the value
+
+    return None
+
+def LegalMoves(board, colour):
+    # Returns every legal move of the player as (row, column, newRow, newColumn) grouped by piece type in MOVE_ORDER,
+    # with pawns always promoting to a queen
+    position = board.position
+    moves = {name: [] for name in MOVE_ORDER}
+
+    for move in GenerateLegalMoves(position, colour):
+        # Checks if the move is a promotion to anything but a queen as the game always promotes to a queen
+        if PromotionPiece(move) not in (None, 'Queen'):
+            continue
+
+        name = INDEX_PIECE[position.mailbox[MoveFrom(move)]][0]
+        moves[name].append(POSITIONS[MoveFrom(move)] + POSITIONS[MoveTo(move)])
+
+    return [move for name in MOVE_ORDER for move in moves[name]]
+
+def TacticalMoves(board, colour):
+    # Returns the legal captures and queen promotions as (move, gain) pairs, where gain is the material the move wins.
+    # They are ordered Most Valuable Victim - Least Valuable Attacker so the best captures are tried first
+    position = board.position
+    moves = []
+
+    for move in GenerateLegalMoves(position, colour):
+        promotion = PromotionPiece(move)
+        # Checks if the move captures or promotes (only to a queen as the game always promotes to a queen)
+        if (not IsCapture(move) and promotion == None) or promotion not in (None, 'Queen'):
+            continue
+
+        attacker = INDEX_PIECE[position.mailbox[MoveFrom(move)]][0]
+        # The pawn taken enPassant isn't on the square the capturing pawn moves to
+        if MoveFlag(move) == EN_PASSANT:
+            victimValue = PIECE_VALUES['Pawn']
+        elif IsCapture(move):
+            victimValue = PIECE_VALUES[INDEX_PIECE[position.mailbox[MoveTo(move)]][0]]
+        else:
+            victimValue = 0
+
+        gain = victimValue
+        if promotion != None:
+            gain += PIECE_VALUES['Queen'] - PIECE_VALUES['Pawn']
+
+        moves.append((gain, -PIECE_VALUES[attacker], POSITIONS[MoveFrom(move)] + POSITIONS[MoveTo(move)]))
+
+    # Sorts by the biggest gain first and then by the cheapest attacking piece
+    moves.sort(key=lambda move: (move[0], move[1]), reverse=True)
+
+    return [(move, gain) for gain, attackerValue, move in moves]
+
+def CheckingMoves(board, colour):
+    # Returns the legal moves that don't capture or promote but put the opponent's king in check
+    oppColour = OppositeColour(colour)
+    moves = []
+
+    for move in GenerateLegalMoves(board.position, colour):
+        if IsCapture(move) or PromotionPiece(move) != None:
+            continue
+
+        legacyMove = POSITIONS[MoveFrom(move)] + POSITIONS[MoveTo(move)]
+        undo = board.MakeMove(legacyMove)
+        if InCheck(board, oppColour) != None:
+            moves.append(legacyMove)
+        board.UnmakeMove(undo)
+
+    return moves
+
+def PieceMoves(board, piece, colour):
+    moves = {1: [], 2: [], 3: [], 4: [], 5: [], 6: [], 7: [], 8: [], 9: []}
+    # Generates the moves of every piece once and then picks out the moves of each piece of the given type
+    movesBySquare = LegacyMovesBySquare(GenerateLegalMoves(board.position, colour))
+
+    # Assigns the moves of each piece to the key of its position in the PiecePositions dictionary
+    for key, position in PiecePositions(board, piece, colour).items():
+        if position != None:
+            moves[key] = movesBySquare.get(position, [])
+
+    return moves
+
+def AllPieceMoves(board, colour):
+    moves = []
+
+    # Adds the squares every piece of the player can move to from a single pass of the move generator
+    for pieceMoves in LegacyMovesBySquare(GenerateLegalMoves(board.position, colour)).values():
+        moves.extend(pieceMoves)
+
+    return moves
+
+def NewPieceMoves(board, row, column, colour):
+    square = SquareIndex(row, column)
+    updatedValidMoves = []
+
+    # The generator has already restricted the moves for checks and pins so only the moves of this piece are needed
+    for move in GenerateLegalMoves(board.position, colour):
+        # Checks if the move is made by this piece and isn't a promotion to anything but a queen
+        if MoveFrom(move) == square and PromotionPiece(move) in (None, 'Queen'):
+            updatedValidMoves.append(POSITIONS[MoveTo(move)])
+
+    return updatedValidMoves
+
+def NewKingMoves(board, row, column, colour):
+    # The king's moves (including castling) already have every square controlled by an enemy piece removed
+    return NewPieceMoves(board, row, column, colour)
+
+def EnPassantMoves(board, row, column, colour):
+    square = SquareIndex(row, column)
+
+    # Returns the square the pawn would move to with an enPassant capture (empty if it has none)
+    return [POSITIONS[MoveTo(move)] for move in GenerateLegalMoves(board.position, colour)
+            if MoveFrom(move) == square and MoveFlag(move) == EN_PASSANT]
+
+def InCheck(board, colour):
+    oppColour = OppositeColour(colour)
+    position = board.position
+    kingSquare = KingSquare(position, colour)
+
+    # Looks up every enemy piece (apart from the king) that attacks the King's square using the precomputed attack tables
+    # instead of generating the valid moves of every enemy piece
+    checkingPieces = AttackersTo(position, kingSquare, oppColour) & ~position.PieceBitboard('King', oppColour)
+    count = PopCount(checkingPieces) # Variable to track the number of pieces 'checking' the king
+
+    # Checks if the king is checked by two pieces (i.e through a discovered check)
+    if count == 2:
+        return 'double'
+    # Checks if the king is checked by a single piece
+    elif count == 1:
+        return 'single'
+
+    return None # Returns None if not in check
+
+def CheckingPiecePosition(board, colour):
+    checkers = CheckAndPins(board.position, colour)[0]
+
+    # Checks if any enemy piece gives check and returns the position of the checking piece if so
+    if checkers:
+        return POSITIONS[BitScan(checkers)]
+
+    return None
+
+def BlockCheckMoves(board, colour):
+    checkers = CheckAndPins(board.position, colour)[0]
+    kingSquare = KingSquare(board.position, colour)
+
+    # Checks if the king is in check and returns the squares between the king and the checking piece if so
+    if checkers:
+        return [POSITIONS[square] for square in Squares(BETWEEN[kingSquare][BitScan(checkers)])]
+
+    return []
+
+def PiecePinned(board, name, key, colour):
+    piecePosition = PiecePositions(board, name, colour).get(key)
+    pinRays = CheckAndPins(board.position, colour)[2]
+
+    # Checks if the piece exists and a pin ray was found from the king through its square
+    if piecePosition != None and SquareIndex(piecePosition[0], piecePosition[1]) in pinRays:
+        return True
+
+    return False
+
+def Checkmate(board, colour):
+    # Checks if the King is in check and the player has no legal moves indicating checkmate
+    if InCheck(board, colour) != None and GenerateLegalMoves(board.position, colour) == []:
+        return True
+
+    return False
+
+def Stalemate(board, colour):
+    # Checks if the King is not in check but the player has no legal moves indicating Stalemate
+    if InCheck(board, colour) == None and GenerateLegalMoves(board.position, colour) == []:
+        return True
+
+    return False
+
+def PlayerPieces(board, colour):
+    # Gets the values of the white or black pieces depending on colour, excluding the king
+    return board.position.PlayerPieces(colour)
+
+def AllPieces(board):
+    # Gets the values of all pieces excluding the kings
+    return board.position.AllPieces()
+
+def GamePhases(board):
+    # Gets the current phase of the game by checking the number of pieces left on the board (not counting the kings)
+    pieceCount = board.position.pieceCount
+
+    if pieceCount >= 25:
+        return 'Opening'
+    elif pieceCount >= 15:
+        return 'Middlegame'
+
+    return 'Endgame'
+
+def PawnEndgame(board, colour):
+    # Checks if it is the endgame and the player has nothing left but pawns, where zugzwang (being forced to make a move
+    # that worsens the position) is common
+    position = board.position
+    return GamePhases(board) == 'Endgame' and position.PlayerPieceCount(colour) == position.PieceCount('Pawn', colour)
+
+def QuietMove(board, move):
+    # Checks if a move is not a capture (including enPassant) or a promotion
+    row, column, newRow, newColumn = move
+    piece = board.position.PieceAt(row, column)
+
+    if board.position.PieceAt(newRow, newColumn) != None:
+        return False
+    if piece[0] == 'Pawn' and (column != newColumn or newRow == 0 or newRow == 7):
+        return False
+
+    return True
+
+def InsufficientMaterial(board):
+    # Checks if there are more than two pieces aside from the kings, which is always enough to play on
+    if board.position.pieceCount > 2:
+        return False
+
+    whitePieces = PlayerPieces(board, 'White') # Stores the piece values of all white pieces
+    blackPieces = PlayerPieces(board, 'Black') # Stores the piece values of all black pieces
+    allPieces = AllPieces(board) # Stores the piece values of all pieces
+    pawnValue = 1
+
+    # Checks if only kings are left or kings and 1 bishop or knight is left
+    if allPieces == [] or (len(allPieces) == 1 and 3 <= allPieces[0] <= 3.5):
+        return True
+
+    # Checks if two pieces aside from the king's are left and no pawns
+    elif len(allPieces) == 2 and pawnValue not in allPieces:
+        # Checks if a knight or bishop for both players exist
+        if 6 <= sum(allPieces) <= 7 and len(whitePieces) != 0  and len(blackPieces) != 0:
+            return True
+
+        # Checks if only two knights are left
+        elif sum(allPieces) == 6:
+            return True
+
+    return False
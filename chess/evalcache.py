@@ -0,0 +1,49 @@
+from collections import OrderedDict
+
+# Remembers the evaluations of positions that have already been scored so the medium and hard difficulties never score
+# the same position twice, e.g. after a takeback or when two moves reach the same position. Positions are found by their
+# Zobrist key, and each evaluation has its own namespace so the medium and hard scores of a position are kept apart.
+# Once the cache is full the position used least recently is dropped to make room
+
+MISSING = object() # Returned by Probe when the position isn't cached, as None is a real score (a move that loses straight away)
+
+class EvaluationCache:
+    def __init__(self, maxEntries=50000):
+        self.maxEntries = maxEntries # The most positions kept across every namespace
+        self.entries = OrderedDict() # Ordered from the least to the most recently used entry
+        self.hits = {} # The number of positions found in the cache for each namespace
+        self.misses = {} # The number of positions that had to be scored for each namespace
+
+    def Probe(self, namespace, key):
+        entryKey = (namespace, key)
+
+        # Checks if the position has been scored before and marks it as the most recently used if so
+        if entryKey in self.entries:
+            self.entries.move_to_end(entryKey)
+            self.hits[namespace] = self.hits.get(namespace, 0) + 1
+            return self.entries[entryKey]
+
+        self.misses[namespace] = self.misses.get(namespace, 0) + 1
+        return MISSING
+
+    def Store(self, namespace, key, score):
+        self.entries[(namespace, key)] = score
+        self.entries.move_to_end((namespace, key))
+
+        # Drops the least recently used entries once there are too many
+        while len(self.entries) > self.maxEntries:
+            self.entries.popitem(last=False)
+
+    def HitRate(self, namespace):
+        # The fraction of the probes in the namespace that found the position (0 if it hasn't been probed)
+        probes = self.hits.get(namespace, 0) + self.misses.get(namespace, 0)
+
+        if probes == 0:
+            return 0
+
+        return self.hits.get(namespace, 0) / probes
+
+    def Clear(self):
+        self.entries.clear()
+        self.hits.clear()
+        self.misses.clear()
@@ -0,0 +1,404 @@
+from .bitboard import COLOURS, PIECE_INDEX, INDEX_PIECE, POSITIONS, SquareName, BitScan, BitScanReverse, SquareIndex, Squares, PopCount,\
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE
+
+# Moves are stored as a single number: the from square in bits 0-5, the to square in bits 6-11 and a flag in bits 12-15
+QUIET = 0
+DOUBLE_PAWN_PUSH = 1
+KINGSIDE_CASTLE = 2
+QUEENSIDE_CASTLE = 3
+CAPTURE = 4
+EN_PASSANT = 5
+PROMOTION = 8 # Promotion flags are 8-11 (12-15 when the promotion also captures) and the last two bits give the new piece
+PROMOTION_PIECES = ['Knight', 'Bishop', 'Rook', 'Queen']
+
+FULL_BOARD = (1 << 64) - 1
+
+# The row and column change for every direction a piece can slide in.
+# Row 0 is black's back row so 'Up' is towards row 0 (the direction white pawns move)
+DIRECTIONS = {
+    'Down': (1, 0), 'Right': (0, 1), 'Up': (-1, 0), 'Left': (0, -1),
+    'DownRight': (1, 1), 'UpLeft': (-1, -1), 'DownLeft': (1, -1), 'UpRight': (-1, 1),
+}
+
+# The directions are listed in the same order the piece classes used to walk them
+ROOK_DIRECTIONS = ['Down', 'Right', 'Up', 'Left']
+BISHOP_DIRECTIONS = ['DownRight', 'UpLeft', 'DownLeft', 'UpRight']
+
+# Moving in these directions increases the square index so the nearest blocker is the lowest set square
+POSITIVE_DIRECTIONS = {'Down', 'Right', 'DownRight', 'DownLeft'}
+
+# The jumps of a knight and king in the order the piece classes used to check them
+KNIGHT_JUMPS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (2, -1), (2, 1), (1, -2), (1, 2)]
+KING_STEPS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+def OnBoard(row, column):
+    return 0 <= row <= 7 and 1 <= column <= 8
+
+def StepTargets(square, steps):
+    row, column = POSITIONS[square]
+    # Returns the squares reached by each step that stay on the board
+    return [SquareIndex(row + rowStep, column + columnStep) for rowStep, columnStep in steps if OnBoard(row + rowStep, column + columnStep)]
+
+def RaySquares(square, direction):
+    rowStep, columnStep = DIRECTIONS[direction]
+    row, column = POSITIONS[square]
+    squares = []
+
+    # Walks from the square in the direction until it falls off the board
+    row, column = row + rowStep, column + columnStep
+    while OnBoard(row, column):
+        squares.append(SquareIndex(row, column))
+        row, column = row + rowStep, column + columnStep
+
+    return squares
+
+def ToBitboard(squares):
+    bitboard = 0
+    for square in squares:
+        bitboard |= 1 << square
+    return bitboard
+
+# All the tables are built once when the module is imported
+KNIGHT_TARGETS = [StepTargets(square, KNIGHT_JUMPS) for square in range(64)]
+KING_TARGETS = [StepTargets(square, KING_STEPS) for square in range(64)]
+KNIGHT_ATTACKS = [ToBitboard(targets) for targets in KNIGHT_TARGETS]
+KING_ATTACKS = [ToBitboard(targets) for targets in KING_TARGETS]
+
+# The squares a pawn of each colour attacks from every square (white pawns capture upwards, black pawns downwards)
+PAWN_ATTACKS = [
+    [ToBitboard(StepTargets(square, [(-1, -1), (-1, 1)])) for square in range(64)],
+    [ToBitboard(StepTargets(square, [(1, -1), (1, 1)])) for square in range(64)],
+]
+
+# The squares in every direction from every square, nearest first, as square indexes, (row, column) positions and bitboards
+RAY_SQUARES = {direction: [RaySquares(square, direction) for square in range(64)] for direction in DIRECTIONS}
+RAY_POSITIONS = {direction: [[POSITIONS[s] for s in RAY_SQUARES[direction][square]] for square in range(64)] for direction in DIRECTIONS}
+RAYS = {direction: [ToBitboard(RAY_SQUARES[direction][square]) for square in range(64)] for direction in DIRECTIONS}
+
+# The positions a knight or king can reach from every (row, column) so the piece classes can use them directly
+KNIGHT_POSITIONS = [[POSITIONS[s] for s in KNIGHT_TARGETS[square]] for square in range(64)]
+KING_POSITIONS = [[POSITIONS[s] for s in KING_TARGETS[square]] for square in range(64)]
+
+def RayAttacks(square, occupancy, direction):
+    ray = RAYS[direction][square]
+    blockers = ray & occupancy
+
+    # Checks if a piece blocks the ray and cuts the ray off after the first blocker if so
+    if blockers:
+        if direction in POSITIVE_DIRECTIONS:
+            blocker = BitScan(blockers)
+        else:
+            blocker = BitScanReverse(blockers)
+        ray ^= RAYS[direction][blocker]
+
+    return ray
+
+def RookAttacks(square, occupancy):
+    return RayAttacks(square, occupancy, 'Down') | RayAttacks(square, occupancy, 'Right')\
+    | RayAttacks(square, occupancy, 'Up') | RayAttacks(square, occupancy, 'Left')
+
+def BishopAttacks(square, occupancy):
+    return RayAttacks(square, occupancy, 'DownRight') | RayAttacks(square, occupancy, 'UpLeft')\
+    | RayAttacks(square, occupancy, 'DownLeft') | RayAttacks(square, occupancy, 'UpRight')
+
+def QueenAttacks(square, occupancy):
+    return RookAttacks(square, occupancy) | BishopAttacks(square, occupancy)
+
+def AttackersTo(position, square, colour, occupancy=None):
+    # Returns a bitboard of all the pieces of the given colour that attack the square
+    if occupancy == None:
+        occupancy = position.allOccupancy
+
+    pieces = position.pieces
+    offset = COLOURS.index(colour) * 6
+    queens = pieces[offset + 4]
+
+    # A pawn attacks the square if a pawn of the other colour on the square would attack the pawn back
+    return (pieces[offset] & PAWN_ATTACKS[1 - offset // 6][square])\
+    | (pieces[offset + 1] & KNIGHT_ATTACKS[square])\
+    | ((pieces[offset + 2] | queens) & BishopAttacks(square, occupancy))\
+    | ((pieces[offset + 3] | queens) & RookAttacks(square, occupancy))\
+    | (pieces[offset + 5] & KING_ATTACKS[square])
+
+def KingSquare(position, colour):
+    return position.KingSquare(colour) # Read from the position's piece lists instead of scanning the king's bitboard
+
+# The squares strictly between two squares on the same row, column or diagonal (0 if they don't share a line)
+BETWEEN = [[0] * 64 for _ in range(64)]
+for square in range(64):
+    for direction in DIRECTIONS:
+        between = 0
+        for target in RAY_SQUARES[direction][square]:
+            BETWEEN[square][target] = between
+            between |= 1 << target
+
+def EncodeMove(fromSquare, toSquare, flag=QUIET):
+    return fromSquare | (toSquare << 6) | (flag << 12)
+
+def MoveFrom(move):
+    return move & 63
+
+def MoveTo(move):
+    return (move >> 6) & 63
+
+def MoveFlag(move):
+    return move >> 12
+
+def IsCapture(move):
+    return (move >> 12) & CAPTURE != 0
+
+def PromotionPiece(move):
+    # Returns the name of the piece a pawn promotes to (None if the move isn't a promotion)
+    if move >> 12 & PROMOTION:
+        return PROMOTION_PIECES[(move >> 12) & 3]
+
+    return None
+
+def CheckAndPins(position, colour):
+    # Works out everything about checks and pins for the given player once so every move can be filtered against it
+    us = COLOURS.index(colour)
+    them = 1 - us
+    pieces = position.pieces
+    occupancy = position.allOccupancy
+    kingSquare = position.KingSquare(colour)
+
+    checkers = AttackersTo(position, kingSquare, COLOURS[them]) & ~pieces[them * 6 + 5]
+
+    # Only a piece that captures the checker or moves between it and the king can get out of a single check
+    if checkers == 0:
+        checkMask = FULL_BOARD
+    elif PopCount(checkers) == 1:
+        checkMask = checkers | BETWEEN[kingSquare][BitScan(checkers)]
+    else:
+        checkMask = 0 # Only the king can move in a double check
+
+    enemyRooks = pieces[them * 6 + 3] | pieces[them * 6 + 4]
+    enemyBishops = pieces[them * 6 + 2] | pieces[them * 6 + 4]
+    ownPieces = position.occupancy[us]
+    pinRays = {}
+
+    # Looks along every line from the king for a single friendly piece with an enemy slider behind it
+    for direction in DIRECTIONS:
+        if direction in ROOK_DIRECTIONS:
+            sliders = enemyRooks
+        else:
+            sliders = enemyBishops
+
+        ray = RAYS[direction][kingSquare]
+        # Checks if an enemy slider that moves along this line is on it at all before looking any closer
+        if ray & sliders:
+            blockers = ray & occupancy
+            if direction in POSITIVE_DIRECTIONS:
+                first = BitScan(blockers)
+                rest = blockers & ~(1 << first)
+                second = BitScan(rest) if rest else None
+            else:
+                first = BitScanReverse(blockers)
+                rest = blockers & ~(1 << first)
+                second = BitScanReverse(rest) if rest else None
+
+            # The first piece is pinned if it is friendly and the next piece along is an enemy slider
+            if second != None and (ownPieces >> first) & 1 and (sliders >> second) & 1:
+                pinRays[first] = BETWEEN[kingSquare][second] | (1 << second)
+
+    return checkers, checkMask, pinRays
+
+def AddPawnMoves(moves, fromSquare, toSquare, flag, promotionRow):
+    # Checks if the pawn reaches the end of the board and adds one move for every piece it could promote to if so
+    if toSquare // 8 == promotionRow:
+        for promotion in range(4):
+            moves.append(fromSquare | (toSquare << 6) | ((PROMOTION | (flag & CAPTURE) | promotion) << 12))
+    else:
+        moves.append(fromSquare | (toSquare << 6) | (flag << 12))
+
+def GenerateLegalMoves(position, colour):
+    moves = []
+    us = COLOURS.index(colour)
+    them = 1 - us
+    pieces = position.pieces
+    ownPieces = position.occupancy[us]
+    enemyPieces = position.occupancy[them]
+    occupancy = position.allOccupancy
+    kingSquare = position.KingSquare(colour)
+    enemyColour = COLOURS[them]
+
+    checkers, checkMask, pinRays = CheckAndPins(position, colour)
+
+    # King moves: the king is taken off the board first so it can't hide behind itself from a slider
+    withoutKing = occupancy ^ (1 << kingSquare)
+    for toSquare in Squares(KING_ATTACKS[kingSquare] & ~ownPieces):
+        if not AttackersTo(position, toSquare, enemyColour, withoutKing):
+            moves.append(kingSquare | (toSquare << 6) | ((CAPTURE if (enemyPieces >> toSquare) & 1 else QUIET) << 12))
+
+    # Nothing but the king can move in a double check
+    if checkMask == 0:
+        return moves
+
+    # Castling is only allowed out of check, through and onto squares that aren't attacked, with the right still held
+    if checkers == 0:
+        if us == 0:
+            kingside, queenside = WHITE_KINGSIDE, WHITE_QUEENSIDE
+        else:
+            kingside, queenside = BLACK_KINGSIDE, BLACK_QUEENSIDE
+        rooks = pieces[us * 6 + 3]
+
+        if position.castlingRights & kingside and (rooks >> (kingSquare + 3)) & 1\
+        and not occupancy & ((1 << (kingSquare + 1)) | (1 << (kingSquare + 2)))\
+        and not AttackersTo(position, kingSquare + 1, enemyColour) and not AttackersTo(position, kingSquare + 2, enemyColour):
+            moves.append(kingSquare | ((kingSquare + 2) << 6) | (KINGSIDE_CASTLE << 12))
+
+        if position.castlingRights & queenside and (rooks >> (kingSquare - 4)) & 1\
+        and not occupancy & ((1 << (kingSquare - 1)) | (1 << (kingSquare - 2)) | (1 << (kingSquare - 3)))\
+        and not AttackersTo(position, kingSquare - 1, enemyColour) and not AttackersTo(position, kingSquare - 2, enemyColour):
+            moves.append(kingSquare | ((kingSquare - 2) << 6) | (QUEENSIDE_CASTLE << 12))
+
+    targets = ~ownPieces & checkMask
+
+    # Knight, bishop, rook and queen moves all come from the attack tables filtered by the check mask and any pin ray
+    for index, attacks in ((1, None), (2, BishopAttacks), (3, RookAttacks), (4, QueenAttacks)):
+        for fromSquare in Squares(pieces[us * 6 + index]):
+            if attacks == None:
+                pieceTargets = KNIGHT_ATTACKS[fromSquare] & targets
+            else:
+                pieceTargets = attacks(fromSquare, occupancy) & targets
+
+            # A pinned piece can only move along the line between the king and the pinning piece
+            if fromSquare in pinRays:
+                pieceTargets &= pinRays[fromSquare]
+
+            for toSquare in Squares(pieceTargets):
+                moves.append(fromSquare | (toSquare << 6) | ((CAPTURE if (enemyPieces >> toSquare) & 1 else QUIET) << 12))
+
+    # Pawn moves
+    if us == 0:
+        step, startRow, promotionRow = -8, 6, 0 # White pawns move up the board
+    else:
+        step, startRow, promotionRow = 8, 1, 7 # Black pawns move down the board
+
+    for fromSquare in Squares(pieces[us * 6]):
+        allowed = checkMask & pinRays.get(fromSquare, FULL_BOARD)
+        oneStep = fromSquare + step
+
+        # Checks if the square in front of the pawn is empty so it can move forwards
+        if not (occupancy >> oneStep) & 1:
+            if (allowed >> oneStep) & 1:
+                AddPawnMoves(moves, fromSquare, oneStep, QUIET, promotionRow)
+
+            twoStep = oneStep + step
+            # Checks if the pawn is on its starting row and the second square is also empty
+            if fromSquare // 8 == startRow and not (occupancy >> twoStep) & 1 and (allowed >> twoStep) & 1:
+                moves.append(fromSquare | (twoStep << 6) | (DOUBLE_PAWN_PUSH << 12))
+
+        for toSquare in Squares(PAWN_ATTACKS[us][fromSquare] & enemyPieces & allowed):
+            AddPawnMoves(moves, fromSquare, toSquare, CAPTURE, promotionRow)
+
+    # EnPassant is only possible for the side to move, straight after the enemy pawn's two square move
+    enPassantSquare = position.enPassantSquare
+    if enPassantSquare != None and colour == position.sideToMove:
+        capturedSquare = enPassantSquare - step
+        for fromSquare in Squares(PAWN_ATTACKS[them][enPassantSquare] & pieces[us * 6]):
+            # Plays the capture on the occupancy and checks the king isn't left attacked,
+            # which also covers both pawns leaving the king's row at once
+            after = (occupancy ^ (1 << fromSquare) ^ (1 << capturedSquare)) | (1 << enPassantSquare)
+            if not AttackersTo(position, kingSquare, enemyColour, after) & ~(1 << capturedSquare):
+                moves.append(fromSquare | (enPassantSquare << 6) | (EN_PASSANT << 12))
+
+    return moves
+
+def MoveName(move):
+    # Writes the move as the from and to squares in algebraic notation with the promotion piece's letter added (e.g. e7e8q)
+    name = SquareName(move & 63) + SquareName((move >> 6) & 63)
+    promotion = PromotionPiece(move)
+    if promotion != None:
+        name += 'nbrq'[PROMOTION_PIECES.index(promotion)]
+
+    return name
+
+def MakeMove(position, move):
+    # Plays a generated move on the bitboard position and returns what is needed to take it back
+    fromSquare = move & 63
+    toSquare = (move >> 6) & 63
+    flag = move >> 12
+    state = position.GetState()
+
+    name, colour = INDEX_PIECE[position.TakePiece(fromSquare)]
+
+    # The pawn captured enPassant is on the same row the capturing pawn started on
+    if flag == EN_PASSANT:
+        capturedSquare = (fromSquare // 8) * 8 + toSquare % 8
+    else:
+        capturedSquare = toSquare
+    captured = position.TakePiece(capturedSquare)
+
+    # Checks if a pawn is promoting and swaps it for the chosen piece if so
+    if flag & PROMOTION:
+        name = PROMOTION_PIECES[flag & 3]
+    position.PutPiece(name, colour, toSquare)
+
+    # Moves the rook to the other side of the king when castling
+    if flag == KINGSIDE_CASTLE:
+        position.TakePiece(toSquare + 1)
+        position.PutPiece('Rook', colour, toSquare - 1)
+    elif flag == QUEENSIDE_CASTLE:
+        position.TakePiece(toSquare - 2)
+        position.PutPiece('Rook', colour, toSquare + 1)
+
+    # A pawn moving two squares can be captured enPassant on the square it skipped over
+    if flag == DOUBLE_PAWN_PUSH:
+        enPassantSquare = (fromSquare + toSquare) // 2
+    else:
+        enPassantSquare = None
+    position.UpdateState(fromSquare, toSquare, enPassantSquare)
+
+    return (captured, capturedSquare, state)
+
+def UnmakeMove(position, move, undo):
+    # Takes back a move played with MakeMove using the undo information it returned
+    fromSquare = move & 63
+    toSquare = (move >> 6) & 63
+    flag = move >> 12
+    captured, capturedSquare, state = undo
+
+    name, colour = INDEX_PIECE[position.TakePiece(toSquare)]
+
+    # A promoted piece goes back to being a pawn
+    if flag & PROMOTION:
+        name = 'Pawn'
+    position.PutPiece(name, colour, fromSquare)
+
+    # Checks if a piece was captured and puts it back if so
+    if captured != None:
+        position.PutPiece(INDEX_PIECE[captured][0], INDEX_PIECE[captured][1], capturedSquare)
+
+    # Moves the rook back to its corner after castling
+    if flag == KINGSIDE_CASTLE:
+        position.TakePiece(toSquare - 1)
+        position.PutPiece('Rook', colour, toSquare + 1)
+    elif flag == QUEENSIDE_CASTLE:
+        position.TakePiece(toSquare + 1)
+        position.PutPiece('Rook', colour, toSquare - 2)
+
+    position.SetState(state)
+
+def LegacyMoves(moves):
+    # Converts generated moves to the (row, column, newRow, newColumn) tuples the board uses.
+    # The game always promotes to a queen so the other promotion choices are left out
+    legacyMoves = []
+
+    for move in moves:
+        flag = move >> 12
+        if not flag & PROMOTION or flag & 3 == 3:
+            legacyMoves.append(POSITIONS[move & 63] + POSITIONS[(move >> 6) & 63])
+
+    return legacyMoves
+
+def LegacyMovesBySquare(moves):
+    # Groups the (row, column) targets of the moves by the (row, column) of the piece that makes them
+    movesBySquare = {}
+
+    for move in moves:
+        flag = move >> 12
+        if not flag & PROMOTION or flag & 3 == 3:
+            movesBySquare.setdefault(POSITIONS[move & 63], []).append(POSITIONS[(move >> 6) & 63])
+
+    return movesBySquare
@@ -0,0 +1,30 @@
+# The settings of the search engine kept in one object so they can be passed around together and each technique can be
+# switched off to compare the engine with and without it
+
+class EngineOptions:
+    def __init__(self, maxDepth=6, timeLimit=5, quiescenceChecks=False, nullMove=True, lateMoveReductions=True,
+                 principalVariationSearch=True, aspirationWindows=True, aspirationWindow=0.25, threads=1,
+                 evaluationWorkers=1, batchEvaluation=True):
+        self.maxDepth = maxDepth # The deepest the search looks ahead
+        self.timeLimit = timeLimit # The number of seconds the search may use (None to only stop at the maximum depth)
+        self.quiescenceChecks = quiescenceChecks # Whether the first ply of the quiescence search also tries moves that give check
+        self.nullMove = nullMove # Whether the search lets a player pass to prove a position is already good enough to cut off
+        self.lateMoveReductions = lateMoveReductions # Whether quiet moves ordered late are searched less deeply first
+        self.principalVariationSearch = principalVariationSearch # Whether moves after the first are searched with a zero window first
+        self.aspirationWindows = aspirationWindows # Whether each iteration starts with a narrow window around the last score
+        self.aspirationWindow = aspirationWindow # How far either side of the last score the first window reaches (in pawns)
+        self.threads = threads # The number of processes that search at once (the main search plus threads - 1 helpers)
+        # The number of processes the medium and hard difficulties share the evaluations of their moves between. Above 1
+        # the moves are always sent to the processes, even with batch evaluation on
+        self.evaluationWorkers = evaluationWorkers
+        # Whether the medium and hard difficulties score all their moves at once with NumPy (if it is installed) instead
+        # of one at a time, used only when evaluationWorkers is 1
+        self.batchEvaluation = batchEvaluation
+
+    def Copy(self, **changes):
+        # Returns a copy of the options with the given settings changed, e.g. options.Copy(nullMove=False)
+        options = EngineOptions()
+        options.__dict__.update(self.__dict__)
+        options.__dict__.update(changes)
+
+        return options
@@ -0,0 +1,138 @@
+from .bitboard import SquareIndex
+
+# Move ordering decides which moves the search tries first. Alpha-beta can only skip the rest of the moves once it has found
+# a good enough one, so trying the best moves first is what lets it prune most of the tree.
+# The search accepts any object with the same methods as MoveOrderer so different orderings can be swapped in and compared
+
+# The scores that put each kind of move in front of the next: hash move, then captures and promotions, then killers, then history
+HASH_MOVE_SCORE = 10000000
+CAPTURE_SCORE = 1000000
+KILLER_SCORES = [900000, 800000] # The first killer slot is tried before the second
+MAX_ATTACKER_VALUE = 10 # Stops the king's huge value from swamping the victim's value when the king captures
+HISTORY_LIMIT = 800000 # History scores are halved before they can catch up with the killer moves
+KILLER_PLIES = 100 # The number of plies killer moves are kept for (the same as the search's maximum ply)
+
+class MoveOrderer:
+    # Leaves the moves in the order they were generated apart from the hash move and counts how often the first move cuts off
+    def __init__(self):
+        self.cutoffs = 0
+        self.firstMoveCutoffs = 0
+
+    def NewSearch(self):
+        self.NewIteration()
+
+    def NewIteration(self):
+        # Starts counting the cutoffs again so the cutoff rate is worked out for each iteration on its own
+        self.cutoffs = 0
+        self.firstMoveCutoffs = 0
+
+    def OrderMoves(self, board, moves, colour, ply, hashMove):
+        # Checks if there is a hash move from the transposition table (or the last iteration) and tries it first if so
+        if hashMove in moves:
+            moves.remove(hashMove)
+            moves.insert(0, hashMove)
+
+        return moves
+
+    def RecordCutoff(self, board, move, colour, ply, depth, moveNumber):
+        # Called when a move fails high with moveNumber being how many moves were tried before it
+        self.cutoffs += 1
+        if moveNumber == 0:
+            self.firstMoveCutoffs += 1
+
+    def FirstMoveCutoffRate(self):
+        # The fraction of cutoffs that came from the first move tried, which is close to 1 when the ordering is good
+        if self.cutoffs == 0:
+            return 0
+
+        return self.firstMoveCutoffs / self.cutoffs
+
+class HeuristicOrderer(MoveOrderer):
+    # Orders the hash move first, then captures by Most Valuable Victim - Least Valuable Attacker, then the killer moves
+    # that caused a cutoff at the same ply, then every other move by how often it has caused cutoffs anywhere (history)
+    def __init__(self):
+        super().__init__()
+        self.killers = [[None, None] for ply in range(KILLER_PLIES)]
+        # The butterfly history table holds a score for every from and to square for each colour
+        self.history = {'White': [[0] * 64 for square in range(64)], 'Black': [[0] * 64 for square in range(64)]}
+
+    def NewSearch(self):
+        super().NewSearch()
+        self.killers = [[None, None] for ply in range(KILLER_PLIES)]
+
+        # Halves the history scores so moves that were good on earlier moves still count but not as much as new ones
+        for colour in self.history:
+            for fromSquare in range(64):
+                row = self.history[colour][fromSquare]
+                for toSquare in range(64):
+                    row[toSquare] //= 2
+
+    def CaptureScore(self, board, move):
+        row, column, newRow, newColumn = move
+        attacker = board.board[row][column].piece
+        victim = board.board[newRow][newColumn].piece
+        score = None
+
+        # Checks if a piece is captured, or a pawn moves diagonally onto an empty square (an enPassant capture)
+        if victim != None:
+            score = victim.value * 16 - min(attacker.value, MAX_ATTACKER_VALUE)
+        elif attacker.name == 'Pawn' and column != newColumn:
+            score = attacker.value * 16 - attacker.value
+
+        # Checks if a pawn is promoting and adds the value it gains by becoming a queen
+        if attacker.name == 'Pawn' and (newRow == 0 or newRow == 7):
+            score = (score or 0) + 8 * 16
+
+        return score
+
+    def OrderMoves(self, board, moves, colour, ply, hashMove):
+        killers = self.killers[ply] if ply < KILLER_PLIES else [None, None]
+        history = self.history[colour]
+        scoredMoves = []
+
+        for move in moves:
+            if move == hashMove:
+                score = HASH_MOVE_SCORE
+            else:
+                captureScore = self.CaptureScore(board, move)
+                if captureScore != None:
+                    score = CAPTURE_SCORE + captureScore
+                elif move == killers[0]:
+                    score = KILLER_SCORES[0]
+                elif move == killers[1]:
+                    score = KILLER_SCORES[1]
+                else:
+                    score = self.HistoryScore(history, move)
+
+            scoredMoves.append((score, move))
+
+        # Sorts by score only so moves with equal scores stay in the order they were generated
+        scoredMoves.sort(key=lambda scoredMove: scoredMove[0], reverse=True)
+
+        return [move for score, move in scoredMoves]
+
+    def HistoryScore(self, history, move):
+        return history[SquareIndex(move[0], move[1])][SquareIndex(move[2], move[3])]
+
+    def RecordCutoff(self, board, move, colour, ply, depth, moveNumber):
+        super().RecordCutoff(board, move, colour, ply, depth, moveNumber)
+
+        # Captures are already tried early so only quiet moves are remembered as killers and in the history table
+        if self.CaptureScore(board, move) != None or ply >= KILLER_PLIES:
+            return
+
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+        # Deeper cutoffs save more work so they add more to the history score
+        history = self.history[colour][SquareIndex(move[0], move[1])]
+        toSquare = SquareIndex(move[2], move[3])
+        history[toSquare] += depth * depth
+
+        # Checks if the score is getting close to the killer scores and halves the whole table for the colour if so
+        if history[toSquare] >= HISTORY_LIMIT:
+            for row in self.history[colour]:
+                for square in range(64):
+                    row[square] //= 2
@@ -0,0 +1,127 @@
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .Board import Board
+from . import AI
+
+# The medium and hard difficulties evaluate the board after each of their moves separately, so the moves can be shared out
+# between processes on different CPU cores. Each process is sent the position as a FEN string and its share of the moves
+# instead of a pickled board, and the evaluations are put back in the order of the moves so the same move is chosen as
+# when they are evaluated one after another. MediumMode and HardMode use it when EngineOptions.evaluationWorkers is above 1,
+# which is the default when NumPy isn't installed (with NumPy the moves are scored all at once instead, see batch.py).
+# Usage: python -m chess.parallel --difficulty Hard --workers 1 2 4 8 (compares each number of workers with no workers)
+
+BENCHMARK_FEN = 'r2q1rk1/ppp2ppp/2np1n2/2b1p1B1/2B1P1b1/2NP1N2/PPP2PPP/R2Q1RK1 b - - 0 8'
+DIFFICULTIES = ['Medium', 'Hard'] # The difficulties whose evaluations can be shared out
+
+pools = {} # The process pool for each number of workers, kept so the processes are only started once
+workerBoard = None # The board each worker process sets up the positions it is sent on
+
+def Pool(workers):
+    # Spawning starts the workers without a copy of the game window, which works the same on every operating system
+    if workers not in pools:
+        pools[workers] = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+
+    return pools[workers]
+
+def ClosePools():
+    for pool in pools.values():
+        pool.shutdown()
+    pools.clear()
+
+def Shards(moves, count):
+    # Splits the moves into count runs of moves next to each other that differ in size by at most one move
+    size, extra = divmod(len(moves), count)
+    shards = []
+    start = 0
+
+    for shard in range(count):
+        end = start + size + (1 if shard < extra else 0)
+        shards.append(moves[start:end])
+        start = end
+
+    return shards
+
+def EvaluateShard(fen, moves, difficulty):
+    # Runs in a worker process. Sets up the position and returns the evaluation after each move in the order it was given
+    global workerBoard
+    if workerBoard == None:
+        workerBoard = Board()
+    workerBoard.LoadFen(fen)
+
+    # The score function is looked up when it's needed because the AI module imports this one
+    if difficulty == 'Medium':
+        score = AI.MediumScore
+    else:
+        score = AI.HardScore
+    return [score(workerBoard, move) for move in moves]
+
+def ParallelEvaluations(fen, moves, difficulty, workers):
+    # Checks if the work is too small to share out, in which case it's evaluated here like the normal difficulties do
+    if workers <= 1 or len(moves) <= 1:
+        return EvaluateShard(fen, moves, difficulty)
+
+    pool = Pool(workers)
+    futures = [pool.submit(EvaluateShard, fen, shard, difficulty) for shard in Shards(moves, min(workers, len(moves)))]
+    evaluations = []
+
+    # Joins the results in the order the shards were made, which is the order of the moves
+    for future in futures:
+        evaluations.extend(future.result())
+
+    return evaluations
+
+def ParallelMode(position, game, difficulty='Hard', workers=None):
+    # Plays the same move as MediumMode or HardMode but evaluates the moves on several CPU cores
+    if workers == None:
+        workers = os.cpu_count() or 1
+
+    moves = AI.AllMoves(position, 'Black') # Holds all the possible moves and the record associated with each move
+    evaluations = ParallelEvaluations(position.Fen(), [move for move, record in moves], difficulty, workers)
+
+    return AI.PlayChosenMove(position, moves, evaluations)
+
+def Benchmark(fen, difficulty, workerCounts, repeats):
+    # Times choosing a move with no workers and with each number of workers and prints how many times faster each one is
+    board = Board()
+    board.LoadFen(fen)
+    moves = [move for move, record in AI.AllMoves(board, board.position.sideToMove)]
+    serialEvaluations = None
+    serialSeconds = None
+    passed = True
+
+    for workers in [1] + workerCounts:
+        # Evaluates once before timing so starting the worker processes isn't counted
+        evaluations = ParallelEvaluations(fen, moves, difficulty, workers)
+        start = time.perf_counter()
+        for repeat in range(repeats):
+            evaluations = ParallelEvaluations(fen, moves, difficulty, workers)
+        seconds = (time.perf_counter() - start) / repeats
+
+        if serialEvaluations == None:
+            serialEvaluations, serialSeconds = evaluations, seconds
+
+        # Checks if the same move is chosen as when the moves are evaluated one after another
+        sameMove = AI.ChooseMove(evaluations) == AI.ChooseMove(serialEvaluations)
+        passed = passed and sameMove
+        print(f'{workers:>3} workers  {seconds:.3f}s per move  {serialSeconds / seconds:5.2f}x speedup  '
+              f'{"same move" if sameMove else "DIFFERENT MOVE"}')
+
+    ClosePools()
+
+    return passed
+
+def main():
+    parser = argparse.ArgumentParser(description='Times the medium or hard difficulty evaluating its moves on several CPU cores')
+    parser.add_argument('--fen', default=BENCHMARK_FEN, help='the position to choose a move in (defaults to a middlegame)')
+    parser.add_argument('--difficulty', default='Hard', choices=DIFFICULTIES, help='the evaluation to use')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8], help='the numbers of workers to compare')
+    parser.add_argument('--repeats', type=int, default=5, help='the number of times each move is timed')
+    arguments = parser.parse_args()
+
+    return 0 if Benchmark(arguments.fen, arguments.difficulty, arguments.workers, arguments.repeats) else 1
+
+if __name__ == '__main__':
+    raise SystemExit(main())
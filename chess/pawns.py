@@ -0,0 +1,112 @@
+from array import array
+from .bitboard import Squares, PopCount
+from .movegen import PAWN_ATTACKS
+
+# Scores the pawn structure (passed, doubled, isolated and backward pawns and pawn breaks) from the pawn bitboards only.
+# The pawns move far less often than the other pieces, so positions next to each other in the search usually have the
+# same pawns and the score is kept in a pawn table found by a key made from the pawns alone.
+# Scores are middlegame and endgame pairs in centipawns from black's point of view, blended like the piece-square tables
+
+DOUBLED = (-10, -25) # For every pawn on a file after the first
+ISOLATED = (-10, -15) # For a pawn with no pawns of its own on the files either side
+BACKWARD = (-8, -12) # For a pawn that can't be defended by its own pawns and whose square in front is guarded by an enemy pawn
+PAWN_BREAK = (6, 0) # For a pawn that can move forward to attack an enemy pawn and open up the position
+# For a pawn with no enemy pawns in front of it on its own file or the files either side, by how many rows it has advanced
+PASSED_MIDDLEGAME = [0, 5, 10, 15, 30, 50, 80, 0]
+PASSED_ENDGAME = [0, 10, 20, 35, 60, 100, 150, 0]
+
+PAWN_TABLE_SIZE = 16384 # The number of entries in the pawn table, a power of two so an entry can be found with a mask
+
+FILE_MASKS = [sum(1 << (row * 8 + file) for row in range(8)) for file in range(8)]
+ADJACENT_FILE_MASKS = [(FILE_MASKS[file - 1] if file > 0 else 0) | (FILE_MASKS[file + 1] if file < 7 else 0) for file in range(8)]
+
+def RowsMask(rows):
+    return sum(0xFF << (row * 8) for row in rows) # Every square on the given rows
+
+# The rows in front of and level with or behind each row for each colour (white pawns move up towards row 0)
+ROWS_AHEAD = [[RowsMask(range(0, row)) for row in range(8)], [RowsMask(range(row + 1, 8)) for row in range(8)]]
+ROWS_BEHIND = [[RowsMask(range(row, 8)) for row in range(8)], [RowsMask(range(0, row + 1)) for row in range(8)]]
+
+# The squares an enemy pawn would have to be on to stop a pawn on each square from being passed
+PASSED_MASKS = [[ROWS_AHEAD[colour][square // 8] & (FILE_MASKS[square % 8] | ADJACENT_FILE_MASKS[square % 8])
+                 for square in range(64)] for colour in range(2)]
+# The squares a pawn of its own would have to be on to ever be able to defend a pawn on each square
+SUPPORT_MASKS = [[ROWS_BEHIND[colour][square // 8] & ADJACENT_FILE_MASKS[square % 8] for square in range(64)]
+                 for colour in range(2)]
+
+def PlayerPawnStructure(ownPawns, enemyPawns, colour):
+    # Returns the middlegame and endgame pawn structure scores of one player (colour is 0 for white and 1 for black)
+    middlegame = 0
+    endgame = 0
+    allPawns = ownPawns | enemyPawns
+    forward = -8 if colour == 0 else 8
+
+    # Checks each file for more than one pawn
+    for file in range(8):
+        count = PopCount(ownPawns & FILE_MASKS[file])
+        if count > 1:
+            middlegame += DOUBLED[0] * (count - 1)
+            endgame += DOUBLED[1] * (count - 1)
+
+    for square in Squares(ownPawns):
+        file = square % 8
+        stopSquare = square + forward # The square in front of the pawn (always on the board as pawns never stand on the last row)
+
+        # Checks if no pawns of its own are on the files either side
+        if ownPawns & ADJACENT_FILE_MASKS[file] == 0:
+            middlegame += ISOLATED[0]
+            endgame += ISOLATED[1]
+        # Checks if none of its own pawns can come up to defend it and an enemy pawn guards the square in front of it
+        elif ownPawns & SUPPORT_MASKS[colour][square] == 0 and PAWN_ATTACKS[colour][stopSquare] & enemyPawns:
+            middlegame += BACKWARD[0]
+            endgame += BACKWARD[1]
+
+        # Checks if no enemy pawn can block or capture the pawn on its way to promoting
+        if enemyPawns & PASSED_MASKS[colour][square] == 0:
+            rowsAdvanced = 7 - square // 8 if colour == 0 else square // 8
+            middlegame += PASSED_MIDDLEGAME[rowsAdvanced]
+            endgame += PASSED_ENDGAME[rowsAdvanced]
+
+        # Checks if the pawn can move forward (as far as the pawns are concerned) to attack an enemy pawn
+        if allPawns & (1 << stopSquare) == 0 and PAWN_ATTACKS[colour][stopSquare] & enemyPawns:
+            middlegame += PAWN_BREAK[0]
+            endgame += PAWN_BREAK[1]
+
+    return middlegame, endgame
+
+def PawnStructure(position):
+    # Returns the middlegame and endgame pawn structure scores of black minus those of white
+    whitePawns = position.PieceBitboard('Pawn', 'White')
+    blackPawns = position.PieceBitboard('Pawn', 'Black')
+    whiteMiddlegame, whiteEndgame = PlayerPawnStructure(whitePawns, blackPawns, 0)
+    blackMiddlegame, blackEndgame = PlayerPawnStructure(blackPawns, whitePawns, 1)
+
+    return blackMiddlegame - whiteMiddlegame, blackEndgame - whiteEndgame
+
+class PawnTable:
+    # A fixed size table of pawn structure scores found by the pawn key. An entry is simply overwritten by a newer one.
+    # An empty entry has a key of 0, which is also the key of a position with no pawns, whose scores really are 0
+    def __init__(self, entries=PAWN_TABLE_SIZE):
+        self.mask = entries - 1
+        self.keys = array('Q', [0]) * entries
+        self.middlegames = array('i', [0]) * entries
+        self.endgames = array('i', [0]) * entries
+        self.probes = 0
+        self.hits = 0
+
+    def Score(self, position):
+        # Returns the pawn structure scores of the position, working them out only if its pawns aren't in the table
+        key = position.pawnHash
+        index = key & self.mask
+        self.probes += 1
+
+        if self.keys[index] == key:
+            self.hits += 1
+            return self.middlegames[index], self.endgames[index]
+
+        middlegame, endgame = PawnStructure(position)
+        self.keys[index] = key
+        self.middlegames[index] = middlegame
+        self.endgames[index] = endgame
+
+        return middlegame, endgame
@@ -0,0 +1,118 @@
+import argparse
+import time
+from .bitboard import START_FEN, PositionFromFen
+from .movegen import GenerateLegalMoves, MakeMove, UnmakeMove, MoveName
+
+# Perft counts every position reachable in a given number of moves, which checks the move generator against known counts
+# and measures how fast it is. Usage: python -m chess.perft --fen "<fen>" --depth 4 --divide (or --suite for the standard positions)
+
+# The standard perft positions with their known node counts for depth 1, 2, 3...
+PERFT_SUITE = [
+    ('Start position', START_FEN, [20, 400, 8902, 197281, 4865609]),
+    ('Kiwipete (castling, pins, enPassant)', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+     [48, 2039, 97862, 4085603]),
+    ('EnPassant discovered checks along the rank', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', [14, 191, 2812, 43238, 674624]),
+    ('Promotions and castling under attack', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+     [6, 264, 9467, 422333]),
+    ('Promotion with capture and check', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', [44, 1486, 62379, 2103487]),
+    ('Symmetrical middlegame', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+     [46, 2079, 89890, 3894594]),
+]
+
+def Perft(position, depth):
+    moves = GenerateLegalMoves(position, position.sideToMove)
+
+    # The moves at the last depth only need to be counted, not played
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        undo = MakeMove(position, move)
+        nodes += Perft(position, depth - 1)
+        UnmakeMove(position, move, undo)
+
+    return nodes
+
+def Divide(position, depth):
+    # Returns the perft count below each move at the root so a wrong count can be traced to the move that causes it
+    counts = {}
+
+    for move in GenerateLegalMoves(position, position.sideToMove):
+        undo = MakeMove(position, move)
+        counts[MoveName(move)] = Perft(position, depth - 1) if depth > 1 else 1
+        UnmakeMove(position, move, undo)
+
+    return counts
+
+def TimedPerft(fen, depth):
+    position = PositionFromFen(fen)
+    start = time.perf_counter()
+    nodes = Perft(position, depth)
+    seconds = time.perf_counter() - start
+
+    return nodes, seconds
+
+def NodesPerSecond(nodes, seconds):
+    # Avoids dividing by zero for positions that are counted almost instantly
+    if seconds == 0:
+        return 0
+
+    return int(nodes / seconds)
+
+def RunSuite(maxDepth):
+    passed = True
+    totalNodes = 0
+    totalSeconds = 0
+
+    for name, fen, expectedCounts in PERFT_SUITE:
+        # Runs every depth with a known count up to the maximum depth
+        for depth, expected in enumerate(expectedCounts[:maxDepth], 1):
+            nodes, seconds = TimedPerft(fen, depth)
+            totalNodes += nodes
+            totalSeconds += seconds
+
+            if nodes == expected:
+                result = 'OK'
+            else:
+                result = 'FAIL (expected ' + str(expected) + ')'
+                passed = False
+
+            print(f'{name:45} depth {depth}  {nodes:>10} nodes  {NodesPerSecond(nodes, seconds):>9} nodes/sec  {result}')
+
+    print(f'Total: {totalNodes} nodes in {totalSeconds:.2f}s ({NodesPerSecond(totalNodes, totalSeconds)} nodes/sec)')
+
+    return passed
+
+def main():
+    parser = argparse.ArgumentParser(description='Counts the positions reachable from a position to check and benchmark the move generator')
+    parser.add_argument('--fen', default=START_FEN, help='the position to search (defaults to the starting position)')
+    parser.add_argument('--depth', type=int, default=4, help='the number of moves to search (the maximum depth with --suite)')
+    parser.add_argument('--divide', action='store_true', help='show the count below each move from the position')
+    parser.add_argument('--suite', action='store_true', help='run the standard perft positions and compare with their known counts')
+    arguments = parser.parse_args()
+
+    if arguments.suite:
+        return 0 if RunSuite(arguments.depth) else 1
+
+    position = PositionFromFen(arguments.fen)
+    start = time.perf_counter()
+
+    if arguments.divide:
+        counts = Divide(position, arguments.depth)
+        for move, count in counts.items():
+            print(f'{move}: {count}')
+        nodes = sum(counts.values())
+        print(f'Moves: {len(counts)}')
+    else:
+        nodes = Perft(position, arguments.depth)
+
+    seconds = time.perf_counter() - start
+    print(f'Nodes: {nodes}')
+    print(f'Time: {seconds:.3f}s')
+    print(f'Nodes/sec: {NodesPerSecond(nodes, seconds)}')
+
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
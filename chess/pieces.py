@@ -1,8 +1,81 @@
 import os
-import operator
+from .bitboard import SquareIndex
+from .movegen import ROOK_DIRECTIONS, BISHOP_DIRECTIONS, RAY_POSITIONS, KNIGHT_POSITIONS, KING_POSITIONS
+
+# Each of these functions walks one precomputed ray (the squares in one direction from a piece, nearest first)
+# and adds the squares that count for its condition. The right one is picked once per piece instead of on every square.
+
+# Responsible for normal valid moves
+def NormalRay(board, ray, colour, moves, skewerSkips):
+    for row, column in ray:
+        piece = board[row][column].piece
+        # Checks if the square to move to is empty
+        if piece == None:
+            moves.append((row, column))
+        # Checks if an enemy piece has been encountered
+        elif piece.colour != colour:
+            moves.append((row, column))
+            # If it encounters an enemy piece, it stops so no more moves are added along that direction
+            break
+        else:
+            # It stops if it encounters a friendly piece
+            break
+
+# Responsible for the moves that are used to control king movement
+def ControlRay(board, ray, colour, moves, skewerSkips):
+    for row, column in ray:
+        piece = board[row][column].piece
+        # Checks if the square to move to is empty
+        if piece == None:
+            moves.append((row, column))
+        # Checks if a friendly piece has been encountered and adds it so it can defend it from the king
+        elif piece.colour == colour:
+            moves.append((row, column))
+            # If it encounters a friendly piece, it stops so no more moves are added along that direction
+            break
+        # If the piece it encounters is an enemy king, it skips that square and adds the ones behind it.
+        elif piece.name == 'King':
+            continue
+        else:
+            # If it encounters an enemy piece that is not a king, it stops.
+            break
+
+# Responsible for pin moves so it can check if a king is in sight
+def PinRay(board, ray, colour, moves, skewerSkips):
+    for row, column in ray:
+        piece = board[row][column].piece
+        # Checks if the square is empty
+        if piece == None:
+            moves.append((row, column))
+        # If it encounters an enemy piece that is not a king it skips it
+        elif piece.colour != colour and piece.name != 'King':
+            continue
+        # If it encounters an enemy king, it adds it to the moves list and stops
+        elif piece.colour != colour and piece.name == 'King':
+            moves.append((row, column))
+            break
+        else:
+            # If it encounters a friendly piece it stops
+            break
+
+# Responsible for skewer moves
+def SkewerRay(board, ray, colour, moves, skewerSkips):
+    for row, column in ray:
+        piece = board[row][column].piece
+        # Checks if the square is empty
+        if piece == None:
+            moves.append((row, column))
+        # Checks if a friendly piece that moves along the same lines has been encountered and skips it if so
+        elif skewerSkips(piece, colour):
+            continue
+        # Checks if an enemy piece has been encountered
+        elif piece.colour != colour:
+            moves.append((row, column))
+            break # Stops once an enemy piece has been encountered
+        else:
+            break # It stops if any other friendly piece is encountered
 
-# This dictionary is used to map a string to its correct operator using the in-buit operator module.
-operators = {'+': operator.add, '-': operator.sub}
+RAY_WALKS = {None: NormalRay, 'Control': ControlRay, 'Pin': PinRay, 'Skewer': SkewerRay}
 
 class Piece:
     def __init__(self, name, colour, value, image=None, imageRect=None):
@@ -122,90 +195,22 @@ class Bishop(Piece):
 
     def GetValidMoves(self, board, row, column, condition=None):
         moves = []
-        currentSquare = board[row][column]
-
-        # The pair (+, +) is responsible for getting the moves for the bishop in the top-left to bottom-right diagonal
-        # The pair(-, -) is responsible for getting the moves for the bishop in the bottom-right to top-left diagonal
-        # The pair (+, -) is responsible foe getting the moves for the bishop in the top-right to bottom-left diagonal
-        # The pair (-, +) is responsible for getting the moves for the bishop in the bottom-left to top-right diagonal
-        operatorPairs = [('+', '+'), ('-', '-'), ('+', '-'), ('-', '+')]
-
-        for ops in operatorPairs:
-            for direction in range(1, 8): # This for loop with the help of the first loops checks the squares in all directions
-                op1 = operators[ops[0]] # Gets the first element of the tuple
-                op2 = operators[ops[1]] # Gets the second element of the tuple
-                newRow = op1(row, direction) # Same as newRow = row + direction (operator depends on first element of each tuple iterated)
-                newColumn = op2(column, direction) # Same as newColumn  = row + direction (operator depends on second element of each tuple iterated)
-
-                # Checks to see if the new row and column to move to is within the bounds of the board
-                if 0 <= newRow <= 7 and 1 <= newColumn <= 8:
-                    newSquare = board[newRow][newColumn] # It would be None if the square is empty
-
-                    # This if block is responsible for normal valid moves
-                    if condition == None:
-                        # Checks if the square to move to is empty
-                        if newSquare.piece == None:
-                            moves.append((newRow, newColumn))
-                        # Checks if an enemy piece has been encountered
-                        elif currentSquare.piece.colour != newSquare.piece.colour:
-                            moves.append((newRow, newColumn))
-                            # If it encounters an enemy piece, it stops so no more moves are added along that direction
-                            break
-                        else:
-                            # It stops if it encounters a friendly piece
-                            break
-
-                    # This elif block is responsible for the moves that are used to control king movement
-                    elif condition == 'Control':
-                        # Checks if the square to move to is empty
-                        if newSquare.piece == None:
-                            moves.append((newRow, newColumn))
-                        # Checks if a friendly piece has been encountered and adds it so it can defend it from the king
-                        elif currentSquare.piece.colour == newSquare.piece.colour:
-                            moves.append((newRow, newColumn))
-                            # If it encounters a friendly piece, it stops so no more moves are added along that direction
-                            break
-                        # If the piece it encounters is an enemy king, it skips that square and adds the ones behind it.
-                        elif newSquare.piece.name == 'King' and currentSquare.piece.colour != newSquare.piece.colour:
-                            continue
-                        else:
-                            # If it encounters an enemy piece that is not a king, it stops.
-                            break
-
-                    # This is responsible for pin moves
-                    elif condition == 'Pin':
-                        # Checks if the square is empty
-                        if newSquare.piece == None:
-                            moves.append((newRow, newColumn))
-                        # If it encounters an enemy piece that is not a king it skips it
-                        elif currentSquare.piece.colour != newSquare.piece.colour and newSquare.piece.name != 'King':
-                            continue
-                        # If it encounters an enemy king, it adds it to the moves list and stops
-                        elif currentSquare.piece.colour != newSquare.piece.colour and newSquare.piece.name == 'King':
-                            moves.append((newRow, newColumn))
-                            break
-                        else:
-                            # If it encounters a friendly piece it stops
-                            break
-
-                    # This is responsible for skewer moves
-                    elif condition == 'Skewer':
-                        # Checks if the square is empty
-                        if newSquare.piece == None:
-                            moves.append((newRow, newColumn))
-                        # Checks if a friendly queen or bishop has been encountered and skips it if so
-                        elif currentSquare.piece.colour == newSquare.piece.colour\
-                        and newSquare.piece.name == 'Queen' or newSquare.piece.name == 'Bishop':
-                            continue
-                        # Checks if an enemy piece has been encountered
-                        elif currentSquare.piece.colour != newSquare.piece.colour:
-                            moves.append((newRow, newColumn))
-                            break # Stops once an enemy piece has been encountered
-                        else:
-                            break # It stops if a friendly rook, knight, pawn or king is encountered
+        colour = board[row][column].piece.colour
+        walk = RAY_WALKS.get(condition) # Gets the function for the condition so it isn't checked on every square
+
+        # Checks if the condition has moves for a bishop
+        if walk != None:
+            square = SquareIndex(row, column)
+            # Walks the four diagonals from the bishop's square using the precomputed rays
+            for direction in BISHOP_DIRECTIONS:
+                walk(board, RAY_POSITIONS[direction][square], colour, moves, self.SkewerSkips)
                 
         return moves
 
+    def SkewerSkips(self, piece, colour):
+        # A friendly queen or bishop is looked through when checking for skewers
+        return piece.colour == colour and (piece.name == 'Queen' or piece.name == 'Bishop')
+
 class Knight(Piece):
     def __init__(self, colour):
         # Using inheritance so I don't have to write all the code in the Piece class constructor for each piece.
@@ -213,54 +218,23 @@ class Knight(Piece):
 
     def GetValidMoves(self, board, row, column, condition=None):
         moves = []
-        currentSquare = board[row][column]
+        colour = board[row][column].piece.colour
+
+        # Loops through the precomputed L-Movement squares from the knight's square that are within the bounds of the board
+        for newRow, newColumn in KNIGHT_POSITIONS[SquareIndex(row, column)]:
+            piece = board[newRow][newColumn].piece
 
-        operatorPairs = [('-', '+'), ('+', '+')]
-        direction1 = 1
-        direction2 = 2
-
-        for ops in operatorPairs:
-            # This is responsible for the L-Movement that is 2 squares up/down and then 1 square left/right
-            for col in [-1, 1]:
-                op1 = operators[ops[0]]
-                op2 = operators[ops[1]]
-                newRow = op1(row, direction2) # Gets the row 2 squares up (op1 = -) or 2 squares down (op1 = +)
-                newColumn = op2(column, col) # Gets the column 1 to the left if col = - or 1 to the right if col = 1
-
-                if 0 <= newRow <= 7 and 1 <= newColumn <= 8:
-                    newSquare = board[newRow][newColumn]
-                    
-                    # Responsible for normal moves
-                    if condition == None:
-                        # Checks if the square encountered is empty or contains an enemy piece
-                        if newSquare.piece == None or currentSquare.piece.colour != newSquare.piece.colour:
-                            moves.append((newRow, newColumn))
-
-                    # Responsible for control moves to control king movement
-                    elif condition == 'Control':
-                        # Checks if the square encountered is empty or contains a friendly piece so it can defend it from the king
-                        if newSquare.piece == None or currentSquare.piece.colour == newSquare.piece.colour:
-                            moves.append((newRow, newColumn))
-
-            # This is responsible for the L-Movement that is 1 square up/down and then 2 squares left/right
-            for col in [-2, 2]:
-                newRow = op1(row, direction1) # Gets the row 1 squares up (op1 = -) or 1 squares down (op1 = +)
-                newColumn = op2(column, col) # Gets the column 2 to the left if col = - or 2 to the right if col = 1
-
-                if 0 <= newRow <= 7 and 1 <= newColumn <= 8:
-                    newSquare = board[newRow][newColumn]
-
-                    # This if block is responsible for normal valid moves
-                    if condition == None:
-                        # Checks if the square encountered is empty or contains an enemy piece
-                        if newSquare.piece == None or currentSquare.piece.colour != newSquare.piece.colour:
-                            moves.append((newRow, newColumn))
-                    
-                    # This elif block is responsible for the moves that are used to control king movement
-                    elif condition == 'Control':
-                        # Checks if the square encountered is empty or contains a friendly piece so it can defend it from the king
-                        if newSquare.piece == None or currentSquare.piece.colour == newSquare.piece.colour:
-                            moves.append((newRow, newColumn))
+            # Responsible for normal moves
+            if condition == None:
+                # Checks if the square encountered is empty or contains an enemy piece
+                if piece == None or colour != piece.colour:
+                    moves.append((newRow, newColumn))
+
+            # Responsible for control moves to control king movement
+            elif condition == 'Control':
+                # Checks if the square encountered is empty or contains a friendly piece so it can defend it from the king
+                if piece == None or colour == piece.colour:
+                    moves.append((newRow, newColumn))
 
         return moves
    
@@ -271,155 +245,22 @@ class Rook(Piece):
 
     def GetValidMoves(self, board, row, column, condition=None):
         moves = []
-        currentSquare = board[row][column]
+        colour = board[row][column].piece.colour
+        walk = RAY_WALKS.get(condition) # Gets the function for the condition so it isn't checked on every square
 
-        operatorPairs = ['+', '-'] # + is for down/right, - is for up/left
-
-        for ops in operatorPairs:
-            # Responsible for vertical moves
-            for direction in range(1, 8):
-                op1 = operators[ops] # Maps the string in operator pairs to the correct operator in the operators dictionary
-                newRow = op1(row, direction) # Performs the correct operation
-
-                # Checks if the new row is within the bounds of the board
-                if 0 <= newRow <= 7:
-                    newSquare = board[newRow][column]
-                    
-                    # This if block is responsible for the normal valid moves
-                    if condition == None:
-                        # Checks if the encountered square is empty
-                        if newSquare.piece == None:
-                            moves.append((newRow, column))
-                        # Checks if the new square contains an enemy piece
-                        elif currentSquare.piece.colour != newSquare.piece.colour:
-                            moves.append((newRow, column))
-                            # If it encounters an enemy piece, it stops so no more moves are added along that direction
-                            break
-                        else:
-                            # It stops if it encounters a friendly piece
-                            break
-                    
-                    # This elif block is responsible for the moves that are used to control king movement
-                    elif condition == 'Control':
-                        # Checks if the encountered square is empty
-                        if newSquare.piece == None:
-                            moves.append((newRow, column))
-                        # Checks if the new square contains a friendly piece so it can defend it from the king
-                        elif currentSquare.piece.colour == newSquare.piece.colour:
-                            moves.append((newRow, column))
-                            # If it encounters a friendly piece, it stops so no more moves are added along that direction
-                            break
-                        # If the piece it encounters is an enemy king, it skips that square and adds the ones behind it.
-                        elif newSquare.piece.name == 'King' and currentSquare.piece.colour != newSquare.piece.colour:
-                            continue
-                        else:
-                            # If it encounters an enemy piece that is not a king, it stops.
-                            break
-
-                    # Responsible for pin moves so it can check if a king is in sight
-                    elif condition == 'Pin':
-                        #Checks if the square is empty
-                        if newSquare.piece == None:
-                            moves.append((newRow, column))
-                        #Checks if the colour of the piece at the current square is not the same as the piece
-                        #in one of the valid squares.
-                        elif currentSquare.piece.colour != newSquare.piece.colour and newSquare.piece.name != 'King':
-                            continue
-                        elif currentSquare.piece.colour != newSquare.piece.colour and newSquare.piece.name == 'King':
-                            moves.append((newRow, column))
-                            #It stops if it encounters a piece of the same colour
-                            break 
-                        else:
-                            break
-
-                    # Responsible for skewer moves
-                    elif condition == 'Skewer':
-                        # Checks if the square is empty
-                        if newSquare.piece == None:
-                            moves.append((newRow, column))
-                        # Checks if a friendly rook or queen has been encountered and skips it if so
-                        elif currentSquare.piece.colour == newSquare.piece.colour\
-                        and (newSquare.piece.name == 'Queen' or newSquare.piece.name == 'Rook'):
-                            continue
-                        # Checks if an enemy piece has been encountered
-                        elif currentSquare.piece.colour != newSquare.piece.colour:
-                            moves.append((newRow, column))
-                            break # Stops once an enemy piece has been encountered
-                        else:
-                            break # It stops if it encounters a friendly piece that is not a rook or queen
-
-            # Responsible for horizontal moves
-            for direction in range(1, 8):
-                newColumn = op1(column, direction) # Perform the correct operation on column and direction
-
-                if 1 <= newColumn <= 8:
-                    newSquare = board[row][newColumn]
-                    # This if block is responsible for the normal valid moves
-                    if condition == None:
-                        # Checks if the new square is empty
-                        if newSquare.piece == None:
-                            moves.append((row, newColumn))
-                        # Checks if an enemy piece has been encountered
-                        elif currentSquare.piece.colour != newSquare.piece.colour:
-                            moves.append((row, newColumn))
-                            # If it encounters an enemy piece, it stops so no more moves are added along that direction
-                            break
-                        else:
-                            # It stops if it encounters a friendly piece
-                            break
-
-                    # This elif block is responsible for the moves that are used to control king movement
-                    elif condition == 'Control':
-                        # Checks if the new square is empty
-                        if newSquare.piece == None:
-                            moves.append((row, newColumn))
-                        # Checks if a friendly piece has been encountered so it can defend it from the king
-                        elif currentSquare.piece.colour == newSquare.piece.colour:
-                            moves.append((row, newColumn))
-                            # If it encounters a friendly piece, it stops so no more moves are added along that direction
-                            break
-                        # If the piece it encounters is an enemy king, it skips that square and adds the ones behind it.
-                        elif newSquare.piece.name == 'King' and currentSquare.piece.colour != newSquare.piece.colour:
-                            continue
-                        else:
-                            # If it encounters an enemy piece that is not a king, it stops.
-                            break
-
-                    # Responsible for pin moves in the horizontal direction
-                    elif condition == 'Pin':
-                        #Checks if the square is empty
-                        if newSquare.piece == None:
-                            moves.append((row, newColumn))
-                        # Checks if a non-king enemy piece has been encountered and skips it if so
-                        elif currentSquare.piece.colour != newSquare.piece.colour and newSquare.piece.name != 'King':
-                            continue
-                        # Checks if an enemy king has been encountered
-                        elif currentSquare.piece.colour != newSquare.piece.colour and newSquare.piece.name == 'King':
-                            moves.append((row, newColumn))
-                            # It stops once it encounters an enemy king
-                            break 
-                        else:
-                            # It stops if it encounters a friendly piece
-                            break
-
-                    # Responsible for skewer moves in the horizontal direction
-                    elif condition == 'Skewer':
-                        # Checks if the square is empty
-                        if newSquare.piece == None:
-                            moves.append((row, newColumn))
-                        # Checks if a friendly rook or queen has been encountered and skips it if so
-                        elif currentSquare.piece.colour == newSquare.piece.colour\
-                        and (newSquare.piece.name == 'Queen' or newSquare.piece.name == 'Rook'):
-                            continue
-                        # Checks if an enemy piece has been encountered
-                        elif currentSquare.piece.colour != newSquare.piece.colour:
-                            moves.append((row, newColumn))
-                            break # Stops once an enemy piece has been encountered
-                        else:
-                            break # It stops if it encounters a friendly piece that is not a rook or queen
+        # Checks if the condition has moves for a rook
+        if walk != None:
+            square = SquareIndex(row, column)
+            # Walks the vertical and horizontal lines from the rook's square using the precomputed rays
+            for direction in ROOK_DIRECTIONS:
+                walk(board, RAY_POSITIONS[direction][square], colour, moves, self.SkewerSkips)
 
         return moves
 
+    def SkewerSkips(self, piece, colour):
+        # A friendly queen or rook is looked through when checking for skewers
+        return piece.colour == colour and (piece.name == 'Queen' or piece.name == 'Rook')
+
 class Queen(Piece):
     def __init__(self, colour):
         # Using inheritance so I don't have to write all the code in the Piece class constructor for each piece.
@@ -449,26 +290,23 @@ class King(Piece):
 
     def GetValidMoves(self, board, row, column, condition=None):
         moves = []
-        currentSquare = board[row][column]
-
-        # Loops through each row and column one square from the king in all directions
-        for rows in range(row - 1, row + 2):
-            for cols in range(column - 1, column + 2):
-                # Ensures it within the bounds of the boards
-                if 0 <= rows <= 7 and 1 <= cols <= 8 and (rows, cols) != (row, column):
-                    newSquare = board[rows][cols]
-
-                    # Responsible for normal moves
-                    if condition == None:
-                        # Checks if an empty square or an enemy piece has been encountered
-                        if newSquare.piece == None or newSquare.piece.colour != currentSquare.piece.colour:
-                            moves.append((rows, cols))
-
-                    # Responsible for storing control moves so it can controls squares and defend pieces from the enemy king
-                    elif condition == 'Control':
-                        # Checks if an emepty square or a friendly piece has been encountered so it can defend it agains the enemy king
-                        if newSquare.piece == None or newSquare.piece.colour == currentSquare.piece.colour:
-                            moves.append((rows, cols))
+        colour = board[row][column].piece.colour
+
+        # Loops through the precomputed squares one square from the king in all directions that are within the bounds of the board
+        for rows, cols in KING_POSITIONS[SquareIndex(row, column)]:
+            piece = board[rows][cols].piece
+
+            # Responsible for normal moves
+            if condition == None:
+                # Checks if an empty square or an enemy piece has been encountered
+                if piece == None or piece.colour != colour:
+                    moves.append((rows, cols))
+
+            # Responsible for storing control moves so it can controls squares and defend pieces from the enemy king
+            elif condition == 'Control':
+                # Checks if an emepty square or a friendly piece has been encountered so it can defend it agains the enemy king
+                if piece == None or piece.colour == colour:
+                    moves.append((rows, cols))
                         
         return moves
     
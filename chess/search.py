@@ -0,0 +1,411 @@
+import time
+from . import engine
+from .bitboard import POSITIONS, SquareIndex
+from .transposition import EXACT, LOWER, UPPER
+from .ordering import HeuristicOrderer
+from .options import EngineOptions
+
+# A negamax alpha-beta search with iterative deepening. Scores are always from the point of view of the player to move
+# so the same code searches for both colours
+
+MATE_SCORE = 1000000000 # Larger than any evaluation (even the checkmate bonus in MediumEvaluation) so a found mate always wins
+MAX_PLY = 100 # Mate scores are reduced by the ply the mate happens on so shorter mates score higher
+INFINITY = float('inf')
+NODE_CHECK_INTERVAL = 256 # How many nodes are searched between checks of the time limit
+
+# A capture is skipped in the quiescence search if even winning the piece plus this margin can't raise the score to alpha
+DELTA_MARGIN = 2
+MATERIAL_WEIGHT = 4 # The most the evaluations weigh a difference in material (MediumEvaluation multiplies a deficit by 4)
+
+# The width of the zero windows used to prove a move is no better than a bound. Scores are in pawns and differ by fractions
+# of a pawn, so a window of a whole pawn would treat any move less than a pawn better than alpha as failing low
+NULL_WINDOW = 0.01
+NULL_MOVE_REDUCTION = 2 # How much shallower the search after a null move is than a normal move
+LMR_DEPTH = 3 # The least depth left for late moves to be reduced
+LMR_MOVES = 3 # The number of moves searched at full depth before the rest can be reduced
+
+ASPIRATION_DEPTH = 3 # The first iteration that is searched with an aspiration window instead of the full window
+ASPIRATION_GROWTH = 2 # How many times wider the window gets after each failed search
+ASPIRATION_LIMIT = 4 # Once the window would be wider than this the failing side is opened up completely
+
+def PackMove(move):
+    # Stores a (row, column, newRow, newColumn) move as one number so it fits in the transposition table (0 means no move)
+    if move == None:
+        return 0
+
+    return SquareIndex(move[0], move[1]) | (SquareIndex(move[2], move[3]) << 6)
+
+def UnpackMove(packedMove):
+    if packedMove == 0:
+        return None
+
+    return POSITIONS[packedMove & 63] + POSITIONS[packedMove >> 6]
+
+def ScoreToTable(score, ply):
+    # Mate scores are stored as the distance to mate from the stored position instead of from the root of the search
+    if score >= MATE_SCORE - MAX_PLY:
+        return score + ply
+    if score <= -MATE_SCORE + MAX_PLY:
+        return score - ply
+
+    return score
+
+def ScoreFromTable(score, ply):
+    if score >= MATE_SCORE - MAX_PLY:
+        return score - ply
+    if score <= -MATE_SCORE + MAX_PLY:
+        return score + ply
+
+    return score
+
+class Search:
+    def __init__(self, evaluate, options=None, table=None, orderer=None, stopSignal=None):
+        self.evaluate = evaluate # Function that scores a board from black's point of view (like the AIGame evaluations)
+        # The depth, time limit and which pruning techniques are used (see options.EngineOptions)
+        if options != None:
+            self.options = options
+        else:
+            self.options = EngineOptions()
+        self.deadline = None
+        self.stopped = False # Set when the time runs out so every level of the search stops straight away
+        self.nodes = 0
+        self.nullMoveCutoffs = 0 # The number of times passing was still good enough to cut off
+        self.reSearches = 0 # The number of reduced or zero window searches that had to be searched again
+        # The nodes, score, aspiration re-searches, first move cutoff rate and time of every iteration that finished, in the
+        # order they were searched
+        self.iterations = []
+        self.depthReached = 0 # The depth of the last iteration that finished
+        self.bestScore = None
+        self.pv = [] # The principal variation: the best line of moves found, starting with the move to play
+        self.table = table # The transposition table shared between searches (None to search without one)
+        self.stopSignal = stopSignal # An event (like multiprocessing.Event) that stops the search early when it is set
+        # Decides the order moves are searched in (any object with the methods of ordering.MoveOrderer can be used)
+        if orderer != None:
+            self.orderer = orderer
+        else:
+            self.orderer = HeuristicOrderer()
+
+    def Start(self, board, colour, timeManager=None, startDepth=1):
+        # Searches one ply deeper each iteration until the maximum depth or the time limit is reached, keeping the result
+        # of the last iteration that finished so the move is always from a complete search. A time manager replaces the
+        # fixed time limit with deadlines worked out from the clock
+        self.nodes = 0
+        self.nullMoveCutoffs = 0
+        self.reSearches = 0
+        self.stopped = False
+        self.depthReached = 0
+        self.bestScore = None
+        self.pv = []
+        self.iterations = []
+        if self.table != None:
+            self.table.NewSearch()
+        self.orderer.NewSearch()
+        if timeManager != None:
+            self.deadline = timeManager.hardDeadline
+        elif self.options.timeLimit != None:
+            self.deadline = time.perf_counter() + self.options.timeLimit
+        else:
+            self.deadline = None
+
+        for depth in range(startDepth, self.options.maxDepth + 1):
+            # Checks if the last iteration used up the time for the move so a new one isn't started only to be thrown away
+            if timeManager != None and self.iterations != [] and not timeManager.StartIteration(self.iterations[-1]['seconds']):
+                break
+
+            iterationStart = time.perf_counter()
+            iterationNodes = self.nodes
+            self.orderer.NewIteration()
+            score, pv, failures = self.AspirationSearch(board, colour, depth)
+
+            # Checks if the time ran out before the iteration finished so its result is thrown away
+            if self.stopped:
+                break
+
+            self.bestScore, self.pv, self.depthReached = score, pv, depth
+            self.iterations.append({'depth': depth, 'score': score, 'move': pv[0] if pv != [] else None,
+                                    'nodes': self.nodes - iterationNodes, 'reSearches': failures,
+                                    'firstMoveCutoffRate': self.orderer.FirstMoveCutoffRate(),
+                                    'seconds': time.perf_counter() - iterationStart})
+
+            # Checks if a forced checkmate has been found as searching deeper won't change the move
+            if abs(score) >= MATE_SCORE - MAX_PLY:
+                break
+
+        # Checks if not even the first iteration finished and falls back to the first legal move if so
+        if self.pv == []:
+            moves = engine.LegalMoves(board, colour)
+            if moves != []:
+                self.pv = [moves[0]]
+
+        if self.pv != []:
+            return self.pv[0]
+
+        return None
+
+    def Stats(self):
+        # The totals of the last search along with the stats of each iteration
+        stats = {'depth': self.depthReached, 'score': self.bestScore, 'nodes': self.nodes,
+                 'nullMoveCutoffs': self.nullMoveCutoffs, 'reSearches': self.reSearches, 'iterations': self.iterations}
+
+        # Checks if the search used a transposition table and adds how often it found a position and how full it is if so
+        if self.table != None:
+            stats['tableHitRate'] = self.table.HitRate()
+            stats['hashFull'] = self.table.HashFull()
+
+        return stats
+
+    def AspirationSearch(self, board, colour, depth):
+        # The score rarely changes much from one iteration to the next so the search starts with a narrow window around the
+        # last score, which cuts off far more of the tree. If the real score is outside the window the search fails low or
+        # high and is repeated with that side of the window widened. Returns the score, the line and the number of failures
+        if not self.options.aspirationWindows or depth < ASPIRATION_DEPTH or self.bestScore == None\
+        or abs(self.bestScore) >= MATE_SCORE - MAX_PLY:
+            score, pv = self.Negamax(board, colour, depth, -INFINITY, INFINITY, 0)
+            return score, pv, 0
+
+        lowerWindow = upperWindow = self.options.aspirationWindow
+        failures = 0
+
+        while True:
+            # Opens a side of the window completely once it has failed too many times to keep widening it
+            alpha = self.bestScore - lowerWindow if lowerWindow <= ASPIRATION_LIMIT else -INFINITY
+            beta = self.bestScore + upperWindow if upperWindow <= ASPIRATION_LIMIT else INFINITY
+
+            score, pv = self.Negamax(board, colour, depth, alpha, beta, 0)
+
+            if self.stopped:
+                return score, pv, failures
+
+            # Checks if the score fell below the window (fail low) or rose above it (fail high) so only a bound is known
+            if score <= alpha:
+                lowerWindow *= ASPIRATION_GROWTH
+            elif score >= beta:
+                upperWindow *= ASPIRATION_GROWTH
+            else:
+                return score, pv, failures
+
+            failures += 1
+
+    def TimeUp(self):
+        # Only looks at the clock every so many nodes because reading it is slow compared to searching a node
+        if self.nodes % NODE_CHECK_INTERVAL == 0:
+            if self.deadline != None and time.perf_counter() >= self.deadline:
+                self.stopped = True
+            # Checks if the search has been cancelled from outside (e.g. the move was taken back while the AI was thinking)
+            elif self.stopSignal != None and self.stopSignal.is_set():
+                self.stopped = True
+
+        return self.stopped
+
+    def Evaluate(self, board, colour):
+        score = self.evaluate(board)
+
+        # The evaluations score the board for black so the score is flipped when white is to move
+        if colour == 'White':
+            return -score
+
+        return score
+
+    def Negamax(self, board, colour, depth, alpha, beta, ply, nullAllowed=True):
+        self.nodes += 1
+        if self.TimeUp():
+            return 0, []
+
+        # Instead of evaluating as soon as the depth runs out, the captures are played out until the position is quiet
+        if depth == 0:
+            return self.Quiescence(board, colour, alpha, beta, ply, 0), []
+
+        key = board.hash
+        tableMove = None
+
+        # Checks if the position has already been searched to at least this depth and uses the stored result if so
+        if self.table != None:
+            entry = self.table.Probe(key)
+            if entry != None:
+                entryDepth, entryScore, bound, packedMove = entry
+                tableMove = UnpackMove(packedMove)
+                entryScore = ScoreFromTable(entryScore, ply)
+
+                if ply > 0 and entryDepth >= depth and (bound == EXACT or (bound == LOWER and entryScore >= beta)\
+                or (bound == UPPER and entryScore <= alpha)):
+                    return entryScore, [tableMove] if tableMove != None else []
+
+        moves = engine.LegalMoves(board, colour)
+        inCheck = engine.InCheck(board, colour) != None
+
+        # Checks if the player has no legal moves, which is checkmate if in check and stalemate otherwise
+        if moves == []:
+            if inCheck:
+                return -MATE_SCORE + ply, []
+            return 0, []
+
+        # Checks if neither player can checkmate anymore so the position is a draw
+        if ply > 0 and engine.InsufficientMaterial(board):
+            return 0, []
+
+        oppColour = engine.OppositeColour(colour)
+
+        # Null move pruning: lets the player pass and searches the opponent's reply less deeply. If the score is still at
+        # least beta then a real move would be even better so the position is cut off without searching any moves.
+        # Passing is illegal in check and misleading in pawn endgames where having to move can be the thing that loses
+        if self.options.nullMove and nullAllowed and ply > 0 and not inCheck and depth > NULL_MOVE_REDUCTION\
+        and beta < MATE_SCORE - MAX_PLY and not engine.PawnEndgame(board, colour):
+            state = board.MakeNullMove()
+            score, line = self.Negamax(board, oppColour, depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + NULL_WINDOW, ply + 1,
+                                       False)
+            board.UnmakeNullMove(state)
+
+            if self.stopped:
+                return 0, []
+
+            if -score >= beta:
+                self.nullMoveCutoffs += 1
+                return beta, []
+
+        # The best move from the transposition table (or the previous iteration) is searched first, followed by the moves
+        # most likely to cause a cutoff so alpha-beta can skip more of the rest
+        if tableMove == None and ply < len(self.pv):
+            tableMove = self.pv[ply]
+        moves = self.orderer.OrderMoves(board, moves, colour, ply, tableMove)
+
+        originalAlpha = alpha
+
+        bestScore = -INFINITY
+        bestLine = []
+
+        for moveNumber, move in enumerate(moves):
+            quiet = engine.QuietMove(board, move)
+            undo = board.MakeMove(move)
+
+            # The first move is expected to be the best so it is searched with the full window
+            if moveNumber == 0:
+                score, line = self.Negamax(board, oppColour, depth - 1, -beta, -alpha, ply + 1)
+                score = -score
+            else:
+                # Principal variation search: the later moves only need to be proved worse than alpha, which a zero width
+                # window around alpha does with far fewer nodes than the full window
+                if self.options.principalVariationSearch:
+                    windowAlpha = alpha
+                else:
+                    windowAlpha = beta - NULL_WINDOW # Gives the full window (-beta, -alpha) below
+
+                # Late move reductions: quiet moves ordered late rarely turn out best so they are searched one ply shallower,
+                # unless the player is in check or the move gives check
+                reduction = 0
+                if self.options.lateMoveReductions and depth >= LMR_DEPTH and moveNumber >= LMR_MOVES and quiet\
+                and not inCheck and engine.InCheck(board, oppColour) == None:
+                    reduction = 1
+
+                score, line = self.Negamax(board, oppColour, depth - 1 - reduction, -windowAlpha - NULL_WINDOW, -alpha, ply + 1)
+                score = -score
+
+                # Checks if the reduced move beat alpha so it is searched again at the full depth
+                if reduction > 0 and score > alpha and not self.stopped:
+                    self.reSearches += 1
+                    score, line = self.Negamax(board, oppColour, depth - 1, -windowAlpha - NULL_WINDOW, -alpha, ply + 1)
+                    score = -score
+
+                # Checks if the move landed inside the window so the zero window search has to be repeated with the full
+                # window to get its exact score
+                if self.options.principalVariationSearch and alpha < score < beta and not self.stopped:
+                    self.reSearches += 1
+                    score, line = self.Negamax(board, oppColour, depth - 1, -beta, -alpha, ply + 1)
+                    score = -score
+
+            board.UnmakeMove(undo)
+
+            if self.stopped:
+                return 0, []
+
+            # Checks if the move is the best found so far and keeps the line of moves that follows it if so
+            if score > bestScore:
+                bestScore = score
+                bestLine = [move] + line
+
+                if score > alpha:
+                    alpha = score
+
+                # The opponent already has a better option elsewhere so they won't allow this position
+                if alpha >= beta:
+                    self.orderer.RecordCutoff(board, move, colour, ply, depth, moveNumber)
+                    break
+
+        # Stores the result with whether it is exact or only a bound on the real score
+        if self.table != None:
+            if bestScore <= originalAlpha:
+                bound = UPPER
+            elif bestScore >= beta:
+                bound = LOWER
+            else:
+                bound = EXACT
+            self.table.Store(key, depth, ScoreToTable(bestScore, ply), bound, PackMove(bestLine[0]))
+
+        return bestScore, bestLine
+
+    def Quiescence(self, board, colour, alpha, beta, ply, quiescenceDepth):
+        # Only searches captures and promotions (and checks on the first ply if enabled) so a position is never evaluated
+        # in the middle of an exchange, where it would look like a piece has been won or lost when it hasn't
+        self.nodes += 1
+        if self.TimeUp():
+            return 0
+
+        oppColour = engine.OppositeColour(colour)
+
+        # A player in check has to get out of it so every legal move is searched and standing pat isn't allowed
+        if engine.InCheck(board, colour) != None:
+            moves = engine.LegalMoves(board, colour)
+            if moves == []:
+                return -MATE_SCORE + ply
+
+            bestScore = -INFINITY
+            for move in moves:
+                undo = board.MakeMove(move)
+                score = -self.Quiescence(board, oppColour, -beta, -alpha, ply + 1, quiescenceDepth + 1)
+                board.UnmakeMove(undo)
+
+                if self.stopped:
+                    return 0
+
+                if score > bestScore:
+                    bestScore = score
+                    if score > alpha:
+                        alpha = score
+                    if alpha >= beta:
+                        break
+
+            return bestScore
+
+        # Stand pat: the player doesn't have to capture so the score is at least the evaluation of the position as it is
+        standPat = self.Evaluate(board, colour)
+        if standPat >= beta or ply >= MAX_PLY:
+            return standPat
+        if standPat > alpha:
+            alpha = standPat
+
+        bestScore = standPat
+        moves = []
+        for move, gain in engine.TacticalMoves(board, colour):
+            # Delta pruning: skips captures that can't bring the score up to alpha even if the piece is won for free
+            if standPat + gain * MATERIAL_WEIGHT + DELTA_MARGIN > alpha:
+                moves.append(move)
+
+        # Checks if quiet checking moves should also be tried on the first ply of the quiescence search
+        if self.options.quiescenceChecks and quiescenceDepth == 0:
+            moves.extend(engine.CheckingMoves(board, colour))
+
+        for move in moves:
+            undo = board.MakeMove(move)
+            score = -self.Quiescence(board, oppColour, -beta, -alpha, ply + 1, quiescenceDepth + 1)
+            board.UnmakeMove(undo)
+
+            if self.stopped:
+                return 0
+
+            if score > bestScore:
+                bestScore = score
+                if score > alpha:
+                    alpha = score
+                if alpha >= beta:
+                    break
+
+        return bestScore
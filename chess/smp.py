@@ -0,0 +1,132 @@
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from .Board import Board
+from .BotManager import AIGame
+from .search import Search
+from .ordering import HeuristicOrderer
+from .transposition import SharedTranspositionTable
+
+# Lazy SMP: helper processes run the same iterative deepening search as the main search at the same time, all sharing one
+# transposition table. They don't split the work between them, but each helper fills the table with positions the main
+# search reaches later, so it finishes each iteration sooner. The helpers start at different depths and order their
+# moves slightly differently so they don't all search the same positions in the same order
+
+HISTORY_NOISE = 64 # The largest random amount added to a quiet move's history score by the helpers
+
+class SharedFlag:
+    # A flag in shared memory that tells the helpers to stop. It has the same is_set method as an event so the search can
+    # use it as its stop signal, and pickling it only sends the name of the memory
+    def __init__(self, name=None):
+        self.owner = name == None
+
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=1)
+            self.memory.buf[0] = 0
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+
+    def __getstate__(self):
+        return {'name': self.memory.name}
+
+    def __setstate__(self, state):
+        self.__init__(state['name'])
+
+    def is_set(self):
+        return self.memory.buf[0] != 0
+
+    def set(self):
+        self.memory.buf[0] = 1
+
+    def clear(self):
+        self.memory.buf[0] = 0
+
+    def Close(self):
+        self.memory.close()
+
+        if self.owner:
+            self.memory.unlink()
+
+class PerturbedOrderer(HeuristicOrderer):
+    # Orders moves like HeuristicOrderer but adds a little random noise to the history scores of quiet moves
+    def __init__(self, seed):
+        super().__init__()
+        self.random = random.Random(seed)
+
+    def HistoryScore(self, history, move):
+        return super().HistoryScore(history, move) + self.random.randrange(HISTORY_NOISE)
+
+helperBoard = None # The board each helper process sets up the positions it is sent on
+helperGame = None # The AIGame each helper process evaluates with, made once so its pawn table is kept between moves
+
+def HelperSearch(fen, colour, options, table, stopFlag, helperIndex):
+    # Runs in a helper process until the main search sets the stop flag (or it reaches its maximum depth). The helper
+    # evaluates with its own AIGame's tapered evaluation so no AIGame has to be pickled and sent with every move
+    global helperBoard, helperGame
+    if helperBoard == None:
+        helperBoard = Board()
+        helperGame = AIGame()
+    helperBoard.LoadFen(fen)
+
+    # Every other helper starts an iteration deeper so the helpers are spread over two depths
+    search = Search(helperGame.TaperedEvaluation, options, table, PerturbedOrderer(helperIndex), stopSignal=stopFlag)
+    search.Start(helperBoard, colour, startDepth=1 + helperIndex % 2)
+
+    # Lets go of the shared memory this helper attached to (the main process still owns it)
+    table.Close()
+    stopFlag.Close()
+
+    return search.nodes, search.depthReached
+
+class LazySMP:
+    def __init__(self, evaluate, options, table=None):
+        self.evaluate = evaluate # The main search's evaluation (the helpers always use the tapered evaluation)
+        self.options = options
+        # The helpers need the table to be in shared memory so one is made if a shared one isn't given
+        if table != None:
+            self.table = table
+        else:
+            self.table = SharedTranspositionTable()
+        self.stopFlag = SharedFlag()
+        # Spawning starts the helpers without a copy of the game window, which works the same on every operating system
+        self.pool = ProcessPoolExecutor(options.threads - 1, mp_context=multiprocessing.get_context('spawn'))
+        self.search = None
+        self.helpers = [] # The futures of the helpers started on the last move, which may still be stopping
+        self.nodes = 0 # The nodes searched by the main search and every helper on the last move
+        self.helperNodes = 0
+
+    def Start(self, board, colour, timeManager=None, stopSignal=None):
+        # Starts the helpers on the position, runs the main search here and tells the helpers to stop once it has finished
+        self.CollectHelpers() # The helpers from the last move have to stop before the flag is cleared or they'd carry on
+        self.stopFlag.clear()
+        fen = board.Fen()
+        # The helpers have no time limit of their own and search one ply deeper so they are still useful when the main
+        # search reaches its maximum depth
+        helperOptions = self.options.Copy(timeLimit=None, maxDepth=self.options.maxDepth + 1)
+        self.helpers = [self.pool.submit(HelperSearch, fen, colour, helperOptions, self.table, self.stopFlag, index)
+                        for index in range(1, self.options.threads)]
+
+        self.search = Search(self.evaluate, self.options, self.table, stopSignal=stopSignal)
+        move = self.search.Start(board, colour, timeManager)
+
+        # The move is returned without waiting for the helpers to stop, as that would add to the time the move takes
+        self.stopFlag.set()
+        self.nodes = self.search.nodes
+
+        return move
+
+    def CollectHelpers(self):
+        # Waits for the helpers from the last move to stop (which they do soon after the flag is set) and adds their nodes
+        # to the nodes of the last move
+        if self.helpers != []:
+            self.helperNodes = sum(helper.result()[0] for helper in self.helpers)
+            self.nodes = self.search.nodes + self.helperNodes
+            self.helpers = []
+
+    def Close(self):
+        self.stopFlag.set()
+        self.CollectHelpers()
+        self.pool.shutdown()
+        self.stopFlag.Close()
+        self.table.Close()
@@ -0,0 +1,44 @@
+import time
+
+# Decides how long the AI can spend on a move from the time it has left on its clock. Each move gets a soft limit, after
+# which the search doesn't start another iteration, and a hard limit, after which the search stops straight away
+
+MOVES_TO_GO = 40 # The number of moves the time left is expected to last at the start of the game
+MIN_MOVES_TO_GO = 20 # The time left is always shared between at least this many moves so some is kept for the end of the game
+INCREMENT_SHARE = 0.75 # The fraction of the increment added to each move (the rest is saved in case the search overruns)
+HARD_LIMIT_FACTOR = 3 # How many times longer than the soft limit the hard limit is
+MAX_TIME_SHARE = 0.2 # The most of the time left any single move can use
+SAFETY_MARGIN = 1 # Seconds kept back because the clock only ticks in whole seconds and the board takes time to update
+MIN_TIME = 0.05 # The least time a move is given, even when the clock is nearly out
+BRANCHING_ESTIMATE = 2 # Roughly how many times longer each iteration of the search takes than the one before
+
+class TimeManager:
+    def __init__(self, remaining, increment=0, moveNumber=1):
+        self.remaining = remaining # The seconds left on the player's clock
+        self.increment = increment # The seconds added to the clock after every move
+        self.moveNumber = moveNumber # The number of the move about to be played, starting from 1
+
+        # Shares the usable time between the moves expected to be left, which is fewer the longer the game goes on
+        usable = max(remaining - SAFETY_MARGIN, 0)
+        movesToGo = max(MIN_MOVES_TO_GO, MOVES_TO_GO - moveNumber)
+
+        self.hardLimit = max(min((usable / movesToGo + increment * INCREMENT_SHARE) * HARD_LIMIT_FACTOR,
+                                 usable * MAX_TIME_SHARE + increment * INCREMENT_SHARE), MIN_TIME)
+        self.softLimit = max(min(usable / movesToGo + increment * INCREMENT_SHARE, self.hardLimit), MIN_TIME)
+        self.Start()
+
+    def Start(self):
+        # Starts counting the time used for the move from now
+        self.startTime = time.perf_counter()
+        self.softDeadline = self.startTime + self.softLimit
+        self.hardDeadline = self.startTime + self.hardLimit
+
+    def Elapsed(self):
+        return time.perf_counter() - self.startTime
+
+    def StartIteration(self, lastIterationSeconds):
+        # Checks if there is time to start another iteration. It has to be before the soft deadline and, as each iteration
+        # takes longer than the last, the next one has to be expected to finish before the hard deadline
+        now = time.perf_counter()
+
+        return now < self.softDeadline and now + lastIterationSeconds * BRANCHING_ESTIMATE < self.hardDeadline
@@ -0,0 +1,185 @@
+from array import array
+from multiprocessing import shared_memory
+
+# A fixed size transposition table that remembers the results of positions the search has already looked at.
+# The entries are kept in preallocated typed arrays (one array per field) instead of a dictionary of objects so the memory
+# used is set by the size given and doesn't grow during a search
+
+# The bound types say how the stored score relates to the real score of the position
+EXACT = 0 # The score is exact
+LOWER = 1 # The search failed high so the real score is at least the stored score
+UPPER = 2 # The search failed low so the real score is at most the stored score
+
+# The bytes one entry uses: the key (8), score (8), move (2), depth (1), bound (1) and search generation (1)
+ENTRY_SIZE = 21
+BUCKET_SIZE = 2 # Each bucket has a depth-preferred slot followed by an always-replace slot
+
+def BucketCount(sizeMB):
+    # Works out the largest power of two number of buckets that fits in the size so a bucket can be found with a mask
+    buckets = 1
+    while buckets * 2 * BUCKET_SIZE * ENTRY_SIZE <= sizeMB * 1024 * 1024:
+        buckets *= 2
+
+    return buckets
+
+class TranspositionTable:
+    def __init__(self, sizeMB=16):
+        buckets = BucketCount(sizeMB)
+        self.sizeMB = sizeMB
+        self.bucketMask = buckets - 1
+        self.entries = buckets * BUCKET_SIZE
+        self.ClearStats()
+        self.Clear()
+
+    def Clear(self):
+        # Allocates every array at its full size straight away so the memory used never changes afterwards
+        self.keys = array('Q', [0]) * self.entries
+        self.scores = array('d', [0.0]) * self.entries
+        self.moves = array('H', [0]) * self.entries
+        self.depths = array('b', [-1]) * self.entries # A depth of -1 marks an empty slot
+        self.bounds = array('B', [0]) * self.entries
+        self.generations = array('B', [0]) * self.entries
+        self.generation = 0 # Increased at the start of every search so entries from older searches can be replaced first
+
+    def ClearStats(self):
+        # The probes, hits and stores are counted again for every search so the hit rate is for the last search only
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def NewSearch(self):
+        self.generation = (self.generation + 1) % 256
+        self.ClearStats()
+
+    def Probe(self, key):
+        # Returns the depth, score, bound and move stored for the position (None if the position isn't in the table)
+        self.probes += 1
+        index = (key & self.bucketMask) * BUCKET_SIZE
+
+        # Looks in both slots of the bucket for the key
+        for slot in range(index, index + BUCKET_SIZE):
+            if self.StoredKey(slot) == key and self.depths[slot] >= 0:
+                self.hits += 1
+                return self.depths[slot], self.scores[slot], self.bounds[slot], self.moves[slot]
+
+        return None
+
+    def Store(self, key, depth, score, bound, move):
+        self.stores += 1
+        index = (key & self.bucketMask) * BUCKET_SIZE
+
+        # The depth-preferred slot is only replaced by a result searched at least as deep, a result for the same position,
+        # or anything once its entry is from an older search. Everything else goes into the always-replace slot
+        if self.StoredKey(index) == key or depth >= self.depths[index] or self.generations[index] != self.generation:
+            slot = index
+        else:
+            slot = index + 1
+
+        # Keeps the best move already stored for the position if the new result doesn't have one
+        if move == 0 and self.StoredKey(slot) == key:
+            move = self.moves[slot]
+
+        self.depths[slot] = min(depth, 127)
+        self.scores[slot] = score
+        self.bounds[slot] = bound
+        self.moves[slot] = move
+        self.generations[slot] = self.generation
+        self.keys[slot] = self.LockKey(key, slot) # The key is written last so a half written entry never matches
+
+    def StoredKey(self, slot):
+        return self.keys[slot]
+
+    def LockKey(self, key, slot):
+        return key
+
+    def HashFull(self):
+        # The number of slots out of every 1000 holding an entry from the current search (sampled from the first 1000 slots)
+        sample = min(1000, self.entries)
+        used = 0
+
+        for slot in range(sample):
+            if self.depths[slot] >= 0 and self.generations[slot] == self.generation:
+                used += 1
+
+        return used * 1000 // sample
+
+    def HitRate(self):
+        if self.probes == 0:
+            return 0
+
+        return self.hits / self.probes
+
+class SharedTranspositionTable(TranspositionTable):
+    # A transposition table kept in shared memory so searches in several processes can use the same entries. The table is
+    # created by the main search and attached to by name in the helper processes (pickling it only sends the name).
+    # Processes write entries without locking, so the key is stored XORed with the rest of the entry and an entry that
+    # was half written by one process while another read it no longer matches its key and is ignored
+    def __init__(self, sizeMB=16, name=None):
+        self.owner = name == None # Only the process that created the memory clears it, starts new searches and frees it
+        self.entries = BucketCount(sizeMB) * BUCKET_SIZE
+        size = self.entries * ENTRY_SIZE + 1 # The last byte holds the search generation so every process uses the same one
+
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+
+        # Lays the fields out one after another in the memory, with the 8 byte fields first so they stay aligned
+        entries = self.entries
+        buffer = self.memory.buf
+        self.keys = buffer[0:entries * 8].cast('Q')
+        self.scores = buffer[entries * 8:entries * 16].cast('d')
+        self.scoreBits = buffer[entries * 8:entries * 16].cast('Q') # The same scores read as whole numbers for the XOR
+        self.moves = buffer[entries * 16:entries * 18].cast('H')
+        self.depths = buffer[entries * 18:entries * 19].cast('b')
+        self.bounds = buffer[entries * 19:entries * 20].cast('B')
+        self.generations = buffer[entries * 20:entries * 21].cast('B')
+        self.sharedGeneration = buffer[entries * 21:entries * 21 + 1]
+
+        super().__init__(sizeMB)
+
+    def __getstate__(self):
+        return {'sizeMB': self.sizeMB, 'name': self.memory.name}
+
+    def __setstate__(self, state):
+        self.__init__(state['sizeMB'], state['name'])
+
+    def Clear(self):
+        # Empties the table in place, as the memory is shared it can't be replaced with new arrays
+        if self.owner:
+            self.keys[:] = array('Q', [0]) * self.entries
+            self.moves[:] = array('H', [0]) * self.entries
+            self.depths[:] = array('b', [-1]) * self.entries
+            self.sharedGeneration[0] = 0
+        self.generation = self.sharedGeneration[0]
+
+    def NewSearch(self):
+        if self.owner:
+            self.sharedGeneration[0] = (self.sharedGeneration[0] + 1) % 256
+        self.generation = self.sharedGeneration[0]
+        self.ClearStats() # Each process counts its own probes
+
+    def Store(self, key, depth, score, bound, move):
+        # Follows the generation of the table's owner, which may have started a new search since this process last looked
+        self.generation = self.sharedGeneration[0]
+        super().Store(key, depth, score, bound, move)
+
+    def EntryCheck(self, slot):
+        # Combines every field of the entry apart from the key into one number
+        return self.scoreBits[slot] ^ self.moves[slot] ^ ((self.depths[slot] & 255) << 16) ^ (self.bounds[slot] << 24)
+
+    def StoredKey(self, slot):
+        return self.keys[slot] ^ self.EntryCheck(slot)
+
+    def LockKey(self, key, slot):
+        return key ^ self.EntryCheck(slot)
+
+    def Close(self):
+        # The views into the memory have to be released before the memory can be closed
+        for view in (self.keys, self.scores, self.scoreBits, self.moves, self.depths, self.bounds, self.generations,
+                     self.sharedGeneration):
+            view.release()
+        self.memory.close()
+
+        if self.owner:
+            self.memory.unlink()
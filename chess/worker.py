@@ -0,0 +1,265 @@
+import argparse
+import atexit
+import multiprocessing
+import queue
+import time
+from . import AI
+from . import engine
+from .AI import EasyMode, MediumMode, ClockMode, SearchMode, CloseParallelSearch
+from .Board import Board
+from .timemanager import TimeManager, BRANCHING_ESTIMATE
+from .parallel import ClosePools
+
+# Runs the AI in a separate process so the game window keeps drawing, the clocks keep ticking and the buttons keep working
+# while it thinks. A process is used instead of a thread because only one thread can run Python code at a time, so a
+# searching thread would still slow the window down. The game sends requests down one queue and polls another for the moves.
+# With pondering on, the worker carries on searching on white's time, assuming white plays the reply it expects.
+# Usage: python -m chess.worker --seconds 60 (checks that a ponder hit is answered faster than a miss)
+
+PONDER_WAIT = 0.01 # How many seconds the worker sleeps between checks for white's move once its ponder search has finished
+CHECK_FEN = 'r2q1rk1/ppp2ppp/2np1n2/2b1p1B1/2B1P1b1/2NP1N2/PPP2PPP/R2Q1RK1 b - - 0 8'
+
+class CancelSignal:
+    # Tells the search in the worker that its request has been cancelled, using the id of the last request cancelled
+    def __init__(self, cancelledId, requestId):
+        self.cancelledId = cancelledId
+        self.requestId = requestId
+
+    def is_set(self):
+        return self.cancelledId.value >= self.requestId
+
+class PonderClock(CancelSignal):
+    # The time manager and stop signal of a search made while white is thinking. It has no deadlines until white plays the
+    # expected reply (a ponder hit), when the game fills in the soft and hard limits for the move. The deadlines are counted
+    # from when pondering started, as if the move had been asked for then, so the time already spent pondering counts
+    # towards the move and a search that has already used its time answers straight away
+    hardDeadline = None
+
+    def __init__(self, cancelledId, requestId, ponderLimits):
+        super().__init__(cancelledId, requestId)
+        self.ponderLimits = ponderLimits
+        self.startTime = time.time()
+        self.iterationStart = None # When the iteration being searched started (None during the first iteration)
+        self.iterationEnd = None # When the iteration being searched is expected to finish
+
+    def Hit(self):
+        return self.ponderLimits[1] != 0
+
+    def StartIteration(self, lastIterationSeconds):
+        # Keeps deepening until the hit, then stops starting iterations like the normal time manager does
+        now = time.time()
+        self.iterationStart = now
+        self.iterationEnd = now + lastIterationSeconds * BRANCHING_ESTIMATE
+
+        if not self.Hit():
+            return True
+
+        return self.WouldStart()
+
+    def WouldStart(self):
+        # Checks if the normal time manager would have started the iteration being searched had the move been asked for
+        # when pondering started. The first iteration is always searched
+        if self.iterationStart == None:
+            return True
+
+        return self.iterationStart < self.startTime + self.ponderLimits[0]\
+        and self.iterationEnd < self.startTime + self.ponderLimits[1]
+
+    def is_set(self):
+        # After a hit the search stops at the hard deadline, or straight away if it is in an iteration that was started
+        # while pondering but wouldn't have been started with the time for the move, keeping the last finished iteration
+        if super().is_set():
+            return True
+        if not self.Hit():
+            return False
+
+        return time.time() >= self.startTime + self.ponderLimits[1] or not self.WouldStart()
+
+def Respond(responses, requestId, board, result, expectedReply):
+    # Sends back the move that was played on the worker's copy of the board with the record for the move history, the
+    # reply the worker is going to ponder on (None if it isn't pondering) and the stats of the search that chose the move
+    if result != None:
+        responses.put((requestId, board.history[-1].move, result[1], expectedReply, AI.lastStats))
+    else:
+        responses.put((requestId, None, None, None, None))
+
+def WorkerLoop(requests, responses, cancelledId, ponderLimits):
+    # Waits for boards to find moves for until it is sent None
+    while True:
+        request = requests.get()
+        if request == None:
+            CloseParallelSearch() # Stops the search's helper processes before the worker exits
+            ClosePools() # And the processes the medium and hard difficulties evaluate their moves with
+            break
+
+        requestId, board, difficulty, timeManager, ponder = request
+        signal = CancelSignal(cancelledId, requestId)
+
+        # Checks if the request was cancelled before the worker got to it so no time is wasted on it
+        if signal.is_set():
+            Respond(responses, requestId, board, None, None)
+            continue
+
+        AI.lastStats = None # Only the difficulties that keep stats set them, so the last move's stats aren't sent again
+        if difficulty == 'Easy':
+            result = EasyMode(board, None)
+        elif difficulty == 'Medium':
+            result = MediumMode(board, None)
+        else:
+            result = ClockMode(board, None, difficulty, timeManager, signal)
+
+        while True:
+            # Checks if the search predicted white's reply so it can think about its next move while white thinks
+            expectedReply = AI.expectedReply if ponder and result != None else None
+            if expectedReply != None:
+                ponderLimits[0] = ponderLimits[1] = 0 # Cleared before responding so the game can't hit too early
+
+            Respond(responses, requestId, board, result, expectedReply)
+            if expectedReply == None or signal.is_set():
+                break
+
+            # Searches the position after the expected reply until white moves. On a hit the same search carries on with
+            # the time for the move, keeping the iterations it has finished and everything it stored in the table
+            board.MakeMove(expectedReply)
+            clock = PonderClock(cancelledId, requestId, ponderLimits)
+            result = SearchMode(board, None, timeManager=clock, stopSignal=clock)
+
+            # Waits for white to move if the search reached its maximum depth first
+            while not clock.Hit() and not signal.is_set():
+                time.sleep(PONDER_WAIT)
+
+            # Checks if white played something else (or the move was taken back) so the ponder result is thrown away
+            if signal.is_set():
+                break
+
+class AIWorker:
+    def __init__(self):
+        # Spawning starts the worker without a copy of the game window, which works the same on every operating system
+        context = multiprocessing.get_context('spawn')
+        self.requests = context.Queue()
+        self.responses = context.Queue()
+        self.cancelledId = context.Value('i', 0) # Shared with the worker so it can see a cancel while it is searching
+        self.ponderLimits = context.Array('d', 2) # The soft and hard limits given to the ponder search on a hit
+        self.requestId = 0
+        self.waiting = False # Whether a move has been asked for and hasn't arrived yet
+        self.expectedReply = None # The white move the worker is pondering on (None if it isn't pondering)
+        self.stats = None # The stats the worker sent back with its last move (see Search.Stats and AI.lastStats)
+        # The worker isn't a daemon process because the search starts helper processes of its own, which daemon processes
+        # can't do, so it is closed when the game exits instead of being ended automatically
+        self.process = context.Process(target=WorkerLoop, args=(self.requests, self.responses, self.cancelledId,
+                                                                self.ponderLimits))
+        self.process.start()
+        atexit.register(self.Close)
+
+    def Request(self, board, difficulty, timeManager=None, ponder=False):
+        # Asks the worker for a move on a copy of the board (the board is pickled so the game's board isn't touched).
+        # Anything the worker is still pondering on is cancelled first as white didn't play the reply it expected
+        self.Cancel()
+        self.requestId += 1
+        self.waiting = True
+        self.requests.put((self.requestId, board, difficulty, timeManager, ponder))
+
+    def PonderHit(self, timeManager):
+        # White played the reply the worker has been pondering on, so its search is given the time for the move and its
+        # answer is waited for like a normal request
+        self.ponderLimits[0] = timeManager.softLimit
+        self.ponderLimits[1] = timeManager.hardLimit # Set last because a hard limit marks the hit
+        self.expectedReply = None
+        self.waiting = True
+
+    def Poll(self):
+        # Returns the move and its record once the worker has found it without waiting for it (None if it isn't ready)
+        while self.waiting:
+            try:
+                requestId, move, record, expectedReply, stats = self.responses.get_nowait()
+            except queue.Empty:
+                return None
+
+            # Checks if the response is for the latest request, as answers to cancelled requests are thrown away
+            if requestId == self.requestId:
+                self.waiting = False
+                self.expectedReply = expectedReply
+                self.stats = stats
+                if move != None:
+                    return move, record
+
+        return None
+
+    def Cancel(self):
+        # Stops the worker's current search (it checks every so many nodes) and ignores whatever it sends back
+        self.cancelledId.value = self.requestId
+        self.waiting = False
+        self.expectedReply = None
+
+    def Close(self):
+        atexit.unregister(self.Close)
+
+        # Checks if the worker has already been closed
+        if not self.process.is_alive():
+            return
+
+        self.Cancel()
+        self.requests.put(None)
+        self.process.join(2)
+
+        # Checks if the worker didn't stop in time (e.g. it was in the middle of a slow move) and ends it if so
+        if self.process.is_alive():
+            self.process.terminate()
+
+def WaitForMove(worker):
+    # Waits for the worker's move the same way the game does and returns it with the seconds it took
+    start = time.perf_counter()
+    result = worker.Poll()
+
+    while result == None:
+        time.sleep(PONDER_WAIT)
+        result = worker.Poll()
+
+    return result, time.perf_counter() - start
+
+def PonderCheck(fen, seconds, whiteThinks):
+    # Times the AI's answer after white plays the reply it pondered on (a hit) and after white plays a different reply
+    # (a miss), with the same time left on the clock both times
+    worker = AIWorker()
+    board = Board()
+    board.LoadFen(fen)
+
+    # Gets the AI's move and the reply it is going to ponder on
+    worker.Request(board, 'Expert', TimeManager(seconds), ponder=True)
+    (move, record), moveSeconds = WaitForMove(worker)
+    expectedReply = worker.expectedReply
+    if expectedReply == None:
+        print('The search did not predict a reply to ponder on')
+        worker.Close()
+        return False
+    board.MakeMove(move)
+
+    # A hit: white plays the expected reply after thinking for a while
+    undo = board.MakeMove(expectedReply)
+    time.sleep(whiteThinks)
+    worker.PonderHit(TimeManager(seconds))
+    hitMove, hitSeconds = WaitForMove(worker)
+    board.UnmakeMove(undo)
+
+    # A miss: white plays a different reply so the worker has to start a new search
+    otherReply = next(reply for reply in engine.LegalMoves(board, 'White') if reply != expectedReply)
+    board.MakeMove(otherReply)
+    worker.Request(board, 'Expert', TimeManager(seconds))
+    missMove, missSeconds = WaitForMove(worker)
+    worker.Close()
+
+    print(f'ponder hit {hitSeconds:.2f}s  ponder miss {missSeconds:.2f}s  {"faster" if hitSeconds < missSeconds else "NOT FASTER"}')
+
+    return hitSeconds < missSeconds
+
+def main():
+    parser = argparse.ArgumentParser(description='Checks that the AI answers a ponder hit faster than a ponder miss')
+    parser.add_argument('--fen', default=CHECK_FEN, help='the position the AI moves in (black to move, defaults to a middlegame)')
+    parser.add_argument('--seconds', type=float, default=60, help='the time left on the AI\'s clock')
+    parser.add_argument('--white-thinks', type=float, default=1, help='the seconds white thinks for before playing its reply')
+    arguments = parser.parse_args()
+
+    return 0 if PonderCheck(arguments.fen, arguments.seconds, arguments.white_thinks) else 1
+
+if __name__ == '__main__':
+    raise SystemExit(main())
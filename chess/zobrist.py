@@ -0,0 +1,37 @@
+import random
+
+# Zobrist hashing gives every position a 64-bit key made by XORing together a random number for each thing in the position.
+# Because XOR undoes itself, a move only has to XOR out what it removes and XOR in what it adds to keep the key up to date
+
+# A fixed seed means the same position always gets the same key, even between runs of the game
+generator = random.Random(20240501)
+
+def RandomKey():
+    return generator.getrandbits(64)
+
+PIECE_KEYS = [[RandomKey() for square in range(64)] for index in range(12)] # One key for each piece bitboard index on each square
+SIDE_KEY = RandomKey() # XORed in when black is to move
+CASTLING_KEYS = [RandomKey() for rights in range(16)] # One key for every combination of the four castling rights
+EN_PASSANT_KEYS = [RandomKey() for column in range(8)] # One key for the column of the enPassant square
+
+def StateKey(sideToMove, castlingRights, enPassantSquare):
+    # The part of the key that comes from whose turn it is, the castling rights and the enPassant square
+    key = CASTLING_KEYS[castlingRights]
+
+    if sideToMove == 'Black':
+        key ^= SIDE_KEY
+
+    if enPassantSquare != None:
+        key ^= EN_PASSANT_KEYS[enPassantSquare % 8]
+
+    return key
+
+def ComputeHash(position):
+    # Builds the key of a position from scratch, which the incrementally updated key should always be equal to
+    key = StateKey(position.sideToMove, position.castlingRights, position.enPassantSquare)
+
+    for square, index in enumerate(position.mailbox):
+        if index != None:
+            key ^= PIECE_KEYS[index][square]
+
+    return key
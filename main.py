@@ -6,31 +6,36 @@ from chess.Button import Button
 from chess.Constants import SQUARE_HEIGHT, SQUARE_WIDTH, GREEN, BLUE, BROWN, WHITE, BLACK, GREY
 from chess.GameManager import Game
 from chess.Board import Board
-from chess.AI import EasyMode, MediumMode, HardMode
+from chess.worker import AIWorker
+from chess.timemanager import TimeManager
 
-pygame.init() # Initialises all pygame's modules (i.e graphics, sound, etc.)
-pygame.mixer.init() # Initialises pygame's sound module
-
-gameWindow = pygame.display.set_mode((1000, 800))
-gameIcon = pygame.image.load('images/king.png')
-pygame.display.set_icon(gameIcon)
-clock = pygame.time.Clock()
 fps = 60
+TIME_INCREMENT = 0 # The seconds added to a player's clock after each move (the timers have no increment)
+
+# The AI worker process imports this file when it starts, so the window, fonts and sounds are only created when the game is run
+if __name__ == '__main__':
+    pygame.init() # Initialises all pygame's modules (i.e graphics, sound, etc.)
+    pygame.mixer.init() # Initialises pygame's sound module
+
+    gameWindow = pygame.display.set_mode((1000, 800))
+    gameIcon = pygame.image.load('images/king.png')
+    pygame.display.set_icon(gameIcon)
+    clock = pygame.time.Clock()
 
-pygame.display.set_caption('Chess')
+    pygame.display.set_caption('Chess')
 
-mainText = pygame.font.SysFont('Arial', 120, bold=True) # Text used for all other menu headings
-diffText = pygame.font.SysFont('Arial', 100, bold=True) # Text used for the difficulty menu heading
-subText = pygame.font.SysFont('Arial', 50) # Text used for menu sub-headings
-game = Game(gameWindow) # Holds an instance of the game class
-board = Board() # Holds an instance of the board class
+    mainText = pygame.font.SysFont('Arial', 120, bold=True) # Text used for all other menu headings
+    diffText = pygame.font.SysFont('Arial', 100, bold=True) # Text used for the difficulty menu heading
+    subText = pygame.font.SysFont('Arial', 50) # Text used for menu sub-headings
+    game = Game(gameWindow) # Holds an instance of the game class
+    board = Board() # Holds an instance of the board class
 
-# Loads all the sounds 
-checkSFX = pygame.mixer.Sound('Sounds/Check sound.mp3') # Sound for checks
-whiteMoveSFX = pygame.mixer.Sound('Sounds/Player Move.mp3') # Sound for white making a move
-blackMoveSFX = pygame.mixer.Sound('Sounds/Opp Move.mp3') # Sound for black making a move
-gameEndSFX = pygame.mixer.Sound('Sounds/Game end.mp3') # Sound for when the game ends
-lowTimeSFX = pygame.mixer.Sound('Sounds/Timer Sound.mp3') # Sound for when a player has less than 10 seconds
+    # Loads all the sounds 
+    checkSFX = pygame.mixer.Sound('Sounds/Check sound.mp3') # Sound for checks
+    whiteMoveSFX = pygame.mixer.Sound('Sounds/Player Move.mp3') # Sound for white making a move
+    blackMoveSFX = pygame.mixer.Sound('Sounds/Opp Move.mp3') # Sound for black making a move
+    gameEndSFX = pygame.mixer.Sound('Sounds/Game end.mp3') # Sound for when the game ends
+    lowTimeSFX = pygame.mixer.Sound('Sounds/Timer Sound.mp3') # Sound for when a player has less than 10 seconds
 
 #Function that first converts the text into an image in order to allow it to be displayed on the screen
 def DisplayText(text, font, colour, x, y):
@@ -43,7 +48,7 @@ def SelectedRowColumn(mousePosition):
     column = x // SQUARE_HEIGHT # Determines the column by performing the correct division with the x coordinate
     return row, column
 
-def Play(timer, boardColour, sound, difficulty):
+def Play(timer, boardColour, sound, difficulty, ponder):
     targetMenu = None # Variable to keep track of which menu to go to
     running = True
     checkSFXPlayed = False # Flag to track if the check sound effect has been played
@@ -63,13 +68,15 @@ def Play(timer, boardColour, sound, difficulty):
     AIMOVEMENT = pygame.USEREVENT + 1 # Creates a custom event for the AI moving
     TURNSWITCH = pygame.USEREVENT + 2 # Creates a custom event for the turns to switch after the AI makes a move.
 
-    moves = [deepcopy(board)] # Stores the copy of the original board state so it can't be changed
     count = 1 # Variable to track the number of times the takeback button has been clicked
  
+    aiWorker = None # The process the AI thinks in so the window keeps updating while it searches
+
     # Checks if the AI was selected to play so it doesn't display the button if play human was selected.
     if difficulty != None:
         takeBackImage = pygame.image.load('images/Takeback.png')
         takeBackButton = Button(10, 700, takeBackImage, 1.2) # Displays the takeBackButton at its correct position
+        aiWorker = AIWorker() # Started now so it is ready by the time white has made the first move
 
     while running:
         # Checks if the black king has been checkmated
@@ -182,8 +189,8 @@ def Play(timer, boardColour, sound, difficulty):
             if event.type == pygame.QUIT:
                 running = False # Exits the game loop
 
-            # Checks if the mouse has been left clicked
-            if event.type == pygame.MOUSEBUTTONDOWN and pygame.mouse.get_pressed()[0] == 1:
+            # Checks if the mouse has been left clicked, ignoring clicks on the board while the AI is thinking about its move
+            if event.type == pygame.MOUSEBUTTONDOWN and pygame.mouse.get_pressed()[0] == 1 and (difficulty == None or game.turn == 'White'):
                 mousePosition = pygame.mouse.get_pos() # Gets the current position of the mouse
                 row, column = SelectedRowColumn(mousePosition) # Gets the row and column from the mouse's current position
                 game.SelectSquare(row, column) # Calls the SelectSquare method to allow for piece selection and movement
@@ -200,30 +207,37 @@ def Play(timer, boardColour, sound, difficulty):
 
             # Checks if the event for the AI to move has been triggered
             if event.type == AIMOVEMENT:
-                # Checks if it's black's turn
-                if game.turn == 'Black':
-                    if difficulty == 'Easy':
-                        newBoard = EasyMode(game.GetBoard(), game) # Passes the board object and game class the AI easy mode function would use
-                    elif difficulty == 'Medium':
-                        newBoard = MediumMode(game.GetBoard(), game) # Passes the board object and game class the AI medium mode function would use
-                    # Checks if the selected difficulty was hard and the AI has more than 10 seconds left
-                    elif difficulty == 'Hard' and blackSeconds >= 10:
-                        newBoard = HardMode(game.GetBoard(), game) # Passes the board object and game class the AI hard move function would use
-                    # Checks if the selected difficulty was hard and the AI has less than 10 seconds left
-                    elif difficulty == 'Hard' and blackSeconds < 10:
-                        newBoard = EasyMode(game.GetBoard(), game) # Uses the easy mode function so it plays moves a lot faster
-
-                    game.AIBoard(newBoard[0]) # Performs the visual movement as self.board is reassigned to the new board state
-                    game.moveHistory.append(newBoard[1]) # Adds the associated move played to reach the new board state to the moveHistory list
-                    moves.append(deepcopy(newBoard[0])) # Adds the copied board state after the AI has played its move to the moves list
-
-                    pygame.event.post(pygame.event.Event(TURNSWITCH)) # Posts the turn switch event after the AI makes its move
+                # Checks if it's black's turn and the AI isn't already thinking about its move
+                if game.turn == 'Black' and not aiWorker.waiting:
+                    timeManager = None
+                    # Checks if the selected difficulty was hard or expert so the time the AI spends is managed from its clock
+                    if difficulty == 'Hard' or difficulty == 'Expert':
+                        # Works out how long black can spend on this move from its time left and how many moves have been played
+                        timeManager = TimeManager(blackSeconds, TIME_INCREMENT, len(game.moveHistory) // 2 + 1)
+
+                    # Checks if white played the reply the AI has been pondering on so it carries on with the search it has
+                    # already started instead of starting again
+                    if aiWorker.expectedReply != None and timeManager != None and game.board.history and game.board.history[-1].move == aiWorker.expectedReply:
+                        aiWorker.PonderHit(timeManager)
+                    else:
+                        # Sends a copy of the board to the AI worker, the move is picked up below once it has been found
+                        aiWorker.Request(game.GetBoard(), difficulty, timeManager, ponder == 'On')
 
             # Checks if the custom event TURNSWITCH has been triggered
             if event.type == TURNSWITCH:
                 game.turn = 'White' # Switches the turns back to white so this way the AI isn't using my time
                 eventScheduled = False # Sets to false so it can allow the AI to makes its move again once it is its turn
 
+        # Checks if the AI worker has found its move without waiting for it so the window keeps updating while it thinks
+        if difficulty != None and aiWorker.waiting:
+            result = aiWorker.Poll()
+            if result != None:
+                move, record = result
+                game.GetBoard().MakeMove(move) # Plays the AI's move on the board shown on screen
+                game.moveHistory.append(record) # Adds the associated move played to reach the new board state to the moveHistory list
+
+                pygame.event.post(pygame.event.Event(TURNSWITCH)) # Posts the turn switch event after the AI makes its move
+
         # Checks if its the AI's turn and it hasn't made a move yet
         if game.turn == 'Black' and difficulty != None and not eventScheduled:
             pygame.time.set_timer(AIMOVEMENT, 500, True) # Triggers the event to make the AI move but delays it by 500 ms (0.5 seconds)
@@ -232,14 +246,24 @@ def Play(timer, boardColour, sound, difficulty):
         # Checks if the AI was selected to play and the takeback has been clicked 3 times or less
         if difficulty != None and takeBackButton.Clicked(gameWindow) and count <= 3:
             count += 1
-            # Checks if the list that stores all played moves has more than 1 left to prevent popping the original board state. 
-            if len(moves) > 1:
-                moves.pop() # Removes the previously added move
-            previousBoard = moves[-1] # Stores the last board state after the previous one has been removed
-            game.AIBoard(deepcopy(previousBoard)) # Reassigns self.board so it now holds copy of previous board state which is displayed
-            # Removes the moves played by white and black once takeback is clicked so the moveHistory reflects the current board state
-            game.moveHistory.pop() # Removes black's move
-            game.moveHistory.pop() # Removes white's move
+            movesToTakeBack = 2
+            aiWorker.Cancel() # Stops the AI thinking about its move or pondering on white's reply as the position is changing
+
+            # Checks if the AI hasn't replied yet so only white's last move is taken back and the AI stops thinking about it
+            if game.turn == 'Black':
+                pygame.time.set_timer(AIMOVEMENT, 0) # Cancels the AI move event in case it hasn't been triggered yet
+                eventScheduled = False
+                game.turn = 'White'
+                movesToTakeBack = 1
+
+            # Takes back black's move and then white's move using the undo records the board stored when the moves were made
+            for _ in range(movesToTakeBack):
+                # Checks if there is still a move to take back to prevent going past the original board state
+                if game.board.history:
+                    game.board.UnmakeMove(game.board.history[-1])
+                # Removes the moves played by white and black once takeback is clicked so the moveHistory reflects the current board state
+                if game.moveHistory:
+                    game.moveHistory.pop()
 
         # Draws the rectangles on which the timers would appear
         pygame.draw.rect(gameWindow, WHITE, (1, 375, 98, 50))
@@ -267,26 +291,30 @@ def Play(timer, boardColour, sound, difficulty):
         game.UpdateScreen(boardColour) # Calls Update Screen with a board Colour parameter so the correct board theme is rendered
         clock.tick(fps)
 
+    # Stops the AI worker, including any search it is in the middle of, now that the game is over
+    if aiWorker != None:
+        aiWorker.Close()
+
     # Directs the players to the correct end screens depending on how the game ended
     if targetMenu == 'White Checkmates':
-        EndScreen('Win', 'Checkmate', timer, sound, difficulty, boardColour, 'White')
+        EndScreen('Win', 'Checkmate', timer, sound, difficulty, boardColour, ponder, 'White')
     elif targetMenu == 'Black Checkmates':
         # Checks if the the player was playing the AI and the AI checkmated them
         if difficulty != None: 
             time.sleep(2) # Delays the end screen from loading in for 2 seconds to give the players enough time to see the checkmating move
-        EndScreen('Win', 'Checkmate', timer, sound, difficulty, boardColour, 'Black')
+        EndScreen('Win', 'Checkmate', timer, sound, difficulty, boardColour, ponder, 'Black')
     elif targetMenu == 'Stalemate':
-        EndScreen('Draw', 'Stalemate', timer, sound, difficulty, boardColour)
+        EndScreen('Draw', 'Stalemate', timer, sound, difficulty, boardColour, ponder)
     elif targetMenu == 'Insufficient Material':
-        EndScreen('Draw', 'Insufficient Material', timer, sound, difficulty, boardColour)
+        EndScreen('Draw', 'Insufficient Material', timer, sound, difficulty, boardColour, ponder)
     elif targetMenu == 'Timeout vs Insufficient Material':
-        EndScreen('Draw', 'Timeout vs Insufficient Material', timer, sound, difficulty, boardColour)
+        EndScreen('Draw', 'Timeout vs Insufficient Material', timer, sound, difficulty, boardColour, ponder)
     elif targetMenu == 'White Timeout':
-        EndScreen('Win', 'Timeout', timer, sound, difficulty, boardColour, 'Black')
+        EndScreen('Win', 'Timeout', timer, sound, difficulty, boardColour, ponder, 'Black')
     elif targetMenu == 'Black Timeout':
-        EndScreen('Win', 'Timeout', timer, sound, difficulty, boardColour, 'White')
+        EndScreen('Win', 'Timeout', timer, sound, difficulty, boardColour, ponder, 'White')
         
-def EndScreen(outcome, method, timer, sound, difficulty, boardColour, pieceColour=None):
+def EndScreen(outcome, method, timer, sound, difficulty, boardColour, ponder, pieceColour=None):
     targetMenu = None # Variable to keep track of which menu to go to
     colourMapping = {'White': WHITE, 'Black': BLACK} # Maps the piece colour to a colour constant
 
@@ -367,13 +395,13 @@ def EndScreen(outcome, method, timer, sound, difficulty, boardColour, pieceColou
     
     # Directs the player to the main game screen
     elif targetMenu == 'Play':
-        Play(timer, boardColour, sound, difficulty)
+        Play(timer, boardColour, sound, difficulty, ponder)
 
-def DifficultySelection(boardColour, sound):
+def DifficultySelection(boardColour, sound, ponder):
     targetMenu = None # Variable to keep track of which menu to go to
     bgImage = pygame.image.load('images/Difficulty.png')
     gameWindow.blit(pygame.transform.scale(bgImage, (1000, 800)), (0, 0))
-    easy, medium, hard, back = False, False, False, False # Flags to set the selected diffculty or back button
+    easy, medium, hard, expert, back = False, False, False, False, False # Flags to set the selected diffculty or back button
 
     # Displays the menu title
     DisplayText('SELECT DIFFICULTY', diffText, (241, 249, 26), 110, 10)
@@ -384,17 +412,24 @@ def DifficultySelection(boardColour, sound):
     easyImage = pygame.image.load('images/Easy.png')
     mediumImage = pygame.image.load('images/Medium.png')
     hardImage = pygame.image.load('images/Hard.png')
+    # There is no image for the expert button so its text is rendered onto a surface the same size as the other buttons
+    expertImage = pygame.Surface((151, 84))
+    expertImage.fill(GREY)
+    expertText = pygame.font.SysFont('Arial', 40, bold=True).render('EXPERT', True, WHITE)
+    expertImage.blit(expertText, expertText.get_rect(center=(75, 42)))
 
     # Initialises the buttons using an instance of the button class
     backButton = Button(10, 30, backImage, 0.2)
     easyButton = Button(80, 300, easyImage, 1.5)
     mediumButton = Button(380, 300, mediumImage, 1.5)
     hardButton = Button(680, 300, hardImage, 1.5)
+    expertButton = Button(380, 500, expertImage, 1.5)
 
     # Sets the border width, height and top left coordinates
     easyBorder = pygame.Rect(80, 300, 226.5, 127.5)
     mediumBorder = pygame.Rect(380, 300, 229.5, 126)
     hardBorder = pygame.Rect(680, 300, 232.5, 126)
+    expertBorder = pygame.Rect(380, 500, 226.5, 126)
     backBorder = pygame.Rect(10, 30, 73, 42.8)
 
     run = True
@@ -402,19 +437,23 @@ def DifficultySelection(boardColour, sound):
     while run:
         # Checks if the back button is clicked
         if backButton.Clicked(gameWindow):
-            easy, medium, hard, back = False, False, False, True # Sets the back button flag to true
+            easy, medium, hard, expert, back = False, False, False, False, True # Sets the back button flag to true
 
         # Checks if the easy button is clicked
         if easyButton.Clicked(gameWindow):
-            easy, medium, hard, back = True, False, False, False # Sets the easy button flag to true 
+            easy, medium, hard, expert, back = True, False, False, False, False # Sets the easy button flag to true 
 
         # Checks if the medium button is clicked
         if mediumButton.Clicked(gameWindow):
-            easy, medium, hard, back = False, True, False, False # Sets the medium button flag to true
+            easy, medium, hard, expert, back = False, True, False, False, False # Sets the medium button flag to true
 
         # Checks if the hard button is clicked
         if hardButton.Clicked(gameWindow):
-            easy, medium, hard, back = False, False, True, False # Sets the hard button flag to true
+            easy, medium, hard, expert, back = False, False, True, False, False # Sets the hard button flag to true
+
+        # Checks if the expert button is clicked
+        if expertButton.Clicked(gameWindow):
+            easy, medium, hard, expert, back = False, False, False, True, False # Sets the expert button flag to true
 
         # Checks if the back button flag is true to indicate that the back button has been selected
         if back:
@@ -457,6 +496,16 @@ def DifficultySelection(boardColour, sound):
                 targetMenu = 'Hard'
                 run = False
 
+        # Checks if the expert button flag is true to indicate that the expert button has been selected
+        elif expert:
+            # Draws the yellow rectangle border around the expert button
+            pygame.draw.rect(gameWindow, (241, 249, 26), expertBorder, 4)
+            confirmButton = Button(700, 700, confirmImage, 0.5)
+            # Checks if the confirm button is clicked
+            if confirmButton.Clicked(gameWindow):
+                targetMenu = 'Expert'
+                run = False
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 run = False
@@ -466,11 +515,11 @@ def DifficultySelection(boardColour, sound):
 
     # Responsible for directing the players to the correct menus
     if targetMenu == 'Game Mode':
-        GameMode(boardColour, sound)
+        GameMode(boardColour, sound, ponder)
     else:
-        TimerSelection(boardColour, sound, targetMenu) # The target menu indicates the difficulty
+        TimerSelection(boardColour, sound, ponder, targetMenu) # The target menu indicates the difficulty
     
-def TimerSelection(boardColour, sound, difficulty=None):
+def TimerSelection(boardColour, sound, ponder, difficulty=None):
     targetMenu = None # Variable to keep track of which menu to go to
     bgImage = pygame.image.load('images/Timer Image.jpg')
     gameWindow.blit(pygame.transform.scale(bgImage, (1000, 800)), (0, 0))
@@ -486,6 +535,8 @@ def TimerSelection(boardColour, sound, difficulty=None):
         DisplayText('Difficulty: MEDIUM', subText, (241, 249, 26), 140, 150)
     elif difficulty == 'Hard':
         DisplayText('Difficulty: HARD', subText, (241, 249, 26), 140, 150)
+    elif difficulty == 'Expert':
+        DisplayText('Difficulty: EXPERT', subText, (241, 249, 26), 140, 150)
 
     # Loads the button images
     backImage = pygame.image.load('images/Back Image.png')
@@ -595,15 +646,15 @@ def TimerSelection(boardColour, sound, difficulty=None):
 
     # Responsible for directing the players to the correct menus
     if targetMenu == 'Game Mode':
-        GameMode(boardColour, sound)
+        GameMode(boardColour, sound, ponder)
     elif targetMenu == 'Difficulty Selection':
-        DifficultySelection(boardColour, sound)
+        DifficultySelection(boardColour, sound, ponder)
     elif difficulty != None:
-        Play(targetMenu, boardColour, sound, difficulty) # The target menu indicates the time if it's not a string
+        Play(targetMenu, boardColour, sound, difficulty, ponder) # The target menu indicates the time if it's not a string
     else:
-        Play(targetMenu, boardColour, sound, None) # This is for a game when a human was selected to play
+        Play(targetMenu, boardColour, sound, None, ponder) # This is for a game when a human was selected to play
 
-def GameMode(boardColour, sound):
+def GameMode(boardColour, sound, ponder):
     targetMenu = None # Variable to keep track of which menu to go to
     bgImage = pygame.image.load('images/Mode Image.jpg')
     # Displays and scales the background image so it fits the screen
@@ -681,9 +732,9 @@ def GameMode(boardColour, sound):
     if targetMenu == 'Settings':
         Settings()
     elif targetMenu == 'Human Timer Selection':
-        TimerSelection(boardColour, sound)
+        TimerSelection(boardColour, sound, ponder)
     elif targetMenu == 'Difficulty Selection':
-        DifficultySelection(boardColour, sound)
+        DifficultySelection(boardColour, sound, ponder)
 
 def Settings():
     targetMenu = None # Variable to track which menu to go to
@@ -691,11 +742,13 @@ def Settings():
     gameWindow.blit(pygame.transform.scale(bgImage, (1000, 800)), (0, 0)) # Scales the background image to fit the screen
     blue, brown, green = False, False, False  # Flags to set the selected board colour
     on, off = False, False # Flags to set the selected sound option
+    ponder = 'Off' # Whether the AI thinks on white's time, which is off unless it is switched on
 
     # Displays the menu title as well as the sub heading for the different settings
     DisplayText('GAME SETTINGS', mainText, (241, 249, 26), 100, 10)
     DisplayText('CHOOSE BOARD THEME', subText, (241, 249, 26), 250, 170)
     DisplayText('SOUND OPTIONS:', subText, (241, 249, 26), 100, 500)
+    DisplayText('PONDERING:', subText, (241, 249, 26), 100, 600)
 
     # Loads all the button images
     backImage = pygame.image.load('images/Back Image.png')
@@ -708,6 +761,17 @@ def Settings():
     brownBoard = pygame.image.load('images/Brown Board.png')
     greenBoard = pygame.image.load('images/Green Board.png')
 
+    # There are no images for the pondering options so their text is rendered onto surfaces like the expert button
+    ponderFont = pygame.font.SysFont('Arial', 30, bold=True)
+    ponderOnImage = pygame.Surface((100, 50))
+    ponderOnImage.fill(GREY)
+    ponderOnText = ponderFont.render('ON', True, WHITE)
+    ponderOnImage.blit(ponderOnText, ponderOnText.get_rect(center=(50, 25)))
+    ponderOffImage = pygame.Surface((100, 50))
+    ponderOffImage.fill(GREY)
+    ponderOffText = ponderFont.render('OFF', True, WHITE)
+    ponderOffImage.blit(ponderOffText, ponderOffText.get_rect(center=(50, 25)))
+
     # Initialises the buttons using an instance of the button class
     blueBoardButton = Button(100, 250, blueBoard, 0.25)
     brownBoardButton = Button(400, 250, brownBoard, 0.25)
@@ -715,11 +779,15 @@ def Settings():
     backButton = Button(10, 30, backImage, 0.2)
     soundOnButton = Button(480, 500, soundOn, 0.25)
     soundOffButton = Button(600, 500, soundOff, 0.25)
+    ponderOnButton = Button(480, 610, ponderOnImage, 1)
+    ponderOffButton = Button(600, 610, ponderOffImage, 1)
 
     # Sets the border width, height and top left coordinates for each button
     blueBorder = pygame.Rect(100, 250, 186, 186)
     brownBorder = pygame.Rect(400, 250, 186, 186)
     greenBorder = pygame.Rect(700, 250, 186, 186)
+    ponderOnBorder = pygame.Rect(480, 610, 100, 50)
+    ponderOffBorder = pygame.Rect(600, 610, 100, 50)
 
     run = True
     # The start if the game loop
@@ -749,6 +817,14 @@ def Settings():
         if soundOffButton.Clicked(gameWindow):
             on, off = False, True # Sets the sound off button flag to true
 
+        # Checks if the pondering on button is clicked
+        if ponderOnButton.Clicked(gameWindow):
+            ponder = 'On'
+
+        # Checks if the pondering off button is clicked
+        if ponderOffButton.Clicked(gameWindow):
+            ponder = 'Off'
+
         # Checks if the blue board flag is set to true
         if blue:
             pygame.draw.rect(gameWindow, (241, 249, 26), blueBorder, 4) # Draws the yellow border around the board theme
@@ -766,12 +842,18 @@ def Settings():
         elif off:
             pygame.draw.circle(gameWindow, (241, 249, 26), (632, 530), 32, 5) # Draws the yellow circle border around the sound off option
 
+        # Draws the yellow border around the selected pondering option
+        if ponder == 'On':
+            pygame.draw.rect(gameWindow, (241, 249, 26), ponderOnBorder, 4)
+        else:
+            pygame.draw.rect(gameWindow, (241, 249, 26), ponderOffBorder, 4)
+
         # This checks if the blue board theme AND the sound on option has been selected
         if blue and on:
             confirmButton = Button(700, 700, confirmImage, 0.5)
             # Checks if the confirm button is clicked
             if confirmButton.Clicked(gameWindow): 
-                targetMenu = (BLUE, 'On') # Assigns to target menu a tuple which indicates the board colour constant and a string for on/off
+                targetMenu = (BLUE, 'On', ponder) # Assigns to target menu a tuple which indicates the board colour constant and strings for the sound and pondering
                 run = False
 
         # This checks if the brown board theme AND the sound on option has been selected
@@ -779,7 +861,7 @@ def Settings():
             confirmButton = Button(700, 700, confirmImage, 0.5)
             # Checks if the confirm button is clicked
             if confirmButton.Clicked(gameWindow): 
-                targetMenu = (BROWN, 'On') # Assigns to target menu a tuple which indicates the board colour constant and a string for on/off
+                targetMenu = (BROWN, 'On', ponder) # Assigns to target menu a tuple which indicates the board colour constant and strings for the sound and pondering
                 run = False
 
         # This checks if the green board theme AND the sound on option has been selected
@@ -787,7 +869,7 @@ def Settings():
             confirmButton = Button(700, 700, confirmImage, 0.5)
             # Checks if the confirm button is clicked
             if confirmButton.Clicked(gameWindow): 
-                targetMenu = (GREEN, 'On') # Assigns to target menu a tuple which indicates the board colour constant and a string for on/off
+                targetMenu = (GREEN, 'On', ponder) # Assigns to target menu a tuple which indicates the board colour constant and strings for the sound and pondering
                 run = False
 
         # This checks if the blue board theme AND the sound off option has been selected
@@ -795,7 +877,7 @@ def Settings():
             confirmButton = Button(700, 700, confirmImage, 0.5)
             # Checks if the confirm button is clicked
             if confirmButton.Clicked(gameWindow): 
-                targetMenu = (BLUE, 'Off')  # Assigns to target menu a tuple which indicates the board colour constant and a string for on/off
+                targetMenu = (BLUE, 'Off', ponder)  # Assigns to target menu a tuple which indicates the board colour constant and strings for the sound and pondering
                 run = False
 
         # This checks if the brown board theme AND the sound off option has been selected
@@ -803,7 +885,7 @@ def Settings():
             confirmButton = Button(700, 700, confirmImage, 0.5)
             # Checks if the confirm button is clicked
             if confirmButton.Clicked(gameWindow): 
-                targetMenu = (BROWN, 'Off') # Assigns to target menu a tuple which indicates the board colour constant and a string for on/off
+                targetMenu = (BROWN, 'Off', ponder) # Assigns to target menu a tuple which indicates the board colour constant and strings for the sound and pondering
                 run = False
 
         # This checks if the green board theme AND the sound off option has been selected
@@ -811,7 +893,7 @@ def Settings():
             confirmButton = Button(700, 700, confirmImage, 0.5)
             # Checks if the confirm button is clicked
             if confirmButton.Clicked(gameWindow): 
-                targetMenu = (GREEN, 'Off') # Assigns to target menu a tuple which indicates the board colour constant and a string for on/off
+                targetMenu = (GREEN, 'Off', ponder) # Assigns to target menu a tuple which indicates the board colour constant and strings for the sound and pondering
                 run = False
         
         for event in pygame.event.get():
@@ -825,7 +907,7 @@ def Settings():
     if targetMenu == 'Main Menu':
         MainMenu()
     else:
-        GameMode(targetMenu[0], targetMenu[1])
+        GameMode(targetMenu[0], targetMenu[1], targetMenu[2])
 
 def MainMenu():
     targetMenu = None
@@ -870,4 +952,6 @@ def MainMenu():
     pygame.quit()
     sys.exit()
 
-MainMenu()
+# Checks if the game was run directly rather than imported by the AI worker process
+if __name__ == '__main__':
+    MainMenu()